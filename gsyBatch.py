@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the batch analysis of directories of recordings.
+
+Every recording (COMTRADE .cfg or CSV, see gsyStream.open_recording) is read
+chunk by chunk and analysed in one pass:
+    |  *d*, *q* statistics (gsyTransforms.cal_clarke_park, or the variants
+    |  of the transforms by name, see gsyVariants)
+    |  fundamental positive, negative and zero sequence magnitudes
+    |  (gsyPhasor.cal_sdft_symm)
+    |  event flags : sag, swell, unbalance and missing samples
+
+The recordings are fanned out over a process pool. A failing recording only
+gives an error entry in its own row. The rows are written into one CSV
+summary table.
+
+Run this module as a script for the batch command, e.g.:
+
+.. code:: bash
+
+    python gsyBatch.py records/ summary.csv --workers 8
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* analyse_directory_
+* analyse_recording_
+* save_summary_
+
+Function definitions
+----------------------
+
+"""
+
+import os
+import csv
+import glob
+import argparse
+import concurrent.futures
+
+import numpy as np
+
+from gsyDqLib import date_time_now
+from gsyPhasor import cal_sdft_symm
+from gsyStream import open_recording, stream_recording, make_theta
+from gsyVariants import cal_variant_clarke_park, list_variants
+
+# columns of the summary table
+CONST_LIST_SUMMARY_FIELDS = ['file', 'error', 'samples', 'fs', 'base_freq', 'duration',
+                             'd_mean', 'd_std', 'd_min', 'd_max',
+                             'q_mean', 'q_std', 'q_min', 'q_max',
+                             'pos_nominal', 'pos_min', 'pos_max',
+                             'neg_max', 'zero_max', 'unbalance_max',
+                             'sag', 'swell', 'unbalance', 'missing']
+
+# default options of analyse_recording
+CONST_DICT_BATCH_OPTIONS = {'unit': 'V',
+                            'chunk': 65536,
+                            'base_freq': 50,
+                            'clarke': 'clarke_amplitude',
+                            'park': 'park_d',
+                            'sag': 0.9,
+                            'swell': 1.1,
+                            'unbalance': 0.02}
+
+# file patterns of the recordings
+CONST_LIST_BATCH_PATTERNS = ['*.cfg', '*.CFG', '*.csv', '*.CSV']
+
+# =============================================================================
+# <Function: analyse one recording>
+# =============================================================================
+
+def analyse_recording(locStr_path, locDict_options=None):
+    """
+    .. _analyse_recording :
+
+    Analyse one recording in one pass, chunk by chunk.
+
+    The nominal positive sequence magnitude is the one at the end of the
+    first complete cycle (the pre-fault value of a fault recording). The
+    event flags are:
+        |  'sag' : positive sequence below options['sag'] times nominal
+        |  'swell' : positive sequence above options['swell'] times nominal
+        |  'unbalance' : |neg| / |pos| above options['unbalance']
+        |  'missing' : NaN samples, which are left out of the statistics
+
+    The sequence statistics skip the first cycle (the SDFT start-up).
+
+    Parameters
+    ----------
+    locStr_path : str
+        Path of the recording.
+
+    locDict_options : dict or None
+        Overrides of CONST_DICT_BATCH_OPTIONS: 'unit' ('V' or 'A' channels of
+        COMTRADE files), 'chunk' (samples per chunk), 'base_freq' (of CSV
+        files), 'clarke' and 'park' (names of the variants of the transforms,
+        see gsyVariants), 'sag', 'swell' and 'unbalance' thresholds.
+
+    Returns
+    -------
+    locDict_row : dict
+        One row of the summary table, keys of CONST_LIST_SUMMARY_FIELDS.
+        Any exception is caught and returned in 'error', the other values
+        are then empty.
+
+    Examples
+    --------
+    .. code:: python
+
+        row = analyse_recording('fault.cfg', {'sag': 0.8})
+    """
+
+    locDict_options = dict(CONST_DICT_BATCH_OPTIONS, **(locDict_options or {}))
+
+    locDict_row = {x: '' for x in CONST_LIST_SUMMARY_FIELDS}
+
+    locDict_row['file'] = locStr_path
+
+    try:
+
+        locDict_source = open_recording(locStr_path, locDict_options['unit'],
+                                        locDict_options['base_freq'])
+
+        locDbl_fs = locDict_source['fs']
+
+        locDbl_base_freq = locDict_source['base_freq']
+
+        # samples per cycle, the SDFT window
+        locInt_window = int(round(locDbl_fs / locDbl_base_freq))
+
+        locInt_samples = 0
+
+        locInt_missing = 0
+
+        # count, sum, sum of squares, min, max of d and q
+        locDQ = np.array([[0, 0, 0, np.inf, -np.inf]] * 2, dtype=float)
+
+        # min, max of |pos|, max of |neg|, |zero|, |neg| / |pos|
+        locSeq = np.array([np.inf, -np.inf, 0, 0, 0], dtype=float)
+
+        locDbl_nominal = np.nan
+
+        locState = None
+
+        for locTime, a, b, c in stream_recording(locDict_source, locDict_options['chunk']):
+
+            locTime, locTheta = make_theta(locInt_samples, len(a), locDbl_fs, locDbl_base_freq)
+
+            alpha, beta, d, q, zero = cal_variant_clarke_park(locTheta, a, b, c,
+                                                              locDict_options['clarke'],
+                                                              locDict_options['park'])
+
+            locMissing = ~(np.isfinite(a) & np.isfinite(b) & np.isfinite(c))
+
+            locInt_missing += int(np.count_nonzero(locMissing))
+
+            for k, x in enumerate((d, q)):
+
+                x = x[~locMissing]
+
+                if len(x) > 0:
+
+                    locDQ[k, :3] += (len(x), np.sum(x), np.dot(x, x))
+
+                    locDQ[k, 3] = min(locDQ[k, 3], np.min(x))
+
+                    locDQ[k, 4] = max(locDQ[k, 4], np.max(x))
+
+                else:
+
+                    pass
+
+            # the SDFT window must not see the NaN samples
+            (a_pos, b_pos, c_pos,
+             a_neg, b_neg, c_neg,
+             locZero, locState) = cal_sdft_symm(np.where(locMissing, 0, a),
+                                                np.where(locMissing, 0, b),
+                                                np.where(locMissing, 0, c),
+                                                locInt_window, (1,), locState)
+
+            # after the first complete cycle
+            locValid = (locInt_samples + np.arange(len(a))) >= locInt_window - 1
+
+            locPos = np.abs(a_pos[0])[locValid]
+
+            if len(locPos) > 0:
+
+                if np.isnan(locDbl_nominal):
+
+                    locDbl_nominal = locPos[0]
+
+                else:
+
+                    pass
+
+                locNeg = np.abs(a_neg[0])[locValid]
+
+                locSeq[0] = min(locSeq[0], np.min(locPos))
+
+                locSeq[1] = max(locSeq[1], np.max(locPos))
+
+                locSeq[2] = max(locSeq[2], np.max(locNeg))
+
+                locSeq[3] = max(locSeq[3], np.max(np.abs(locZero[0])[locValid]))
+
+                with np.errstate(divide='ignore', invalid='ignore'):
+
+                    locSeq[4] = max(locSeq[4], np.nanmax(locNeg / locPos))
+
+            else:
+
+                pass
+
+            locInt_samples += len(a)
+
+        locCount = np.maximum(locDQ[:, 0], 1)
+
+        locMean = locDQ[:, 1] / locCount
+
+        locStd = np.sqrt(np.maximum(locDQ[:, 2] / locCount - locMean**2, 0))
+
+        locDict_row.update({'samples': locInt_samples,
+                            'fs': locDbl_fs,
+                            'base_freq': locDbl_base_freq,
+                            'duration': locInt_samples / locDbl_fs,
+                            'd_mean': locMean[0], 'd_std': locStd[0],
+                            'd_min': locDQ[0, 3], 'd_max': locDQ[0, 4],
+                            'q_mean': locMean[1], 'q_std': locStd[1],
+                            'q_min': locDQ[1, 3], 'q_max': locDQ[1, 4],
+                            'pos_nominal': locDbl_nominal,
+                            'pos_min': locSeq[0], 'pos_max': locSeq[1],
+                            'neg_max': locSeq[2], 'zero_max': locSeq[3],
+                            'unbalance_max': locSeq[4],
+                            'sag': int(locSeq[0] < locDict_options['sag'] * locDbl_nominal),
+                            'swell': int(locSeq[1] > locDict_options['swell'] * locDbl_nominal),
+                            'unbalance': int(locSeq[4] > locDict_options['unbalance']),
+                            'missing': locInt_missing})
+
+    except Exception as locError:
+
+        # failure isolation, the error goes into the row of this recording
+        locDict_row['error'] = type(locError).__name__ + ': ' + str(locError)
+
+    return locDict_row
+
+# =============================================================================
+# </Function: analyse one recording>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: analyse a directory of recordings>
+# =============================================================================
+
+def analyse_directory(locStr_directory, locDict_options=None, locInt_workers=None,
+                      locBool_progress=True):
+    """
+    .. _analyse_directory :
+
+    Analyse all recordings (CONST_LIST_BATCH_PATTERNS) of a directory and its
+    sub-directories with analyse_recording_, over a process pool.
+
+    Parameters
+    ----------
+    locStr_directory : str
+        The directory.
+
+    locDict_options : dict or None
+        The options of analyse_recording_.
+
+    locInt_workers : int or None
+        Number of worker processes. None uses the number of CPUs. 0 runs in
+        this process, e.g., for debugging.
+
+    locBool_progress : bool
+        True prints the progress, one line per recording.
+
+    Returns
+    -------
+    locList_rows : list of dict
+        The rows of the summary table, sorted by file name.
+
+    Examples
+    --------
+    .. code:: python
+
+        rows = analyse_directory('records/', locInt_workers=8)
+
+        save_summary(rows, 'summary.csv')
+    """
+
+    locSet_files = set()
+
+    for item in CONST_LIST_BATCH_PATTERNS:
+
+        locSet_files.update(glob.glob(os.path.join(locStr_directory, '**', item),
+                                      recursive=True))
+
+    locList_files = sorted(locSet_files)
+
+    locInt_total = len(locList_files)
+
+    locList_rows = []
+
+    def report(locDict_row):
+
+        locList_rows.append(locDict_row)
+
+        if locBool_progress == True:
+
+            print(date_time_now() + 'Analysed ' + str(len(locList_rows)) + '/'
+                  + str(locInt_total) + ' : ' + locDict_row['file']
+                  + (' (' + locDict_row['error'] + ')' if locDict_row['error'] else ''))
+
+        else:
+
+            pass
+
+    if locInt_workers == 0:
+
+        for item in locList_files:
+
+            report(analyse_recording(item, locDict_options))
+
+    else:
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=locInt_workers) as locPool:
+
+            locDict_futures = {locPool.submit(analyse_recording, item, locDict_options): item
+                               for item in locList_files}
+
+            for locFuture in concurrent.futures.as_completed(locDict_futures):
+
+                try:
+
+                    locDict_row = locFuture.result()
+
+                except Exception as locError:
+
+                    # e.g., a worker process killed by the operating system
+                    locDict_row = {x: '' for x in CONST_LIST_SUMMARY_FIELDS}
+
+                    locDict_row['file'] = locDict_futures[locFuture]
+
+                    locDict_row['error'] = type(locError).__name__ + ': ' + str(locError)
+
+                report(locDict_row)
+
+    locList_rows.sort(key=lambda x: x['file'])
+
+    return locList_rows
+
+# =============================================================================
+# </Function: analyse a directory of recordings>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: save the summary table>
+# =============================================================================
+
+def save_summary(locList_rows, locStr_path):
+    """
+    .. _save_summary :
+
+    Save the rows of analyse_directory_ into one CSV summary table, with the
+    columns of CONST_LIST_SUMMARY_FIELDS.
+
+    Parameters
+    ----------
+    locList_rows : list of dict
+        The rows.
+
+    locStr_path : str
+        Path of the CSV file.
+    """
+
+    with open(locStr_path, 'w', newline='') as f:
+
+        locWriter = csv.DictWriter(f, fieldnames=CONST_LIST_SUMMARY_FIELDS)
+
+        locWriter.writeheader()
+
+        locWriter.writerows(locList_rows)
+
+# =============================================================================
+# </Function: save the summary table>
+# =============================================================================
+
+
+if __name__ == '__main__':
+
+    locParser = argparse.ArgumentParser(description='Batch analysis of recordings')
+
+    locParser.add_argument('directory', help='directory of the recordings')
+
+    locParser.add_argument('summary', help='path of the CSV summary table')
+
+    locParser.add_argument('--workers', type=int, default=None,
+                           help='number of worker processes, 0 for none')
+
+    locParser.add_argument('--unit', default='V', help="'V' or 'A' COMTRADE channels")
+
+    locParser.add_argument('--base-freq', type=float, default=50,
+                           help='base frequency of the CSV files')
+
+    locParser.add_argument('--clarke', default='clarke_amplitude',
+                           choices=list_variants('clarke'), help='Clarke Transform variant')
+
+    locParser.add_argument('--park', default='park_d',
+                           choices=list_variants('park'), help='Park Transform variant')
+
+    locArgs = locParser.parse_args()
+
+    # the directory of the summary is made before the analysis, not after
+    locStr_summary_dir = os.path.dirname(os.path.abspath(locArgs.summary))
+
+    try:
+
+        os.makedirs(locStr_summary_dir, exist_ok=True)
+
+    except OSError as locError:
+
+        locParser.error('cannot make the directory of the summary : ' + str(locError))
+
+    if not os.access(locStr_summary_dir, os.W_OK):
+
+        locParser.error('the directory of the summary is not writable : ' + locStr_summary_dir)
+
+    else:
+
+        pass
+
+    print(date_time_now() + 'Batch analysis start')
+
+    locList_rows = analyse_directory(locArgs.directory,
+                                     {'unit': locArgs.unit, 'base_freq': locArgs.base_freq,
+                                      'clarke': locArgs.clarke, 'park': locArgs.park},
+                                     locArgs.workers)
+
+    save_summary(locList_rows, locArgs.summary)
+
+    print(date_time_now() + 'Batch analysis complete, '
+          + str(sum(1 for x in locList_rows if x['error'])) + ' failed')
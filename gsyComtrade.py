@@ -0,0 +1,671 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for reading IEEE C37.111 (COMTRADE) recordings.
+
+The CFG file is parsed into a dict (1991, 1999 and 2013 revisions). The DAT
+file is memory-mapped as a structured array (one record per sample) for the
+BINARY (int16), BINARY32 (int32) and FLOAT32 formats, so a multi-gigabyte
+recording opens without reading the samples. The raw channel values are
+zero-copy strided views of the map, the channel scaling (a · raw + b) is
+applied only to the range of samples asked for. ASCII DAT files cannot be
+mapped and are read into memory.
+
+.. code:: python
+
+    record = open_comtrade('fault.cfg')
+
+    a, b, c = get_comtrade_channels(record, find_comtrade_abc(record, 'V'),
+                                    0, 10000)
+
+    alpha, beta, zero = cal_clarke(a, b, c)
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* find_comtrade_abc_
+* get_comtrade_channels_
+* get_comtrade_time_
+* open_comtrade_
+* read_comtrade_cfg_
+* stream_comtrade_
+
+Function definitions
+----------------------
+
+"""
+
+import os
+
+import numpy as np
+
+# DAT value types of the binary formats, little-endian
+CONST_DICT_DAT_TYPES = {'BINARY': '<i2', 'BINARY32': '<i4', 'FLOAT32': '<f4'}
+
+# =============================================================================
+# <Function: read the CFG file>
+# =============================================================================
+
+def read_comtrade_cfg(locStr_cfg):
+    """
+    .. _read_comtrade_cfg :
+
+    Parse a COMTRADE configuration (CFG) file.
+
+    Parameters
+    ----------
+    locStr_cfg : str
+        Path of the CFG file.
+
+    Returns
+    -------
+    locDict_cfg : dict
+        |  'station', 'device', 'rev_year'
+        |  'analog' : list of dict, one per analog channel, with 'name',
+        |             'phase', 'circuit', 'unit', 'a', 'b', 'skew', 'min',
+        |             'max', 'primary', 'secondary', 'ps'
+        |  'digital' : list of dict, one per digital channel, with 'name',
+        |              'phase', 'circuit', 'normal'
+        |  'line_freq' : nominal frequency (Hz)
+        |  'rates' : list of (sampling rate (Hz), last sample number)
+        |  'samples' : total number of samples, 0 if not given by 'rates'
+        |  'start', 'trigger' : date and time strings
+        |  'file_type' : 'ASCII', 'BINARY', 'BINARY32' or 'FLOAT32'
+        |  'time_mult' : multiplication factor of the time stamps
+
+    Examples
+    --------
+    .. code:: python
+
+        cfg = read_comtrade_cfg('fault.cfg')
+
+        print([x['name'] for x in cfg['analog']])
+    """
+
+    with open(locStr_cfg, 'rb') as f:
+
+        locBytes = f.read()
+
+    try:
+
+        locStr_text = locBytes.decode('utf-8')
+
+    except UnicodeDecodeError:
+
+        locStr_text = locBytes.decode('latin-1')
+
+    locList_lines = [x.strip() for x in locStr_text.splitlines()]
+
+    locList_lines = [x for x in locList_lines if x != '']
+
+    locList_lines.reverse()
+
+    # the lines are popped from the end
+    def next_fields():
+
+        if len(locList_lines) == 0:
+
+            raise ValueError('Unexpected end of the CFG file : ' + locStr_cfg)
+
+        else:
+
+            pass
+
+        return [x.strip() for x in locList_lines.pop().split(',')]
+
+    try:
+
+        locList_fields = next_fields()
+
+        locDict_cfg = {'station': locList_fields[0],
+                       'device': locList_fields[1] if len(locList_fields) > 1 else '',
+                       'rev_year': (int(locList_fields[2])
+                                    if (len(locList_fields) > 2) and (locList_fields[2] != '')
+                                    else 1991)}
+
+        # TT,##A,##D
+        locList_fields = next_fields()
+
+        locInt_analog = int(locList_fields[1].upper().rstrip('A'))
+
+        locInt_digital = int(locList_fields[2].upper().rstrip('D'))
+
+        locDict_cfg['analog'] = []
+
+        for k in range(locInt_analog):
+
+            locList_fields = next_fields() + [''] * 13
+
+            locDict_cfg['analog'].append(
+                {'name': locList_fields[1],
+                 'phase': locList_fields[2],
+                 'circuit': locList_fields[3],
+                 'unit': locList_fields[4],
+                 'a': float(locList_fields[5]),
+                 'b': float(locList_fields[6]),
+                 'skew': float(locList_fields[7] or 0),
+                 'min': float(locList_fields[8] or 0),
+                 'max': float(locList_fields[9] or 0),
+                 'primary': float(locList_fields[10] or 1),
+                 'secondary': float(locList_fields[11] or 1),
+                 'ps': (locList_fields[12] or 'P').upper()})
+
+        locDict_cfg['digital'] = []
+
+        for k in range(locInt_digital):
+
+            locList_fields = next_fields()
+
+            # 1991 : Dn,ch_id,y  1999 : Dn,ch_id,ph,ccbm,y
+            if len(locList_fields) >= 5:
+
+                locDict_cfg['digital'].append({'name': locList_fields[1],
+                                               'phase': locList_fields[2],
+                                               'circuit': locList_fields[3],
+                                               'normal': int(locList_fields[4] or 0)})
+
+            else:
+
+                locDict_cfg['digital'].append({'name': locList_fields[1],
+                                               'phase': '',
+                                               'circuit': '',
+                                               'normal': int(locList_fields[-1] or 0)})
+
+        locDict_cfg['line_freq'] = float(next_fields()[0])
+
+        locInt_rates = int(next_fields()[0])
+
+        locDict_cfg['rates'] = []
+
+        for k in range(max(locInt_rates, 1)):
+
+            locList_fields = next_fields()
+
+            locDict_cfg['rates'].append((float(locList_fields[0]), int(locList_fields[1])))
+
+        if locInt_rates == 0:
+
+            # time stamps only, the number of samples comes from the DAT file
+            locDict_cfg['rates'] = []
+
+            locDict_cfg['samples'] = 0
+
+        else:
+
+            locDict_cfg['samples'] = locDict_cfg['rates'][-1][1]
+
+        locDict_cfg['start'] = ','.join(next_fields())
+
+        locDict_cfg['trigger'] = ','.join(next_fields())
+
+        locDict_cfg['file_type'] = next_fields()[0].upper()
+
+        if len(locList_lines) > 0:
+
+            locDict_cfg['time_mult'] = float(next_fields()[0] or 1)
+
+        else:
+
+            locDict_cfg['time_mult'] = 1.0
+
+    except (IndexError, ValueError) as locError:
+
+        raise ValueError('Invalid CFG file : ' + locStr_cfg + ' (' + str(locError) + ')')
+
+    if locDict_cfg['file_type'] not in ('ASCII',) + tuple(CONST_DICT_DAT_TYPES):
+
+        raise ValueError('Unknown DAT file type : ' + locDict_cfg['file_type'])
+
+    else:
+
+        pass
+
+    return locDict_cfg
+
+# =============================================================================
+# </Function: read the CFG file>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: open a recording>
+# =============================================================================
+
+def open_comtrade(locStr_cfg, locStr_dat=None):
+    """
+    .. _open_comtrade :
+
+    Open a COMTRADE recording. The binary DAT files are memory-mapped, no
+    samples are read.
+
+    Parameters
+    ----------
+    locStr_cfg : str
+        Path of the CFG file.
+
+    locStr_dat : str or None
+        Path of the DAT file. None looks for the .dat (or .DAT) file next to
+        the CFG file.
+
+    Returns
+    -------
+    locDict_record : dict
+        |  'cfg' : the CFG dict from read_comtrade_cfg_
+        |  'dat' : path of the DAT file
+        |  'samples' : number of samples
+        |  'number', 'stamp' : (samples,) sample numbers and time stamps
+        |  'raw' : (analog channels, samples) raw values, a zero-copy view
+        |          of the map for the binary formats
+        |  'digital' : (status words, samples) 16-bit digital status words
+
+    Examples
+    --------
+    .. code:: python
+
+        record = open_comtrade('fault.cfg')
+
+        print(record['samples'], record['cfg']['rates'])
+    """
+
+    locDict_cfg = read_comtrade_cfg(locStr_cfg)
+
+    if locStr_dat is None:
+
+        locStr_stem = os.path.splitext(locStr_cfg)[0]
+
+        locList_candidates = [locStr_stem + x for x in ('.dat', '.DAT', '.Dat')]
+
+        locList_found = [x for x in locList_candidates if os.path.isfile(x)]
+
+        if len(locList_found) == 0:
+
+            raise FileNotFoundError('DAT file not found for : ' + locStr_cfg)
+
+        else:
+
+            locStr_dat = locList_found[0]
+
+    else:
+
+        pass
+
+    locInt_analog = len(locDict_cfg['analog'])
+
+    locInt_words = (len(locDict_cfg['digital']) + 15) // 16
+
+    if locDict_cfg['file_type'] == 'ASCII':
+
+        locData = np.loadtxt(locStr_dat, delimiter=',', ndmin=2)
+
+        locNumber = locData[:, 0].astype(np.int64)
+
+        locStamp = locData[:, 1]
+
+        locRaw = locData[:, 2:2 + locInt_analog].T
+
+        # one column per digital channel, packed into 16-bit words
+        locBits = locData[:, 2 + locInt_analog:].astype(np.uint16)
+
+        locDigital = np.zeros((locInt_words, len(locData)), dtype=np.uint16)
+
+        for k in range(locBits.shape[1]):
+
+            locDigital[k // 16] |= locBits[:, k] << np.uint16(k % 16)
+
+    else:
+
+        locDtype = np.dtype([('number', '<u4'),
+                             ('stamp', '<u4'),
+                             ('analog', CONST_DICT_DAT_TYPES[locDict_cfg['file_type']],
+                              (locInt_analog,)),
+                             ('digital', '<u2', (locInt_words,))])
+
+        locInt_size = os.path.getsize(locStr_dat)
+
+        locInt_records = locInt_size // locDtype.itemsize
+
+        if locInt_records == 0:
+
+            locMap = np.zeros(0, dtype=locDtype)
+
+        else:
+
+            locMap = np.memmap(locStr_dat, dtype=locDtype, mode='r',
+                               shape=(locInt_records,))
+
+        # cut at the number of samples of the CFG, if given
+        if 0 < locDict_cfg['samples'] < locInt_records:
+
+            locMap = locMap[:locDict_cfg['samples']]
+
+        else:
+
+            pass
+
+        locNumber = locMap['number']
+
+        locStamp = locMap['stamp']
+
+        locRaw = locMap['analog'].T
+
+        locDigital = locMap['digital'].T
+
+    locDict_record = {'cfg': locDict_cfg,
+                      'dat': locStr_dat,
+                      'samples': locRaw.shape[-1],
+                      'number': locNumber,
+                      'stamp': locStamp,
+                      'raw': locRaw,
+                      'digital': locDigital}
+
+    return locDict_record
+
+# =============================================================================
+# </Function: open a recording>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: find the a, b, c channels>
+# =============================================================================
+
+def find_comtrade_abc(locDict_record, locStr_unit=None, locStr_circuit=None):
+    """
+    .. _find_comtrade_abc :
+
+    Find the analog channels of the phases A, B, C by the phase field of the
+    CFG (A/B/C, also R/S/T, L1/L2/L3), optionally only of one unit (e.g., 'V'
+    or 'kV', matched by the last letter, so 'V' also finds 'kV') and circuit.
+
+    Parameters
+    ----------
+    locDict_record : dict
+        The recording from open_comtrade_, or the CFG dict.
+
+    locStr_unit : str or None
+        'V' for the voltages, 'A' for the currents, None for any unit.
+
+    locStr_circuit : str or None
+        The circuit component being monitored (ccbm), None for any.
+
+    Returns
+    -------
+    locList_channels : list of int
+        Indices of the a, b, c analog channels, the first match of each phase.
+    """
+
+    locDict_cfg = locDict_record.get('cfg', locDict_record)
+
+    locDict_phases = {'A': 0, 'R': 0, 'L1': 0,
+                      'B': 1, 'S': 1, 'L2': 1,
+                      'C': 2, 'T': 2, 'L3': 2}
+
+    locList_channels = [None, None, None]
+
+    for k, item in enumerate(locDict_cfg['analog']):
+
+        locStr_phase = item['phase'].upper()
+
+        if locStr_phase not in locDict_phases:
+
+            continue
+
+        elif (locStr_unit is not None) and (not item['unit'].upper().endswith(locStr_unit.upper())):
+
+            continue
+
+        elif (locStr_circuit is not None) and (item['circuit'] != locStr_circuit):
+
+            continue
+
+        elif locList_channels[locDict_phases[locStr_phase]] is None:
+
+            locList_channels[locDict_phases[locStr_phase]] = k
+
+        else:
+
+            pass
+
+    if None in locList_channels:
+
+        raise ValueError('Phases A, B, C not all found in the analog channels')
+
+    else:
+
+        pass
+
+    return locList_channels
+
+# =============================================================================
+# </Function: find the a, b, c channels>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: get the values of analog channels>
+# =============================================================================
+
+def get_comtrade_channels(locDict_record, locList_channels, locInt_start=0,
+                          locInt_stop=None, locBool_scaled=True):
+    """
+    .. _get_comtrade_channels :
+
+    Values of analog channels for a range of samples.
+
+    Parameters
+    ----------
+    locDict_record : dict
+        The recording from open_comtrade_.
+
+    locList_channels : list of int or str
+        Channel indices (0 based) or names.
+
+    locInt_start, locInt_stop : int
+        The range of samples. locInt_stop None is the end of the recording.
+
+    locBool_scaled : bool
+        True returns a · raw + b (only the range is scaled, missing samples
+        of the integer formats become NaN). False returns the raw values as
+        zero-copy views of the map.
+
+    Returns
+    -------
+    locList_values : list of array
+        One 1d array per channel.
+
+    Examples
+    --------
+    .. code:: python
+
+        a, b, c = get_comtrade_channels(record, ['VA', 'VB', 'VC'])
+    """
+
+    locDict_cfg = locDict_record['cfg']
+
+    locList_names = [x['name'] for x in locDict_cfg['analog']]
+
+    locList_values = []
+
+    for item in locList_channels:
+
+        if isinstance(item, str):
+
+            if item not in locList_names:
+
+                raise ValueError('Channel not found : ' + item)
+
+            else:
+
+                item = locList_names.index(item)
+
+        else:
+
+            pass
+
+        locRaw = locDict_record['raw'][item, locInt_start:locInt_stop]
+
+        if locBool_scaled == True:
+
+            locValues = (locDict_cfg['analog'][item]['a'] * locRaw.astype(float)
+                         + locDict_cfg['analog'][item]['b'])
+
+            # missing data of the integer formats, 0x8000 or 0x80000000
+            if locRaw.dtype.kind == 'i':
+
+                locValues[locRaw == np.iinfo(locRaw.dtype).min] = np.nan
+
+            else:
+
+                pass
+
+            locList_values.append(locValues)
+
+        else:
+
+            locList_values.append(locRaw)
+
+    return locList_values
+
+# =============================================================================
+# </Function: get the values of analog channels>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: get the time of the samples>
+# =============================================================================
+
+def get_comtrade_time(locDict_record, locInt_start=0, locInt_stop=None):
+    """
+    .. _get_comtrade_time :
+
+    Time (s) of a range of samples, relative to the first sample.
+
+    The time comes from the sampling rates of the CFG. Without sampling rates
+    (or with a rate of 0), the time stamps (µs, times time_mult) are used.
+
+    Parameters
+    ----------
+    locDict_record : dict
+        The recording from open_comtrade_.
+
+    locInt_start, locInt_stop : int
+        The range of samples. locInt_stop None is the end of the recording.
+
+    Returns
+    -------
+    locTime : array
+        1d array of the time (s).
+    """
+
+    locDict_cfg = locDict_record['cfg']
+
+    # only the range is built, never the whole recording
+    locInt_start, locInt_stop, locInt_step = slice(locInt_start, locInt_stop).indices(
+        locDict_record['samples'])
+
+    locIndex = np.arange(locInt_start, max(locInt_start, locInt_stop))
+
+    locList_rates = locDict_cfg['rates']
+
+    if (len(locList_rates) == 0) or any(x[0] <= 0 for x in locList_rates):
+
+        locStamp = np.asarray(locDict_record['stamp'][locInt_start:locInt_stop], dtype=float)
+
+        locDbl_first = float(locDict_record['stamp'][0])
+
+        return (locStamp - locDbl_first) * locDict_cfg['time_mult'] * 1e-6
+
+    else:
+
+        pass
+
+    locTime = np.zeros(len(locIndex))
+
+    locDbl_offset = 0.0
+
+    locInt_first = 0
+
+    # piecewise constant rates, sample numbers are 1 based
+    for locDbl_rate, locInt_last in locList_rates:
+
+        locMask = (locIndex >= locInt_first) & (locIndex < locInt_last)
+
+        locTime[locMask] = locDbl_offset + (locIndex[locMask] - locInt_first) / locDbl_rate
+
+        locDbl_offset += (locInt_last - locInt_first) / locDbl_rate
+
+        locInt_first = locInt_last
+
+    return locTime
+
+# =============================================================================
+# </Function: get the time of the samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream a recording chunk by chunk>
+# =============================================================================
+
+def stream_comtrade(locDict_record, locList_channels, locInt_chunk=65536,
+                    locInt_start=0, locInt_stop=None):
+    """
+    .. _stream_comtrade :
+
+    Generator, yields (time, a, b, c) of the scaled a, b, c channels chunk by
+    chunk, e.g., into gsyStream.stream_clarke_park.
+
+    Parameters
+    ----------
+    locDict_record : dict
+        The recording from open_comtrade_.
+
+    locList_channels : list of int or str
+        The a, b, c channels, e.g., from find_comtrade_abc_.
+
+    locInt_chunk : int
+        Number of samples per chunk.
+
+    locInt_start, locInt_stop : int
+        The range of samples. locInt_stop None is the end of the recording.
+
+    Examples
+    --------
+    .. code:: python
+
+        chunks = ((a, b, c) for time, a, b, c in stream_comtrade(record, channels))
+
+        for (time, theta, alpha, beta,
+             d, q, zero) in stream_clarke_park(chunks, record['cfg']['rates'][0][0],
+                                               record['cfg']['line_freq']):
+
+            do_something(d, q)
+    """
+
+    if locInt_stop is None:
+
+        locInt_stop = locDict_record['samples']
+
+    else:
+
+        locInt_stop = min(locInt_stop, locDict_record['samples'])
+
+    locInt_chunk = int(max(1, locInt_chunk))
+
+    for k in range(locInt_start, locInt_stop, locInt_chunk):
+
+        locInt_end = min(k + locInt_chunk, locInt_stop)
+
+        a, b, c = get_comtrade_channels(locDict_record, locList_channels, k, locInt_end)
+
+        yield get_comtrade_time(locDict_record, k, locInt_end), a, b, c
+
+# =============================================================================
+# </Function: stream a recording chunk by chunk>
+# =============================================================================
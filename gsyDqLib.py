@@ -12,12 +12,14 @@ List of functions
 ----------------------
 
 * cal_ABDQ_
+* cal_DQ_frames_
 * check_file_saved_
 * collect_tb_
 * date_time_now_
 * find_pll_direction_
 * find_sequences_
 * load_ffmpeg_
+* parse_pll_orders_
 * save_animation_to_disk_
 * set_font_size_
 
@@ -37,6 +39,8 @@ from numpy import sin, cos, pi
 from tkinter import filedialog
 from time import gmtime, strftime, sleep
 
+from gsyTransforms import cal_park_frames, cal_clarke_n, cal_trig
+
 # =============================================================================
 # <Function: get system time and date>
 # =============================================================================
@@ -78,7 +82,8 @@ def date_time_now():
 # <Function: Calculate Clarke and Park transforms>
 # =============================================================================
     
-def cal_ABDQ(locInt_Samples, locDbl_base_freq, locDbl_harmonic_order, locDbl_pll_order):
+def cal_ABDQ(locInt_Samples, locDbl_base_freq, locDbl_harmonic_order, locDbl_pll_order,
+             locInt_phases=3, locTrig=None, locSchedule=None):
     """
     .. _cal_ABDQ :
     
@@ -122,6 +127,23 @@ def cal_ABDQ(locInt_Samples, locDbl_base_freq, locDbl_harmonic_order, locDbl_pll
             |  
             |  -3.3 means the PLL is rotating clock-wise and at 3.3 times the base frequency.
     
+    locInt_phases : int
+        The number of phases of the symmetrical inputs, default is 3. Phase k 
+        lags phase 0 by :math:`2πk/n` (wrapped into :math:`(-π, π]` for 
+        interharmonics). For more than three phases, *α* and *β* 
+        are calculated by the generalised Clarke Transform 
+        (gsyTransforms.cal_clarke_n). The x-y components are not returned.
+    
+    locTrig : function or None
+        The sin/cos provider of the PLL rotation, locTrig(angle) returns 
+        (cos(angle), sin(angle)), e.g., gsyTrig.make_trig_provider('cordic'). 
+        None uses the NumPy sin and cos (gsyTransforms.cal_trig).
+    
+    locSchedule : array or None
+        The sample times as fractions of the base period, from 0 to 1, e.g., 
+        the non-uniform schedule of gsySampling.find_sample_schedule. 
+        locInt_Samples is not used. None takes locInt_Samples uniform samples.
+    
     
     Returns
     -------
@@ -205,43 +227,83 @@ def cal_ABDQ(locInt_Samples, locDbl_base_freq, locDbl_harmonic_order, locDbl_pll
         pass    
     
     # create the time list according to the base frequency and the samples
-    locTime = np.linspace(0, locDbl_base_period, locInt_Samples)
+    if locSchedule is None:
+        
+        locTime = np.linspace(0, locDbl_base_period, locInt_Samples)
+        
+    else:
+        
+        locTime = np.asarray(locSchedule, dtype=float) * locDbl_base_period
     
     # θ = 2πft
     locTheta = 2 * pi * locDbl_base_freq * locTime
     
-    # Clarke Transform, α component
-    locAlpha_vector = 2/3 * (cos(locDbl_harmonic_order * locTheta) 
-                            - cos(locDbl_harmonic_order * locTheta) 
-                            * cos(locDbl_harmonic_order * 2/3 * pi))
+    if locInt_phases == 3:
     
-    # Clarke Transform, β component
-    locBeta_vector = 2 * np.sqrt( 3 )/3 * (sin(locDbl_harmonic_order * locTheta) 
-                                        * sin(locDbl_harmonic_order * 2/3 * pi))
+        # Clarke Transform, α component
+        locAlpha_vector = 2/3 * (cos(locDbl_harmonic_order * locTheta) 
+                                - cos(locDbl_harmonic_order * locTheta) 
+                                * cos(locDbl_harmonic_order * 2/3 * pi))
+        
+        # Clarke Transform, β component
+        locBeta_vector = 2 * np.sqrt( 3 )/3 * (sin(locDbl_harmonic_order * locTheta) 
+                                            * sin(locDbl_harmonic_order * 2/3 * pi))
+        
+    else:
+        
+        # phase shifts wrapped into (-π, π], i.e., 0, -2π/3, +2π/3 for three phases
+        locShifts = (np.mod(np.arange(locInt_phases) + (locInt_phases - 1) // 2, locInt_phases)
+                     - (locInt_phases - 1) // 2)
+        
+        # n-phase inputs, (phases, samples)
+        locInputs = cos(locDbl_harmonic_order 
+                        * (locTheta 
+                           - 2 * pi * locShifts[:, np.newaxis] / locInt_phases))
+        
+        # generalised Clarke Transform, the first two rows are α and β
+        locClarke = cal_clarke_n(locInputs)
+        
+        locAlpha_vector = locClarke[0]
+        
+        locBeta_vector = locClarke[1]
                   
+    # sin/cos provider of the PLL rotation
+    if locTrig is None:
+        
+        locTrig = cal_trig
+        
+    else:
+        
+        pass
+    
+    # cos, sin of the d axis and of the q axis
+    locCos_pll, locSin_pll = locTrig(locDbl_pll_order * locTheta)
+    
+    locCos_pll_q, locSin_pll_q = locTrig(locDbl_pll_order * locTheta + pi / 2)
+    
     # Park Transform, d component                  
-    locD_vector = (cos(locDbl_pll_order * locTheta) * locAlpha_vector 
-                + sin(locDbl_pll_order * locTheta) * locBeta_vector)
+    locD_vector = (locCos_pll * locAlpha_vector 
+                + locSin_pll * locBeta_vector)
     
     # Park Transform, q component
-    locQ_vector = (-1 * sin(locDbl_pll_order * locTheta) * locAlpha_vector 
-                   + cos(locDbl_pll_order * locTheta) *  locBeta_vector)
+    locQ_vector = (-1 * locSin_pll * locAlpha_vector 
+                   + locCos_pll *  locBeta_vector)
     
     # rotating d axis' projection on x, y axes
-    locD_ax_on_x = cos(locDbl_pll_order * locTheta)
-    locD_ax_on_y = sin(locDbl_pll_order * locTheta)
+    locD_ax_on_x = locCos_pll
+    locD_ax_on_y = locSin_pll
     
     # rotating q axis' projection on x, y axes
-    locQ_ax_on_x = cos(locDbl_pll_order * locTheta + pi / 2)
-    locQ_ax_on_y = sin(locDbl_pll_order * locTheta + pi / 2)
+    locQ_ax_on_x = locCos_pll_q
+    locQ_ax_on_y = locSin_pll_q
     
     # d component's projection on x, y axes
-    locD_vector_on_x = locD_vector * cos(locDbl_pll_order * locTheta)
-    locD_vector_on_y = locD_vector * sin(locDbl_pll_order * locTheta)
+    locD_vector_on_x = locD_vector * locCos_pll
+    locD_vector_on_y = locD_vector * locSin_pll
     
     # q component's projection on x, y axes
-    locQ_vector_on_x = locQ_vector * cos(locDbl_pll_order * locTheta + pi / 2)
-    locQ_vector_on_y = locQ_vector * sin(locDbl_pll_order * locTheta + pi / 2)
+    locQ_vector_on_x = locQ_vector * locCos_pll_q
+    locQ_vector_on_y = locQ_vector * locSin_pll_q
     
     return (locTime, locTheta, 
             locAlpha_vector, locBeta_vector, 
@@ -256,6 +318,118 @@ def cal_ABDQ(locInt_Samples, locDbl_base_freq, locDbl_harmonic_order, locDbl_pll
 # =============================================================================
     
 
+# =============================================================================
+# <Function: Calculate Park transforms for several PLL orders>
+# =============================================================================
+    
+def cal_DQ_frames(locTheta, locAlpha_vector, locBeta_vector, locList_pll_orders):
+    """
+    .. _cal_DQ_frames :
+    
+    Calculates the Park Transform of the same Clarke components for several 
+    PLL orders at once.
+    
+    The angles of all the PLLs form one (PLL orders, samples) block, which is 
+    rotated in one go by gsyTransforms.cal_park_frames. Each extra PLL order 
+    adds one row to the returned blocks.
+
+    Parameters
+    ----------
+    locTheta : array
+        Angle from cal_ABDQ_ (:math:`θ = 2πft`).
+    
+    locAlpha_vector : array
+        *α* component from cal_ABDQ_.
+    
+    locBeta_vector : array
+        *β* component from cal_ABDQ_.
+    
+    locList_pll_orders : list of float
+        The PLL orders, same definition as the PLL order of cal_ABDQ_.
+    
+    Returns
+    -------
+    locD_frames : array
+        *d* components, (len(locList_pll_orders), samples).
+    
+    locQ_frames : array
+        *q* components, (len(locList_pll_orders), samples).
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        d_frames, q_frames = cal_DQ_frames(theta, alpha_vector, beta_vector, [-1, 2])
+    """
+    
+    locPll_orders = np.asarray(locList_pll_orders, dtype=float).reshape(-1)
+    
+    # (PLL orders, samples) angle block
+    locTheta_frames = np.outer(locPll_orders, locTheta)
+    
+    locD_frames, locQ_frames, locZero = cal_park_frames(locTheta_frames, 
+                                                        locAlpha_vector, 
+                                                        locBeta_vector, 
+                                                        np.zeros_like(locAlpha_vector))
+    
+    return locD_frames, locQ_frames
+    
+# =============================================================================
+# </Function: Calculate Park transforms for several PLL orders>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: parse PLL orders from a string>
+# =============================================================================
+    
+def parse_pll_orders(locStr_pll_orders, locInt_max=4):
+    """
+    .. _parse_pll_orders :
+    
+    Parse a comma (or space) delimited string of PLL orders into a list of 
+    floats. Items which are not floats are ignored. At most locInt_max orders
+    are kept.
+
+    Parameters
+    ----------
+    locStr_pll_orders : str
+        E.g., '-1, 2, 5'.
+        
+    locInt_max : int
+        The maximum number of PLL orders. Default is 4.
+    
+    Returns
+    -------
+    locList_pll_orders : list of float
+        The parsed PLL orders. Empty if none is found.
+
+    Examples
+    --------
+    >>> parse_pll_orders('-1, 2, a, 5')
+    [-1.0, 2.0, 5.0]
+    """
+    
+    locList_pll_orders = []
+    
+    for item in locStr_pll_orders.replace(',', ' ').split():
+        
+        try:
+            
+            locList_pll_orders.append(float(item))
+            
+        except ValueError:
+            
+            print(date_time_now() + 'Ignored PLL order : ' + item)
+            
+    return locList_pll_orders[:locInt_max]
+    
+# =============================================================================
+# </Function: parse PLL orders from a string>
+# =============================================================================
+    
+
 # =============================================================================
 # <Function: find PLL rotational direction>
 # =============================================================================
@@ -16,11 +16,18 @@ List of functions
 ------------------
 
 * animate_
+* animate_replay_
+* explore_on_clicked_
 * help_on_clicked_
 * init_
 * load_ffmpeg_on_clicked_
 * make_ani_
+* remove_pyramid_file_
+* reset_spectrogram_
+* stft_on_clicked_
 * video_play_on_clicked_
+* video_live_on_clicked_
+* video_replay_on_clicked_
 * video_save_on_clicked_
 * video_stop_on_clicked_
 
@@ -36,6 +43,7 @@ import matplotlib.animation as animation
 import tkinter as tk
 import tkinter.messagebox as msgbox
 import threading
+import tempfile
 import os
 import sys
 
@@ -43,10 +51,12 @@ import sys
 from numpy import sin, cos
 from matplotlib.widgets import Button, TextBox
 from tkinter import filedialog
+from tkinter import simpledialog
 
 # custom modules
 from gsyDqLib import date_time_now
 from gsyDqLib import cal_ABDQ
+from gsyDqLib import cal_DQ_frames, parse_pll_orders
 from gsyDqLib import find_pll_direction, find_sequences
 from gsyDqLib import set_font_size
 from gsyDqLib import collect_tb, load_ffmpeg
@@ -56,6 +66,20 @@ from gsyIO import save_txt_on_event, search_file_and_start
 
 from gsyINI import read_ini_to_tb, write_ini
 
+from gsyReplay import start_replay, read_replay, stop_replay
+
+from gsyLive import start_live, read_live, stop_live
+
+from gsyPyramid import build_pyramid, plot_pyramid
+
+from gsySampling import parse_sample_count
+
+from gsySpectrogram import start_stft, push_stft, plot_spectrogram, update_spectrogram
+
+from gsyStream import open_recording, stream_recording, make_theta
+
+from gsyVariants import cal_variant_clarke_park, parse_variant_names
+
 # matplotlib font settings
 mpl.rcParams['font.family'] = 'serif'
 mpl.rcParams['font.serif'] = 'Times New Roman'
@@ -77,6 +101,10 @@ CONST_DPI = 100
 
 CONST_STR_DOCT_FILENAME = 'index.html'
 
+CONST_INT_MAX_FRAMES = 4    # maximum number of extra PLL orders in the d-q plot
+
+CONST_LIST_FRAME_STYLES = ['--', '-.', ':', (0, (5, 1))]    # line styles of the extra PLL orders
+
 CONST_STR_COPYRIGHT = ('\u00a9 $Dr. GAO, \ Siyu. 2017$'                   
                        + '\n' + '$siyu.gao@outlook.com$') 
 
@@ -99,6 +127,8 @@ Negative number means the PLL is rotating clockwise.
 Samples :
 This sets how many samples are taken within one fundamental period. This also sets the total frames for the video. 
 Increasing this number would make the curves smoother. But the program would consume more resource.
+Enter auto for the fewest samples whose curves are within 1% of the amplitude, for the harmonic and PLL orders,
+or e.g. auto 0.002 for 0.2%.
 
 FPS :
 This sets the frame rate for saving video. This frame rate is not applied when runing on-the-fly.
@@ -106,6 +136,17 @@ This sets the frame rate for saving video. This frame rate is not applied when r
 Base Freq :
 This sets the fundamental frequency.
 
+Extra PLL Orders :
+This sets up to 4 extra PLL orders delimited by commas, e.g., -1, 2. The d and q components
+seen by these PLLs are drawn as thinner lines in the d-q plot. Leave it empty to disable.
+
+Replay Speed :
+This sets the speed of the replay of a recording, 1 is real time, 10 is 10 times faster.
+
+Variants :
+This sets the Clarke and Park transform variants of Replay, Live and Explore, e.g., clarke_power, park_q.
+clarke_amplitude, clarke_power, park_d, park_q and park_d_q_lagging are available. Leave it empty for the defaults.
+
 NOTE : you'd better to stop the video first before changing the above input field settings.
 
 Stop :
@@ -119,10 +160,32 @@ This button would trigger the video to be saved. Only limited progress would be
 due to the use of maplotlib's built-in save function. A message would be prompted when the save is finished.
 The codec FFmpeg is required. It's free to download and use. The FFmpeg binary (ffmpeg.exe) is required. 
 It's usually located in the "bin" folder. The video length equals Samples divided by FPS.
+Not available during Replay or Live, press Play to return to the synthetic harmonic first.
 
 Browse : 
 This button would allow you to browse for the FFmpeg binary.
 The path would be saved to an INI file and loaded on next program start-up.
+
+Replay :
+This button would allow you to select a recording (COMTRADE .cfg file, or CSV file of time, a, b, c columns)
+and replay it through the Clarke and Park transforms at the Replay Speed, with the PLL Order.
+The last base period is displayed, in per unit of the first samples' peak. The recording is read ahead
+in the background, so long recordings can be replayed. Play would return to the synthetic harmonic.
+
+Live :
+This button would allow you to enter a local live address, udp://host:port, unix://path or pipe://path,
+and display the samples received there, e.g., from a test rig or "python gsyLive.py udp://127.0.0.1:50000 --loop".
+The PLL Order and Base Freq are applied. Under-runs and dropped samples are counted on the display.
+
+Explore :
+This button would allow you to select a recording and plot its alpha, beta, d and q over the whole length
+in a new window, with the PLL Order. Use the zoom and pan tools of the window, the plots are refined
+on every zoom, so hours of samples can be explored.
+
+STFT :
+This button would turn the spectrogram (short-time Fourier transform) of alpha, beta, d and q on and off, for Replay and Live.
+The spectrogram scrolls in a new window while the samples arrive, useful for interharmonics and transients.
+Each column is 4 base periods of samples, i.e., a resolution of a quarter of the base frequency.
 '''
 
 print(date_time_now() + 'Started')
@@ -200,15 +263,31 @@ ax_tb_base_freq = plt.axes([0.262, 0.04, 0.03, 0.03])
 textbox_base_freq = TextBox(ax_tb_base_freq, 'Base \u0020 \n Freq : ', 
                             initial='', color='w')
 
+# text box, extra PLL orders for the d-q plot
+ax_tb_extra_pll_orders = plt.axes([0.6, 0.04, 0.1, 0.03])
+textbox_extra_pll_orders = TextBox(ax_tb_extra_pll_orders, 'Extra PLL \u0020 \n Orders : ', 
+                                   initial='', color='w')
+
 # text box, FFmpeg binary path
-ax_tb_ffmpeg_path = plt.axes([0.6, 0.005, 0.305, 0.03])
+ax_tb_ffmpeg_path = plt.axes([0.6, 0.005, 0.16, 0.03])
 textbox_ffmpeg_path = TextBox(ax_tb_ffmpeg_path, 'FFmpeg path :', 
                               initial='', color='w')
 
+# text box, replay speed of recordings
+ax_tb_replay_speed = plt.axes([0.79, 0.04, 0.03, 0.03])
+textbox_replay_speed = TextBox(ax_tb_replay_speed, 'Replay \u0020 \n Speed : ', 
+                               initial='', color='w')
+
+# text box, Clarke and Park Transform variants of the recordings, see gsyVariants
+ax_tb_variants = plt.axes([0.805, 0.005, 0.1, 0.03])
+textbox_variants = TextBox(ax_tb_variants, 'Variants : ', 
+                           initial='', color='w')
+
 # set text boxes' font family and font weight
 list_textbox = [textbox_input_harmonic, textbox_pll_order, 
                 textbox_samples, textbox_fps, textbox_base_freq,
-                textbox_ffmpeg_path]
+                textbox_ffmpeg_path, textbox_extra_pll_orders,
+                textbox_replay_speed, textbox_variants]
 
 for item in list_textbox:
     
@@ -250,11 +329,28 @@ ax_button_doct = plt.axes([0.4, 0.005, 0.08, 0.03])
 button_doct = Button(ax_button_doct, 'DOCT', color='skyblue')
 button_doct.label.set_fontsize(12)
 
+# button, replay a recording
+ax_button_replay = plt.axes([0.835, 0.04, 0.045, 0.03])
+button_replay = Button(ax_button_replay, 'Replay', color='gold')
+
+# button, display a live source
+ax_button_live = plt.axes([0.885, 0.04, 0.035, 0.03])
+button_live = Button(ax_button_live, 'Live', color='gold')
+
+# button, explore a recording by zoomable plots
+ax_button_explore = plt.axes([0.925, 0.04, 0.05, 0.03])
+button_explore = Button(ax_button_explore, 'Explore', color='skyblue')
+
+# button, streaming spectrogram of the replay or the live source on and off
+ax_button_stft = plt.axes([0.262, 0.005, 0.04, 0.03])
+button_stft = Button(ax_button_stft, 'STFT', color='skyblue')
+
 # set buttons' font family and font weight
 list_button = [button_stop, button_play, 
                button_save_video, 
                button_help, button_doct,
-               button_browse]
+               button_browse, button_replay, button_live,
+               button_explore, button_stft]
 
 for item in list_button:
     
@@ -304,8 +400,12 @@ if bool_ini_exist == True:
         
         dbl_base_period = 1 / dbl_base_freq
                 
-        int_samples = int(textbox_samples.text)
-        int_samples = abs(int_samples)
+        list_extra_pll_orders = parse_pll_orders(textbox_extra_pll_orders.text, 
+                                                 CONST_INT_MAX_FRAMES)
+        
+        # a number, or 'auto' for the fewest samples of the curves
+        int_samples = parse_sample_count(textbox_samples.text, dbl_harmonic_order,
+                                         [dbl_pll_order] + list_extra_pll_orders)
         
         int_fps = int(textbox_fps.text)
         int_fps = abs(int_fps)
@@ -323,6 +423,7 @@ if bool_ini_exist == True:
         int_samples = 200
         int_fps = 30
         str_ffmpeg_path = ''
+        list_extra_pll_orders = []
     
 else:
     
@@ -334,6 +435,7 @@ else:
         int_samples = 200
         int_fps = 30
         str_ffmpeg_path = ''
+        list_extra_pll_orders = []
 # </Condition>
 
 # make the data
@@ -346,6 +448,10 @@ d_vector_on_x, d_vector_on_y,
 q_vector_on_x, q_vector_on_y) = cal_ABDQ(int_samples, dbl_base_freq, 
                                          dbl_harmonic_order, dbl_pll_order)
 
+# make the d and q data of the extra PLL orders, one row per PLL order
+d_frames, q_frames = cal_DQ_frames(theta, alpha_vector, beta_vector, 
+                                   list_extra_pll_orders)
+
 # get pll frequency info
 str_freq_pll = find_pll_direction(dbl_base_freq, dbl_pll_order)
 
@@ -536,7 +642,8 @@ ax2.set_xlim([0, dbl_base_period])
 
 # set y axis limits
 # find the maximum of all data points and add 0.05 to it
-ylim_max = (max(max(alpha_vector), max(beta_vector), max(d_vector), max(q_vector)) 
+ylim_max = (max(max(alpha_vector), max(beta_vector), max(d_vector), max(q_vector),
+                np.max(d_frames, initial=0), np.max(q_frames, initial=0)) 
             + 0.05)
 
 ylim_min = -1 * ylim_max
@@ -648,9 +755,32 @@ ax3_d_vs_time, = ax3.plot([], [], label = r'$d$',
 # to be animated, q line
 ax3_q_vs_time, = ax3.plot([], [], label = r'$q$', 
                           color=CONST_PURPLE, linewidth=3)
+
+# to be animated, d and q lines of the extra PLL orders
+ax3_d_frames = []
+ax3_q_frames = []
+
+for item in np.arange(0, CONST_INT_MAX_FRAMES, 1):
+    
+    temp_plot, = ax3.plot([], [], color=CONST_ORANGE, linewidth=1.5,
+                          linestyle=CONST_LIST_FRAME_STYLES[item])
+    
+    ax3_d_frames.append(temp_plot)
+    
+    temp_plot, = ax3.plot([], [], color=CONST_PURPLE, linewidth=1.5,
+                          linestyle=CONST_LIST_FRAME_STYLES[item])
+    
+    ax3_q_frames.append(temp_plot)
+
+for item in np.arange(0, len(list_extra_pll_orders), 1):
+    
+    ax3_d_frames[item].set_label(r'$d, \ PLL = ' + str(list_extra_pll_orders[item]) + r'$')
+    ax3_q_frames[item].set_label(r'$q, \ PLL = ' + str(list_extra_pll_orders[item]) + r'$')
             
 # static, set legend
-ax3Legend = plt.legend(handles=[ax3_d_vs_time, ax3_q_vs_time], 
+ax3Legend = plt.legend(handles=([ax3_d_vs_time, ax3_q_vs_time] 
+                                + ax3_d_frames[:len(list_extra_pll_orders)] 
+                                + ax3_q_frames[:len(list_extra_pll_orders)]), 
                        title=str_freq_park,
                        loc = 'upper right', shadow=True, fancybox=True,
                        bbox_to_anchor=(1.28, 1))
@@ -728,6 +858,8 @@ def init():
     ax3_d_help_line         : matplotlib plot object
     ax3_q_help_line         : matplotlib plot object
     ax3_text_pll_locked     : matplotlib text object
+    tuple(ax3_d_frames)     : a tuple of a list of matplotlib plot object
+    tuple(ax3_q_frames)     : a tuple of a list of matplotlib plot object
 
     Examples
     --------
@@ -863,6 +995,11 @@ def init():
     
     ax3_text_pll_locked.set_text('')
     
+    # ax3 d and q lines of the extra PLL orders
+    for item in ax3_d_frames + ax3_q_frames:
+        item.set_xdata([])
+        item.set_ydata([])
+    
     # to return a list of objects for animation, you need "tuple"
     return  (tuple(ax2_period_lines) 
              + tuple(ax2_period_text) 
@@ -880,7 +1017,9 @@ def init():
                 ax2_alpha_help_line, ax2_beta_help_line,
                 ax3_d_vs_time, ax3_q_vs_time,
                 ax3_d_help_line, ax3_q_help_line,
-                ax3_text_pll_locked))
+                ax3_text_pll_locked)
+             + tuple(ax3_d_frames) 
+             + tuple(ax3_q_frames))
     
 # =============================================================================
 # </Function: initialisation for animation>    
@@ -938,6 +1077,8 @@ def animate(item):
     ax3_d_help_line         : matplotlib plot object
     ax3_q_help_line         : matplotlib plot object
     ax3_text_pll_locked     : matplotlib text object
+    tuple(ax3_d_frames)     : a tuple of a list of matplotlib plot object
+    tuple(ax3_q_frames)     : a tuple of a list of matplotlib plot object
 
     Examples
     --------
@@ -1184,6 +1325,15 @@ def animate(item):
     
     ax3_q_vs_time.set_ydata(q_vector[0:item])
     
+    # update ax3 plots of the extra PLL orders, all rows of the same blocks
+    for k in np.arange(0, len(d_frames), 1):
+        
+        ax3_d_frames[k].set_xdata(time[0:item])
+        ax3_d_frames[k].set_ydata(d_frames[k, 0:item])
+        
+        ax3_q_frames[k].set_xdata(time[0:item])
+        ax3_q_frames[k].set_ydata(q_frames[k, 0:item])
+    
     # update ax3 helping lines    
     int_remainder = np.mod(dbl_harmonic_order, 3)
     
@@ -1263,12 +1413,292 @@ def animate(item):
                ax2_alpha_help_line, ax2_beta_help_line,
                ax3_d_vs_time, ax3_q_vs_time,
                ax3_d_help_line, ax3_q_help_line,
-               ax3_text_pll_locked))
+               ax3_text_pll_locked)
+            + tuple(ax3_d_frames) 
+            + tuple(ax3_q_frames))
     
 # =============================================================================
 # </Function: updates for animation>    
 # =============================================================================
 
+# =============================================================================
+# <Function: updates for the replay animation>
+# =============================================================================
+
+def animate_replay(item):
+    """
+    .. _animate_replay :
+        
+    matplotlib's documentation:
+    https://matplotlib.org/api/animation_api.html
+    
+    This function updates the animation with the replay of a recording 
+    (gsyReplay) or with a live source (gsyLive). The samples which are due by 
+    the wall clock, or the samples received, are read and appended to a 
+    sliding window of one base period. The plots of ax2 and ax3 show the 
+    sliding window, the vectors of ax1 show the latest sample.
+
+    Parameters
+    ----------
+    item : int
+        The frame number, not used. The replay is paced by the wall clock, the
+        live source by the sender.
+            
+    Returns
+    -------
+    tuple of matplotlib objects
+        The updated objects.
+
+    Examples
+    --------
+    .. code:: python
+    
+        animation.FuncAnimation(fig_main, animate_replay, interval=1/int_fps*1e3, 
+                                init_func=init)
+    """
+    
+    global dict_replay_window
+    global dict_stft, dict_stft_images, fig_stft
+    
+    locBool_done = dict_replay['done']
+    
+    if dict_replay['kind'] == 'live':
+        
+        locDict_samples = read_live(dict_replay)
+        
+        # no frame received yet
+        if dict_replay['fs'] is None:
+            
+            return ()
+        
+        else:
+            
+            pass
+        
+        locStr_buffer = ('Drops : ' + str(dict_replay['dropped'] + dict_replay['lost'] 
+                                          + dict_replay['skipped']))
+        
+        # broken frames are counted in frames, not in samples
+        if dict_replay['bad_frames'] > 0:
+            
+            locStr_buffer = locStr_buffer + ', Bad frames : ' + str(dict_replay['bad_frames'])
+            
+        else:
+            
+            pass
+        
+    else:
+        
+        locDict_samples = read_replay(dict_replay)
+        
+        locStr_buffer = 'Buffer : ' + str(dict_replay['queue'].qsize())
+    
+    # samples of one base period of the recording
+    locInt_window = max(2, int(round(dict_replay['fs'] / dict_replay['base_freq'])))
+    
+    for k in dict_replay_window:
+        
+        dict_replay_window[k] = np.concatenate((dict_replay_window[k], 
+                                                locDict_samples[k]))[-locInt_window:]
+    
+    # the spectrogram window is closed by the user
+    if (fig_stft is not None) and (plt.fignum_exists(fig_stft.number) == False):
+        
+        stft_on_clicked(None)
+        
+    else:
+        
+        pass
+    
+    # the streaming spectrogram, only the columns of the new samples are calculated
+    if bool_spectrogram == True:
+        
+        if dict_stft is None:
+            
+            # frames of 4 base periods, i.e., a resolution of a quarter of the 
+            # base frequency, up to the 20th harmonic
+            dict_stft = start_stft(dict_replay['fs'], 4 * locInt_window)
+            
+            fig_stft, dict_stft_images = plot_spectrogram(dict_stft, 'Spectrogram',
+                                                          min(20 * dict_replay['base_freq'],
+                                                              dict_replay['fs'] / 2))
+            
+            fig_stft.show()
+            
+        else:
+            
+            pass
+        
+        if push_stft(dict_stft, locDict_samples) > 0:
+            
+            update_spectrogram(dict_stft, dict_stft_images)
+            
+            fig_stft.canvas.draw_idle()
+            
+        else:
+            
+            pass
+        
+    else:
+        
+        pass
+    
+    # the end of the recording is reached in this frame
+    if (locBool_done == False) and (dict_replay['done'] == True):
+        
+        ani.event_source.stop()
+        
+        if dict_replay['error'] is None:
+            
+            print(date_time_now() + 'Replay complete')
+            
+        else:
+            
+            print(date_time_now() + 'Replay error : ' + dict_replay['error'])
+            
+            if dict_replay['kind'] == 'live':
+                
+                # the window keeps the samples received so far
+                return ()
+            
+            else:
+                
+                pass
+            
+    else:
+        
+        pass
+    
+    locTime = dict_replay_window['time']
+    
+    if len(locTime) == 0:
+        
+        return ()
+    
+    else:
+        
+        pass
+    
+    locAlpha = dict_replay_window['alpha']
+    locBeta = dict_replay_window['beta']
+    locD = dict_replay_window['d']
+    locQ = dict_replay_window['q']
+    
+    locDbl_theta = dict_replay_window['theta'][-1]
+    
+    # d and q axes of the latest sample
+    locDbl_d_x = cos(locDbl_theta)
+    locDbl_d_y = sin(locDbl_theta)
+    
+    locDbl_q_x = -sin(locDbl_theta)
+    locDbl_q_y = cos(locDbl_theta)
+    
+    locDbl_d_vector_x = locD[-1] * locDbl_d_x
+    locDbl_d_vector_y = locD[-1] * locDbl_d_y
+    
+    locDbl_q_vector_x = locQ[-1] * locDbl_q_x
+    locDbl_q_vector_y = locQ[-1] * locDbl_q_y
+    
+    # update ax1 info strings
+    ax1_text_info.set_text(r'$t = {:0.5f}'.format(locTime[-1]) + '\ s$'
+                           + '\n' + r'$\theta_{PLL} = $' 
+                           + '${:0.3f}'.format(np.degrees(locDbl_theta)) + '^{\circ}$'
+                           + '\n' + locStr_buffer 
+                           + ', under-runs : ' + str(dict_replay['underruns']))
+    
+    # update ax1 d and q axes
+    ax1_d_ax_pos.xy = (2 * locDbl_d_x, 2 * locDbl_d_y)
+    
+    ax1_d_ax_neg.set_xdata([0, -2 * locDbl_d_x])
+    ax1_d_ax_neg.set_ydata([0, -2 * locDbl_d_y])
+    
+    ax1_d_label.set_x(2.1 * locDbl_d_x)
+    ax1_d_label.set_y(2.1 * locDbl_d_y)
+    ax1_d_label.set_va('bottom' if locDbl_d_y > 0 else 'top')
+    ax1_d_label.set_text('$d$')
+    
+    ax1_q_ax_pos.xy = (2 * locDbl_q_x, 2 * locDbl_q_y)
+    
+    ax1_q_ax_neg.set_xdata([0, -2 * locDbl_q_x])
+    ax1_q_ax_neg.set_ydata([0, -2 * locDbl_q_y])
+    
+    ax1_q_label.set_x(2.1 * locDbl_q_x)
+    ax1_q_label.set_y(2.1 * locDbl_q_y)
+    ax1_q_label.set_va('bottom' if locDbl_q_y > 0 else 'top')
+    ax1_q_label.set_text('$q$')
+    
+    # update ax1 helping lines
+    ax1_help_line_alpha.set_xdata([locAlpha[-1], locAlpha[-1]])
+    ax1_help_line_alpha.set_ydata([0, locBeta[-1]])
+    
+    ax1_help_line_beta.set_xdata([0, locAlpha[-1]])
+    ax1_help_line_beta.set_ydata([locBeta[-1], locBeta[-1]])
+    
+    ax1_help_line_d.set_xdata([locDbl_d_vector_x, locAlpha[-1]])
+    ax1_help_line_d.set_ydata([locDbl_d_vector_y, locBeta[-1]])
+    
+    ax1_help_line_q.set_xdata([locDbl_q_vector_x, locAlpha[-1]])
+    ax1_help_line_q.set_ydata([locDbl_q_vector_y, locBeta[-1]])
+    
+    # update ax1 arrows
+    ax1_alpha_arrow.xy = (locAlpha[-1], 0)
+    ax1_beta_arrow.xy = (0, locBeta[-1])
+    ax1_harmonic_arrow.xy = (locAlpha[-1], locBeta[-1])
+    ax1_d_vector_arrow.xy = (locDbl_d_vector_x, locDbl_d_vector_y)
+    ax1_q_vector_arrow.xy = (locDbl_q_vector_x, locDbl_q_vector_y)
+    
+    # the trajectory of the last base period
+    ax1_ellipse.set_xdata(locAlpha)
+    ax1_ellipse.set_ydata(locBeta)
+    
+    # update ax2 and ax3, the sliding window
+    locList_xlim = [locTime[0], locTime[0] + 1 / dict_replay['base_freq']]
+    
+    ax2.set_xlim(locList_xlim)
+    ax3.set_xlim(locList_xlim)
+    
+    ax2_alpha_vs_time.set_xdata(locTime)
+    ax2_alpha_vs_time.set_ydata(locAlpha)
+    
+    ax2_beta_vs_time.set_xdata(locTime)
+    ax2_beta_vs_time.set_ydata(locBeta)
+    
+    ax2_alpha_help_line.set_xdata([locTime[0], locTime[-1]])
+    ax2_alpha_help_line.set_ydata([locAlpha[-1], locAlpha[-1]])
+    
+    ax2_beta_help_line.set_xdata([locTime[0], locTime[-1]])
+    ax2_beta_help_line.set_ydata([locBeta[-1], locBeta[-1]])
+    
+    ax3_d_vs_time.set_xdata(locTime)
+    ax3_d_vs_time.set_ydata(locD)
+    
+    ax3_q_vs_time.set_xdata(locTime)
+    ax3_q_vs_time.set_ydata(locQ)
+    
+    ax3_d_help_line.set_xdata([locTime[0], locTime[-1]])
+    ax3_d_help_line.set_ydata([locD[-1], locD[-1]])
+    
+    ax3_q_help_line.set_xdata([locTime[0], locTime[-1]])
+    ax3_q_help_line.set_ydata([locQ[-1], locQ[-1]])
+    
+    return (ax1_text_info,
+            ax1_d_ax_pos, ax1_d_ax_neg, ax1_d_label,
+            ax1_q_ax_pos, ax1_q_ax_neg, ax1_q_label,
+            ax1_help_line_alpha, ax1_help_line_beta, 
+            ax1_help_line_d, ax1_help_line_q,
+            ax1_ellipse,
+            ax1_alpha_arrow, ax1_beta_arrow, ax1_harmonic_arrow,
+            ax1_d_vector_arrow, ax1_q_vector_arrow,
+            ax2_alpha_vs_time, ax2_beta_vs_time,
+            ax2_alpha_help_line, ax2_beta_help_line,
+            ax3_d_vs_time, ax3_q_vs_time,
+            ax3_d_help_line, ax3_q_help_line)
+
+# =============================================================================
+# </Function: updates for the replay animation>
+# =============================================================================
+
+
 
 # =============================================================================
 # <Function: make the animation>
@@ -1360,6 +1790,25 @@ def make_ani(locFig, locInt_samples, locInt_fps):
 
 ani = make_ani(fig_main, int_samples, int_fps)
 
+# the replay of a recording (gsyReplay) or the live source (gsyLive) and its 
+# sliding window of one base period, None while the synthetic harmonic is played
+dict_replay = None
+
+dict_replay_window = None
+
+# the last live address
+str_live_address = 'udp://127.0.0.1:50000'
+
+# the streaming spectrogram of the replay or the live source (gsySpectrogram), 
+# turned on and off by the "STFT" button
+bool_spectrogram = False
+
+dict_stft = None
+
+dict_stft_images = None
+
+fig_stft = None
+
 
 # =============================================================================
 # <Function: "Play" button on_clicked event handler>
@@ -1401,6 +1850,7 @@ def video_play_on_clicked(event):
     global time, theta
     global alpha_vector, beta_vector
     global d_vector, q_vector
+    global d_frames, q_frames, list_extra_pll_orders
     global d_ax_on_x, d_ax_on_y
     global q_ax_on_x, q_ax_on_y
     global d_vector_on_x, d_vector_on_y
@@ -1418,17 +1868,41 @@ def video_play_on_clicked(event):
     
     global ax2
     global ax3
+    global ax3Legend
     
     global fig_main
     global ani
+    global dict_replay
     
     global list_textbox
     global textbox_input_harmonic, textbox_pll_order
     global textbox_samples, textbox_fps, textbox_base_freq, textbox_ffmpeg_path
+    global textbox_extra_pll_orders
     
     # stop the animation
     ani.event_source.stop()
     
+    # stop the replay of a recording or the live source, back to the 
+    # synthetic harmonic
+    if dict_replay is not None:
+        
+        if dict_replay['kind'] == 'live':
+            
+            stop_live(dict_replay)
+            
+        else:
+            
+            stop_replay(dict_replay)
+        
+        dict_replay = None
+        
+        reset_spectrogram()
+        
+        init()
+        
+    else:
+        
+        pass
     
     try:
         
@@ -1489,9 +1963,22 @@ def video_play_on_clicked(event):
                         
         return None
     
+    list_extra_pll_orders = parse_pll_orders(textbox_extra_pll_orders.text, 
+                                             CONST_INT_MAX_FRAMES)
+    
     try:
         
-        int_samples = int(textbox_samples.text)
+        # a number, or 'auto' for the fewest samples of the curves
+        int_samples = parse_sample_count(textbox_samples.text, dbl_harmonic_order,
+                                         [dbl_pll_order] + list_extra_pll_orders)
+        
+        if textbox_samples.text.strip().lower().startswith('auto'):
+            
+            print(date_time_now() + 'Auto samples : ' + str(int_samples))
+            
+        else:
+            
+            pass
         
     except:
         
@@ -1549,6 +2036,9 @@ def video_play_on_clicked(event):
                                                 dbl_harmonic_order, 
                                                 dbl_pll_order)
     
+    d_frames, q_frames = cal_DQ_frames(theta, alpha_vector, beta_vector, 
+                                       list_extra_pll_orders)
+    
     (str_freq_harmonic, 
      str_freq_clarke, 
      str_freq_park, 
@@ -1556,7 +2046,8 @@ def video_play_on_clicked(event):
      dbl_period_park) = find_sequences(dbl_base_freq, dbl_harmonic_order, dbl_pll_order)
     
     # find the maximum of all data points
-    ylim_max = max(max(alpha_vector), max(beta_vector), max(d_vector), max(q_vector)) + 0.05
+    ylim_max = max(max(alpha_vector), max(beta_vector), max(d_vector), max(q_vector),
+                   np.max(d_frames, initial=0), np.max(q_frames, initial=0)) + 0.05
     
     ylim_min = -1 * ylim_max
     
@@ -1574,7 +2065,20 @@ def video_play_on_clicked(event):
     ax3.set_xlim([0, dbl_base_period])
     ax3.set_ylim([ylim_min, ylim_max])
     
-    ax3Legend.set_title(str_freq_park)
+    for item in np.arange(0, len(list_extra_pll_orders), 1):
+        
+        ax3_d_frames[item].set_label(r'$d, \ PLL = ' + str(list_extra_pll_orders[item]) + r'$')
+        ax3_q_frames[item].set_label(r'$q, \ PLL = ' + str(list_extra_pll_orders[item]) + r'$')
+    
+    ax3Legend = ax3.legend(handles=([ax3_d_vs_time, ax3_q_vs_time] 
+                                    + ax3_d_frames[:len(list_extra_pll_orders)] 
+                                    + ax3_q_frames[:len(list_extra_pll_orders)]), 
+                           title=str_freq_park,
+                           loc = 'upper right', shadow=True, fancybox=True,
+                           bbox_to_anchor=(1.28, 1))
+    
+    ax3Legend.get_title().set_fontsize('9')
+    plt.setp(ax3Legend.get_texts(), fontsize='10')
     
     ani = make_ani(fig_main, int_samples, int_fps)    
     
@@ -1637,83 +2141,725 @@ def video_stop_on_clicked(event, locObj_animation):
 # </Function: "Stop" button on_clicked event handler>
 # =============================================================================
 
-    
+
 # =============================================================================
-# <Function: "Save video" button on_clicked event handler>    
+# <Function: "Replay" button on_clicked event handler>
 # =============================================================================
 
-def video_save_on_clicked(event, locObj_animation, 
-               locTextbox_fps, locTextbox_ffmpeg_path, 
-               locList_textbox, locList_button, locIni_file_path):
+def video_replay_on_clicked(event):
     
     """
-    .. _video_save_on_clicked :
-    
-    This function saves the animation to the harddrive.
-    
-    If the given FFmpeg's path is not valid, a file dialogue would prompted to 
-    allow the user to select the FFmpeg's exectuable binary.
-    
-    A file dialogue would be prompted to allow user to save the video.
+    .. _video_replay_on_clicked :
     
-    The animation object's figure would be closed during save. Limited saving
-    progress info would be printed to the console.
-    
-    After the video is saved, the script would try to restart if it is run in 
-    "python.exe" (run rom terminal or cmd). If this script is run in IDLE 
-    (run by "pythonw.exe"), then you need to manually restart the script 
-    (otherwise the kernel is very likely to crash).
+    This function asks for a recording (COMTRADE .cfg or CSV file) and replays
+    it into the animation (animate_replay_), at the speed of the "Replay Speed"
+    text box and with the PLL order of the "Input PLL Order" text box. The 
+    base frequency of CSV files is the one of the "Base Freq" text box. The
+    transforms are the variants of the "Variants" text box (gsyVariants).
     
-    Reference for using "lambda" : https://goo.gl/zDmGPR
+    The recording is read ahead by a background thread into a bounded queue 
+    (gsyReplay.start_replay), so the animation does not wait for the disk.
 
     Parameters
     ----------
     event : event
         The event that triggers this function.
-        
-    locObj_animation : matplotlib animation object
-        The animation to be saved.
-        
-    locTextbox_fps : int
-        The frame per second for the anmation. This parameter would be passed
-        to the video writer.
-        
-    locTextbox_ffmpeg_path : str
-        Path of FFmepg executable binary.
-    
-    locList_textbox : list of matplotlib textbox objects
-        These textboxes would be hidden.
-    
-    locList_button : list of matplotlib button objects
-        These buttons would be hidden.
-    
-    locIni_file_path : str
-        The INI file path to be used to save user configurations.
-            
+                
     Returns
     -------
-    None.
+    None
 
     Examples
     --------
     
     .. code:: python
     
-        button_save_video.on_clicked(lambda x: video_save_on_clicked(x, 
-                                                                     ani, 
-                                                                     textbox_fps,
-                                                                     textbox_ffmpeg_path, 
-                                                                     list_textbox, 
-                                                                     list_button, 
-                                                                     str_ini_file_path))
+        button_replay.on_clicked(video_replay_on_clicked)
     """
-     
-    # prompt save video message box, yes/no
     
-    locStr_message = ('Do you want to save the video?' 
-                      + '\n' + 'This will take a while.'
-                      + '\n' + 'Only limited progress info will be printed to the console.'
-                      + '\n' + 'You have to wait.'
+    global ani
+    global dict_replay, dict_replay_window
+    global fig_main
+    
+    ani.event_source.stop()
+    
+    if dict_replay is not None:
+        
+        if dict_replay['kind'] == 'live':
+            
+            stop_live(dict_replay)
+            
+        else:
+            
+            stop_replay(dict_replay)
+        
+        dict_replay = None
+        
+        reset_spectrogram()
+        
+    else:
+        
+        pass
+    
+    locRoot = tk.Tk()
+    
+    locRoot.withdraw()
+    
+    locStr_path = filedialog.askopenfilename(initialdir=os.getcwd(),
+                                             title='Select a recording',
+                                             filetypes=(('COMTRADE files', '*.cfg'),
+                                                        ('CSV files', '*.csv'),
+                                                        ('all files', '*.*')))
+    
+    locRoot.destroy()
+    
+    # if cancelled
+    if len(locStr_path) == 0:
+        
+        print(date_time_now() + 'Replay cancelled')
+        
+        return None
+    
+    else:
+        
+        pass
+    
+    try:
+        
+        locDbl_speed = abs(float(textbox_replay_speed.text))
+        
+        if locDbl_speed == 0:
+            
+            locDbl_speed = 1
+            
+        else:
+            
+            pass
+        
+    except ValueError:
+        
+        locDbl_speed = 1
+        
+        textbox_replay_speed.set_val('1')
+    
+    try:
+        
+        locDbl_pll_order = float(textbox_pll_order.text)
+        
+    except ValueError:
+        
+        locDbl_pll_order = 1
+    
+    try:
+        
+        locDbl_base_freq = abs(float(textbox_base_freq.text))
+        
+    except ValueError:
+        
+        locDbl_base_freq = 50
+    
+    try:
+        
+        locStr_clarke, locStr_park = parse_variant_names(textbox_variants.text)
+        
+        dict_replay = start_replay(locStr_path, locDbl_speed, locDbl_pll_order,
+                                   locDbl_base_freq=(locDbl_base_freq or 50),
+                                   locStr_clarke=locStr_clarke, locStr_park=locStr_park)
+        
+    except Exception as locError:
+        
+        locRoot = tk.Tk()
+    
+        locRoot.withdraw()
+        
+        msgbox.showerror('Cannot replay', str(locError))
+        
+        locRoot.destroy()
+        
+        return None
+    
+    print(date_time_now() + 'Replaying "' + locStr_path + '" at ' 
+          + str(locDbl_speed) + ' times real time')
+    
+    dict_replay_window = {'time': np.zeros(0), 'theta': np.zeros(0),
+                          'alpha': np.zeros(0), 'beta': np.zeros(0),
+                          'd': np.zeros(0), 'q': np.zeros(0)}
+    
+    # per unit values, the same scales as the synthetic harmonic
+    ax2.set_ylim([-1.5, 1.5])
+    ax3.set_ylim([-1.5, 1.5])
+    
+    ax1_text_freq_harmonic.set_text(os.path.basename(locStr_path))
+    ax1_text_freq_pll.set_text(find_pll_direction(dict_replay['base_freq'], 
+                                                  locDbl_pll_order))
+    
+    init()
+    
+    # no blit, the time axes slide with the replay
+    ani = animation.FuncAnimation(fig_main, animate_replay, 
+                                  interval=1/max(int_fps, 1)*1e3, 
+                                  save_count=int_samples)
+    
+    ani.event_source.start()
+
+# =============================================================================
+# </Function: "Replay" button on_clicked event handler>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: "Live" button on_clicked event handler>
+# =============================================================================
+
+def video_live_on_clicked(event):
+    
+    """
+    .. _video_live_on_clicked :
+    
+    This function asks for a local live address (gsyLive), e.g., 
+    udp://127.0.0.1:50000, and displays the samples received there 
+    (animate_replay_), with the PLL order of the "Input PLL Order" text box,
+    the base frequency of the "Base Freq" text box and the transform variants
+    of the "Variants" text box.
+    
+    The samples are received by a background thread into a ring buffer 
+    (gsyLive.start_live). The under-runs and the dropped samples are shown 
+    in ax1.
+
+    Parameters
+    ----------
+    event : event
+        The event that triggers this function.
+                
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        button_live.on_clicked(video_live_on_clicked)
+    """
+    
+    global ani
+    global dict_replay, dict_replay_window
+    global str_live_address
+    global fig_main
+    
+    ani.event_source.stop()
+    
+    if dict_replay is not None:
+        
+        if dict_replay['kind'] == 'live':
+            
+            stop_live(dict_replay)
+            
+        else:
+            
+            stop_replay(dict_replay)
+        
+        dict_replay = None
+        
+        reset_spectrogram()
+        
+    else:
+        
+        pass
+    
+    locRoot = tk.Tk()
+    
+    locRoot.withdraw()
+    
+    locStr_address = simpledialog.askstring('Live source', 
+                                            'udp://host:port, unix://path or pipe://path', 
+                                            initialvalue=str_live_address)
+    
+    locRoot.destroy()
+    
+    # if cancelled
+    if (locStr_address is None) or (len(locStr_address.strip()) == 0):
+        
+        print(date_time_now() + 'Live cancelled')
+        
+        return None
+    
+    else:
+        
+        pass
+    
+    try:
+        
+        locDbl_pll_order = float(textbox_pll_order.text)
+        
+    except ValueError:
+        
+        locDbl_pll_order = 1
+    
+    try:
+        
+        locDbl_base_freq = abs(float(textbox_base_freq.text))
+        
+    except ValueError:
+        
+        locDbl_base_freq = 50
+    
+    try:
+        
+        locStr_clarke, locStr_park = parse_variant_names(textbox_variants.text)
+        
+        dict_replay = start_live(locStr_address, (locDbl_base_freq or 50), locDbl_pll_order,
+                                 locStr_clarke=locStr_clarke, locStr_park=locStr_park)
+        
+    except Exception as locError:
+        
+        locRoot = tk.Tk()
+    
+        locRoot.withdraw()
+        
+        msgbox.showerror('Cannot open live source', str(locError))
+        
+        locRoot.destroy()
+        
+        return None
+    
+    str_live_address = locStr_address
+    
+    print(date_time_now() + 'Receiving from "' + locStr_address + '"')
+    
+    dict_replay_window = {'time': np.zeros(0), 'theta': np.zeros(0),
+                          'alpha': np.zeros(0), 'beta': np.zeros(0),
+                          'd': np.zeros(0), 'q': np.zeros(0)}
+    
+    # per unit values, the same scales as the synthetic harmonic
+    ax2.set_ylim([-1.5, 1.5])
+    ax3.set_ylim([-1.5, 1.5])
+    
+    ax1_text_freq_harmonic.set_text(locStr_address)
+    ax1_text_freq_pll.set_text(find_pll_direction(dict_replay['base_freq'], 
+                                                  locDbl_pll_order))
+    
+    init()
+    
+    # no blit, the time axes slide with the live source
+    ani = animation.FuncAnimation(fig_main, animate_replay, 
+                                  interval=1/max(int_fps, 1)*1e3, 
+                                  save_count=int_samples)
+    
+    ani.event_source.start()
+
+# =============================================================================
+# </Function: "Live" button on_clicked event handler>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: reset the streaming spectrogram>
+# =============================================================================
+
+def reset_spectrogram():
+    
+    """
+    .. _reset_spectrogram :
+    
+    This function closes the spectrogram figure and drops its STFT, e.g., when
+    the replay or the live source stops. If the "STFT" button is on, a 
+    new spectrogram starts with the next source.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        reset_spectrogram()
+    """
+    
+    global dict_stft, dict_stft_images, fig_stft
+    
+    if fig_stft is not None:
+        
+        plt.close(fig_stft)
+        
+    else:
+        
+        pass
+    
+    dict_stft = None
+    
+    dict_stft_images = None
+    
+    fig_stft = None
+
+# =============================================================================
+# </Function: reset the streaming spectrogram>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: "STFT" button on_clicked event handler>
+# =============================================================================
+
+def stft_on_clicked(event):
+    
+    """
+    .. _stft_on_clicked :
+    
+    This function turns the streaming spectrogram of α, β, *d* and *q* on and 
+    off. While on, the samples of the replay or the live source are pushed 
+    into a short-time Fourier transform (gsySpectrogram) by animate_replay_, 
+    and the spectrogram scrolls in its own figure. Closing the figure turns 
+    it off.
+    
+    The synthetic harmonic of the "Play" button has no spectrogram, its *d* 
+    and *q* are periodic.
+
+    Parameters
+    ----------
+    event : event
+        The event that triggers this function.
+                
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        button_stft.on_clicked(stft_on_clicked)
+    """
+    
+    global bool_spectrogram
+    
+    bool_spectrogram = not bool_spectrogram
+    
+    if bool_spectrogram == True:
+        
+        print(date_time_now() + 'Spectrogram on, for Replay and Live')
+        
+    else:
+        
+        reset_spectrogram()
+        
+        print(date_time_now() + 'Spectrogram off')
+    
+    button_stft.color = 'gold' if bool_spectrogram == True else 'skyblue'
+    
+    button_stft.hovercolor = button_stft.color
+    
+    fig_main.canvas.draw_idle()
+
+# =============================================================================
+# </Function: "STFT" button on_clicked event handler>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: remove the file of a pyramid>
+# =============================================================================
+
+def remove_pyramid_file(event, locDict_pyramid, locStr_raw):
+    
+    """
+    .. _remove_pyramid_file :
+    
+    This function releases the memory-mapped raw samples of a pyramid and 
+    deletes their temporary file, e.g., when the figure of explore_on_clicked_ 
+    is closed.
+
+    Parameters
+    ----------
+    event : event
+        The event that triggers this function, not used.
+    
+    locDict_pyramid : dict or None
+        The pyramid (gsyPyramid.build_pyramid), None if it was not built.
+    
+    locStr_raw : str
+        Path of the temporary file.
+                
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        fig.canvas.mpl_connect('close_event', 
+                               lambda x: remove_pyramid_file(x, pyramid, str_raw))
+    """
+    
+    if locDict_pyramid is not None:
+        
+        # the mapping must be closed before the file is deleted on Windows
+        locDict_pyramid['raw'] = None
+        
+    else:
+        
+        pass
+    
+    try:
+        
+        os.remove(locStr_raw)
+        
+    except OSError:
+        
+        print(date_time_now() + 'Cannot delete "' + locStr_raw + '"')
+
+# =============================================================================
+# </Function: remove the file of a pyramid>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: "Explore" button on_clicked event handler>
+# =============================================================================
+
+def explore_on_clicked(event):
+    
+    """
+    .. _explore_on_clicked :
+    
+    This function asks for a recording (COMTRADE .cfg or CSV file), runs it
+    through the Clarke and Park Transforms of the "Variants" text box with the
+    PLL order of the "Input PLL Order" text box, and plots α, β, *d* and *q* over the whole 
+    recording in a new figure (gsyPyramid.plot_pyramid). The figure draws 
+    about two points per pixel from a min/max pyramid at any zoom.
+    
+    The raw results are kept in a temporary file, memory-mapped.
+
+    Parameters
+    ----------
+    event : event
+        The event that triggers this function.
+                
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        button_explore.on_clicked(explore_on_clicked)
+    """
+    
+    locRoot = tk.Tk()
+    
+    locRoot.withdraw()
+    
+    locStr_path = filedialog.askopenfilename(initialdir=os.getcwd(),
+                                             title='Select a recording',
+                                             filetypes=(('COMTRADE files', '*.cfg'),
+                                                        ('CSV files', '*.csv'),
+                                                        ('all files', '*.*')))
+    
+    locRoot.destroy()
+    
+    # if cancelled
+    if len(locStr_path) == 0:
+        
+        print(date_time_now() + 'Explore cancelled')
+        
+        return None
+    
+    else:
+        
+        pass
+    
+    try:
+        
+        locDbl_pll_order = float(textbox_pll_order.text)
+        
+    except ValueError:
+        
+        locDbl_pll_order = 1
+    
+    try:
+        
+        locDbl_base_freq = abs(float(textbox_base_freq.text))
+        
+    except ValueError:
+        
+        locDbl_base_freq = 50
+    
+    print(date_time_now() + 'Building the pyramid of "' + locStr_path + '"')
+    
+    locStr_raw = None
+    
+    try:
+        
+        locStr_clarke, locStr_park = parse_variant_names(textbox_variants.text)
+        
+        locDict_source = open_recording(locStr_path, 'V', (locDbl_base_freq or 50))
+        
+        def gen_chunks():
+            
+            locInt_start = 0
+            
+            for locTime, a, b, c in stream_recording(locDict_source):
+                
+                locTime, locTheta = make_theta(locInt_start, len(a), locDict_source['fs'],
+                                               locDict_source['base_freq'], locDbl_pll_order)
+                
+                locInt_start += len(a)
+                
+                alpha, beta, d, q, zero = cal_variant_clarke_park(locTheta, a, b, c,
+                                                                  locStr_clarke, locStr_park)
+                
+                yield {'alpha': alpha, 'beta': beta, 'd': d, 'q': q}
+        
+        # a new file per figure, an open figure keeps its file mapped
+        locInt_handle, locStr_raw = tempfile.mkstemp(prefix='gsy_pyramid_', suffix='.raw')
+        
+        os.close(locInt_handle)
+        
+        locDict_pyramid = build_pyramid(gen_chunks(), locDict_source['fs'], 
+                                        locStr_path=locStr_raw)
+        
+    except Exception as locError:
+        
+        if locStr_raw is not None:
+            
+            remove_pyramid_file(None, None, locStr_raw)
+            
+        else:
+            
+            pass
+        
+        locRoot = tk.Tk()
+    
+        locRoot.withdraw()
+        
+        msgbox.showerror('Cannot explore', str(locError))
+        
+        locRoot.destroy()
+        
+        return None
+    
+    print(date_time_now() + 'Pyramid complete, ' + str(locDict_pyramid['samples']) 
+          + ' samples, ' + str(len(locDict_pyramid['levels'])) + ' levels')
+    
+    locFig = plot_pyramid(locDict_pyramid, os.path.basename(locStr_path))
+    
+    # the file is deleted with the figure
+    locFig.canvas.mpl_connect('close_event', 
+                              lambda x: remove_pyramid_file(x, locDict_pyramid, locStr_raw))
+    
+    locFig.show()
+
+# =============================================================================
+# </Function: "Explore" button on_clicked event handler>
+# =============================================================================
+
+    
+# =============================================================================
+# <Function: "Save video" button on_clicked event handler>    
+# =============================================================================
+
+def video_save_on_clicked(event, locObj_animation, 
+               locTextbox_fps, locTextbox_ffmpeg_path, 
+               locList_textbox, locList_button, locIni_file_path):
+    
+    """
+    .. _video_save_on_clicked :
+    
+    This function saves the animation to the harddrive.
+    
+    If the given FFmpeg's path is not valid, a file dialogue would prompted to 
+    allow the user to select the FFmpeg's exectuable binary.
+    
+    A file dialogue would be prompted to allow user to save the video.
+    
+    The animation object's figure would be closed during save. Limited saving
+    progress info would be printed to the console.
+    
+    The video is refused while a replay or a live source is displayed, whose 
+    animation is paced by the wall clock and fed by a background thread. Play
+    returns to the synthetic harmonic, which can be saved.
+    
+    After the video is saved, the script would try to restart if it is run in 
+    "python.exe" (run rom terminal or cmd). If this script is run in IDLE 
+    (run by "pythonw.exe"), then you need to manually restart the script 
+    (otherwise the kernel is very likely to crash).
+    
+    Reference for using "lambda" : https://goo.gl/zDmGPR
+
+    Parameters
+    ----------
+    event : event
+        The event that triggers this function.
+        
+    locObj_animation : matplotlib animation object
+        The animation to be saved.
+        
+    locTextbox_fps : int
+        The frame per second for the anmation. This parameter would be passed
+        to the video writer.
+        
+    locTextbox_ffmpeg_path : str
+        Path of FFmepg executable binary.
+    
+    locList_textbox : list of matplotlib textbox objects
+        These textboxes would be hidden.
+    
+    locList_button : list of matplotlib button objects
+        These buttons would be hidden.
+    
+    locIni_file_path : str
+        The INI file path to be used to save user configurations.
+            
+    Returns
+    -------
+    None.
+
+    Examples
+    --------
+    
+    .. code:: python
+    
+        button_save_video.on_clicked(lambda x: video_save_on_clicked(x, 
+                                                                     ani, 
+                                                                     textbox_fps,
+                                                                     textbox_ffmpeg_path, 
+                                                                     list_textbox, 
+                                                                     list_button, 
+                                                                     str_ini_file_path))
+    """
+    
+    # the replay and the live source are not frames of the recording, refuse
+    if dict_replay is not None:
+        
+        locRoot = tk.Tk()
+    
+        locRoot.withdraw()
+        
+        msgbox.showinfo('Save video', 'The video cannot be saved during Replay or Live.'
+                        + '\n' + 'Press Play to return to the synthetic harmonic first.')
+        
+        locRoot.destroy()
+        
+        return None
+        
+    else:
+        
+        pass
+     
+    # prompt save video message box, yes/no
+    
+    locStr_message = ('Do you want to save the video?' 
+                      + '\n' + 'This will take a while.'
+                      + '\n' + 'Only limited progress info will be printed to the console.'
+                      + '\n' + 'You have to wait.'
                       + '\n' 
                       + '\n' + 'You will get a message when finished.'
                       + '\n' 
@@ -2101,6 +3247,14 @@ button_doct.on_clicked(lambda x: doct_on_clicked(x, CONST_STR_DOCT_FILENAME))
 button_browse.on_clicked(lambda x: load_ffmpeg_on_clicked(x, ani,                                                            
                                                           textbox_ffmpeg_path))
 
+button_replay.on_clicked(video_replay_on_clicked)
+
+button_live.on_clicked(video_live_on_clicked)
+
+button_explore.on_clicked(explore_on_clicked)
+
+button_stft.on_clicked(stft_on_clicked)
+
 # =============================================================================
 # </Button on_clicked event definitions>
 # =============================================================================
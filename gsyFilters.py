@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for filtering the *d*, *q* components.
+
+Under imbalance or harmonics, the *d*, *q* components from gsyDqLib.cal_ABDQ
+and gsyTransforms.cal_park contain ripples, e.g., :math:`2ω` ripple from the
+negative sequence. The filters in this module extract the DC components.
+
+The filter bank is applied chunk by chunk. Like scipy.signal.lfilter, the
+filter state is returned after every chunk and is passed into the next call,
+so chunked filtering gives the same result as filtering the whole signal.
+
+All functions are vectorised over channels. The last axis of an input array is
+always the time (sample) axis, any leading axes are treated as independent
+channels, e.g., np.stack((d, q)).
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_dq_filter_
+* cal_moving_average_
+* make_dq_filter_bank_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from scipy import signal
+
+# =============================================================================
+# <Function: design the dq filter bank>
+# =============================================================================
+
+def make_dq_filter_bank(locDbl_fs, locDbl_base_freq=50, locList_notch_orders=(2,),
+                        locDbl_notch_q=5.0, locDbl_lpf_cutoff=None,
+                        locInt_lpf_order=2, locInt_ma_window=None):
+    """
+    .. _make_dq_filter_bank :
+
+    Design the filter bank for the *d*, *q* components.
+
+    The bank is a chain of (each one is optional):
+        |  notches at the given multiples of the base frequency,
+        |  a Butterworth IIR low-pass filter,
+        |  a moving-average filter.
+
+    The IIR filters are kept as second-order sections.
+
+    Parameters
+    ----------
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locList_notch_orders : list of float
+        Notch frequencies as multiples of the base frequency. E.g., (2,) for
+        the :math:`2ω` ripple of the negative sequence, (2, 6) to also remove
+        the ripple of the 5th and 7th harmonics. Empty for no notches.
+        Notches at or above the Nyquist frequency are skipped.
+
+    locDbl_notch_q : float
+        Quality factor of the notches. Default is 5.
+
+    locDbl_lpf_cutoff : float or None
+        Cut-off frequency (Hz) of the low-pass filter. None for no low-pass
+        filter.
+
+    locInt_lpf_order : int
+        Order of the low-pass filter. Default is 2.
+
+    locInt_ma_window : int or None
+        Moving-average window in samples. None for no moving-average. One base
+        period (locDbl_fs / locDbl_base_freq) removes the ripple at all
+        multiples of the base frequency.
+
+    Returns
+    -------
+    locDict_bank : dict
+        'sos' : array of the second-order sections, (sections, 6).
+        'ma'  : int, the moving-average window (0 for none).
+
+    Examples
+    --------
+    .. code:: python
+
+        bank = make_dq_filter_bank(10e3, 50, (2,), locDbl_lpf_cutoff=20)
+    """
+
+    locList_sos = []
+
+    # notches at multiples of the base frequency
+    for item in locList_notch_orders:
+
+        locDbl_notch_freq = abs(item) * locDbl_base_freq
+
+        if (locDbl_notch_freq <= 0) or (locDbl_notch_freq >= locDbl_fs / 2):
+
+            continue
+
+        else:
+
+            pass
+
+        b, a = signal.iirnotch(locDbl_notch_freq, locDbl_notch_q, fs=locDbl_fs)
+
+        locList_sos.append(signal.tf2sos(b, a))
+
+    # Butterworth low-pass
+    if locDbl_lpf_cutoff is not None:
+
+        locList_sos.append(signal.butter(int(locInt_lpf_order), locDbl_lpf_cutoff,
+                                         btype='low', output='sos', fs=locDbl_fs))
+
+    else:
+
+        pass
+
+    if len(locList_sos) > 0:
+
+        locSos = np.concatenate(locList_sos, axis=0)
+
+    else:
+
+        locSos = np.zeros((0, 6))
+
+    if locInt_ma_window is None:
+
+        locInt_ma_window = 0
+
+    else:
+
+        locInt_ma_window = int(locInt_ma_window)
+
+    locDict_bank = {'sos': locSos, 'ma': locInt_ma_window}
+
+    return locDict_bank
+
+# =============================================================================
+# </Function: design the dq filter bank>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: moving-average filter by cumulative sums>
+# =============================================================================
+
+def cal_moving_average(locX, locInt_window, locTail=None):
+    """
+    .. _cal_moving_average :
+
+    Moving-average filter, O(1) per sample.
+
+    The window sums are the differences of a cumulative sum, so the cost does
+    not depend on the window length. The cumulative sum is rebuilt from the
+    last locInt_window - 1 samples on every call, so rounding errors do not
+    accumulate from chunk to chunk.
+
+    Parameters
+    ----------
+    locX : array
+        Input samples. The last axis is the time axis.
+
+    locInt_window : int
+        Window length in samples.
+
+    locTail : array or None
+        The last locInt_window - 1 input samples of the previous chunk, as
+        returned by the previous call. None fills the window with the first
+        sample, i.e., starts in steady state.
+
+    Returns
+    -------
+    locY : array
+        Filtered samples, same shape as locX.
+
+    locTail : array
+        The tail to be passed into the next call.
+
+    Examples
+    --------
+    .. code:: python
+
+        # 2ω ripple removed by a half period window, 10 kHz, 50 Hz
+        d_dc, tail = cal_moving_average(d, 100)
+    """
+
+    locX = np.asarray(locX, dtype=float)
+
+    locInt_window = int(locInt_window)
+
+    if locInt_window <= 0:
+
+        raise ValueError('The window length must be a positive integer')
+
+    if locTail is None:
+
+        locTail = np.repeat(locX[..., :1], locInt_window - 1, axis=-1)
+
+    else:
+
+        pass
+
+    locExtended = np.concatenate((locTail, locX), axis=-1)
+
+    # cumulative sum with a leading zero
+    locSum = np.cumsum(locExtended, axis=-1)
+
+    locSum = np.concatenate((np.zeros(locX.shape[:-1] + (1,)), locSum), axis=-1)
+
+    locY = (locSum[..., locInt_window:] - locSum[..., :-locInt_window]) / locInt_window
+
+    locTail = locExtended[..., locExtended.shape[-1] - (locInt_window - 1):].copy()
+
+    return locY, locTail
+
+# =============================================================================
+# </Function: moving-average filter by cumulative sums>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: apply the dq filter bank>
+# =============================================================================
+
+def cal_dq_filter(locX, locDict_bank, locState=None):
+    """
+    .. _cal_dq_filter :
+
+    Apply the filter bank from make_dq_filter_bank_ to a chunk of samples.
+
+    Parameters
+    ----------
+    locX : array
+        Input samples, e.g., np.stack((d, q)). The last axis is the time
+        axis. Any leading axes are independent channels.
+
+    locDict_bank : dict
+        The filter bank from make_dq_filter_bank_.
+
+    locState : dict or None
+        The state returned by the previous call. None starts the filters in
+        steady state at the first sample, so a DC input gives no start-up
+        transient.
+
+    Returns
+    -------
+    locY : array
+        Filtered samples, same shape as locX.
+
+    locState : dict
+        The state to be passed into the next call for the next chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        bank = make_dq_filter_bank(10e3, 50, (2,), locDbl_lpf_cutoff=20)
+
+        state = None
+
+        for chunk in chunks:
+
+            dq_dc, state = cal_dq_filter(chunk, bank, state)
+    """
+
+    locX = np.asarray(locX, dtype=float)
+
+    locSos = locDict_bank['sos']
+
+    locInt_ma_window = locDict_bank['ma']
+
+    if locState is None:
+
+        # steady state at the first sample, zi is (sections, channels..., 2)
+        locZi = (signal.sosfilt_zi(locSos).reshape((len(locSos),)
+                                                   + (1,) * (locX.ndim - 1) + (2,))
+                 * locX[np.newaxis, ..., 0, np.newaxis])
+
+        locState = {'zi': locZi, 'tail': None}
+
+    else:
+
+        pass
+
+    # IIR sections
+    if len(locSos) > 0:
+
+        locY, locZi = signal.sosfilt(locSos, locX, axis=-1, zi=locState['zi'])
+
+    else:
+
+        locY, locZi = locX, locState['zi']
+
+    # moving-average
+    if locInt_ma_window > 0:
+
+        locY, locTail = cal_moving_average(locY, locInt_ma_window, locState['tail'])
+
+    else:
+
+        locTail = None
+
+    locState = {'zi': locZi, 'tail': locTail}
+
+    return locY, locState
+
+# =============================================================================
+# </Function: apply the dq filter bank>
+# =============================================================================
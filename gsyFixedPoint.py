@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the fixed-point simulation of the Clarke and Park Transforms.
+
+The controllers run the transforms on fixed-point DSPs. This module simulates
+the transforms with NumPy integer arithmetic, so that the results are the same
+integers as the DSP would produce, and compares them against the float64
+transforms of gsyTransforms.
+
+The numbers are signed Q formats, e.g., Q15 (16-bit word, 15 fractional bits)
+and Q31 (32-bit word, 31 fractional bits). The products are accumulated
+without rounding in int64 (same as the 64-bit accumulator of a DSP), then
+shifted back to the Q format with the chosen rounding and limited to the word
+length by saturation or by wrap-around.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_clarke_fixed_
+* cal_fixed_error_
+* cal_limit_
+* cal_park_fixed_
+* cal_quantise_
+* cal_shift_round_
+* make_q_format_
+* to_float_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from numpy import sqrt
+
+from gsyTransforms import cal_clarke, cal_park, cal_trig
+
+# =============================================================================
+# <Function: make the Q format>
+# =============================================================================
+
+def make_q_format(locInt_word=16, locInt_frac=None, locStr_rounding='nearest',
+                  locBool_saturate=True):
+    """
+    .. _make_q_format :
+
+    Make the description of a signed fixed-point (Q) format.
+
+    Parameters
+    ----------
+    locInt_word : int
+        Word length in bits, including the sign bit, 2 to 32. E.g., 16 for
+        Q15 and 32 for Q31.
+
+    locInt_frac : int or None
+        Number of fractional bits. None gives locInt_word - 1, i.e., the
+        range [-1, 1).
+
+    locStr_rounding : str
+        Rounding of the quantisation and of the products:
+            |  'nearest' : to the nearest, halves upwards (add half LSB, shift)
+            |  'floor' : towards minus infinity (arithmetic shift)
+            |  'even' : to the nearest, halves to even (convergent)
+
+    locBool_saturate : bool
+        True saturates the overflows to the largest or the smallest number,
+        False wraps them around like the plain integer arithmetic.
+
+    Returns
+    -------
+    locDict_format : dict
+        'word', 'frac', 'rounding', 'saturate', and 'min', 'max', the
+        smallest and the largest integers of the word.
+
+    Examples
+    --------
+    >>> make_q_format(16)
+    {'word': 16, 'frac': 15, 'rounding': 'nearest', 'saturate': True,
+     'min': -32768, 'max': 32767}
+    """
+
+    locInt_word = int(locInt_word)
+
+    # products of two words plus the sums must fit into int64
+    if (locInt_word < 2) or (locInt_word > 32):
+
+        raise ValueError('The word length must be 2 to 32 bits')
+
+    else:
+
+        pass
+
+    if locInt_frac is None:
+
+        locInt_frac = locInt_word - 1
+
+    else:
+
+        locInt_frac = int(locInt_frac)
+
+    if (locInt_frac < 1) or (locInt_frac > locInt_word - 1):
+
+        raise ValueError('The number of fractional bits must be 1 to word length - 1')
+
+    else:
+
+        pass
+
+    if locStr_rounding not in ('nearest', 'floor', 'even'):
+
+        raise ValueError("The rounding must be 'nearest', 'floor' or 'even'")
+
+    else:
+
+        pass
+
+    locDict_format = {'word': locInt_word,
+                      'frac': locInt_frac,
+                      'rounding': locStr_rounding,
+                      'saturate': bool(locBool_saturate),
+                      'min': -(1 << (locInt_word - 1)),
+                      'max': (1 << (locInt_word - 1)) - 1}
+
+    return locDict_format
+
+# =============================================================================
+# </Function: make the Q format>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: limit to the word length>
+# =============================================================================
+
+def cal_limit(locX, locDict_format):
+    """
+    .. _cal_limit :
+
+    Limit int64 numbers to the word length of the Q format, by saturation or
+    by wrap-around (see make_q_format_).
+
+    Parameters
+    ----------
+    locX : array
+        int64 numbers.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    Returns
+    -------
+    locX : array
+        int64 numbers within the word length.
+    """
+
+    if locDict_format['saturate'] == True:
+
+        locX = np.clip(locX, locDict_format['min'], locDict_format['max'])
+
+    else:
+
+        # two's complement wrap-around
+        locInt_offset = -locDict_format['min']
+
+        locX = ((locX + locInt_offset) & ((locInt_offset << 1) - 1)) - locInt_offset
+
+    return locX
+
+# =============================================================================
+# </Function: limit to the word length>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: quantise floats>
+# =============================================================================
+
+def cal_quantise(locX, locDict_format):
+    """
+    .. _cal_quantise :
+
+    Quantise floats into the integers of the Q format.
+
+    Parameters
+    ----------
+    locX : array
+        Floats, e.g., per unit phase voltages.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    Returns
+    -------
+    locX : array
+        int64 numbers, :math:`x · 2^{frac}` rounded and limited.
+
+    Examples
+    --------
+    >>> cal_quantise([0.5, -1, 1], make_q_format(16))
+    array([ 16384, -32768,  32767])
+    """
+
+    locX = np.ldexp(np.asarray(locX, dtype=float), locDict_format['frac'])
+
+    if locDict_format['rounding'] == 'nearest':
+
+        locX = np.floor(locX + 0.5)
+
+    elif locDict_format['rounding'] == 'floor':
+
+        locX = np.floor(locX)
+
+    else:
+
+        locX = np.rint(locX)
+
+    # clipped to twice the word first, so the cast cannot overflow
+    locX = np.clip(locX, 2 * locDict_format['min'], 2 * locDict_format['max'] + 1)
+
+    locX = cal_limit(locX.astype(np.int64), locDict_format)
+
+    return locX
+
+# =============================================================================
+# </Function: quantise floats>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: convert back to floats>
+# =============================================================================
+
+def to_float(locX, locDict_format):
+    """
+    .. _to_float :
+
+    Convert the integers of the Q format back to floats, :math:`x · 2^{-frac}`.
+
+    Parameters
+    ----------
+    locX : array
+        Integers of the Q format.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    Returns
+    -------
+    locX : array
+        Floats.
+    """
+
+    return np.ldexp(np.asarray(locX, dtype=float), -locDict_format['frac'])
+
+# =============================================================================
+# </Function: convert back to floats>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: shift the accumulator back to the Q format>
+# =============================================================================
+
+def cal_shift_round(locX, locInt_shift, locDict_format):
+    """
+    .. _cal_shift_round :
+
+    Shift the int64 accumulator right by locInt_shift bits with the rounding
+    of the Q format, then limit the result to the word length.
+
+    Parameters
+    ----------
+    locX : array
+        int64 accumulator, e.g., a sum of products of two Q numbers.
+
+    locInt_shift : int
+        Number of bits to shift, normally the number of fractional bits.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    Returns
+    -------
+    locX : array
+        int64 numbers of the Q format.
+    """
+
+    locX = np.asarray(locX, dtype=np.int64)
+
+    locInt_half = 1 << (locInt_shift - 1)
+
+    if locDict_format['rounding'] == 'nearest':
+
+        locY = (locX + locInt_half) >> locInt_shift
+
+    elif locDict_format['rounding'] == 'floor':
+
+        locY = locX >> locInt_shift
+
+    else:
+
+        locY = locX >> locInt_shift
+
+        # remainder of the floor shift, 0 to 2 * half - 1
+        locRemainder = locX - (locY << locInt_shift)
+
+        locY = locY + ((locRemainder > locInt_half)
+                       | ((locRemainder == locInt_half) & ((locY & 1) == 1)))
+
+    locY = cal_limit(locY, locDict_format)
+
+    return locY
+
+# =============================================================================
+# </Function: shift the accumulator back to the Q format>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: fixed-point Clarke Transform>
+# =============================================================================
+
+def cal_clarke_fixed(a, b, c, locDict_format):
+    """
+    .. _cal_clarke_fixed :
+
+    Fixed-point amplitude invariant Clarke Transform, the integer version of
+    gsyTransforms.cal_clarke.
+
+    The coefficients 2/3, 1/3 and :math:`1/\\sqrt{3}` are quantised into the
+    same Q format. Every output is one multiply-accumulate sequence
+    in int64, followed by one rounding shift and the limit:
+
+    .. math::
+        α = 2/3 · a - 1/3 · b - 1/3 · c
+
+    .. math::
+        β = 1/\\sqrt{3} · b - 1/\\sqrt{3} · c
+
+    .. math::
+        0 = 1/3 · a + 1/3 · b + 1/3 · c
+
+    Parameters
+    ----------
+    a, b, c : array
+        Integers of the Q format, e.g., from cal_quantise_.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    Returns
+    -------
+    alpha, beta, zero : array
+        int64 numbers of the Q format.
+
+    Examples
+    --------
+    .. code:: python
+
+        q15 = make_q_format(16)
+
+        alpha, beta, zero = cal_clarke_fixed(cal_quantise(a, q15),
+                                             cal_quantise(b, q15),
+                                             cal_quantise(c, q15), q15)
+    """
+
+    a = np.asarray(a, dtype=np.int64)
+
+    b = np.asarray(b, dtype=np.int64)
+
+    c = np.asarray(c, dtype=np.int64)
+
+    locInt_frac = locDict_format['frac']
+
+    locInt_k23, locInt_k13, locInt_ks = cal_quantise((2/3, 1/3, 1/sqrt(3)),
+                                                     locDict_format).tolist()
+
+    alpha = cal_shift_round(locInt_k23 * a - locInt_k13 * b - locInt_k13 * c,
+                            locInt_frac, locDict_format)
+
+    beta = cal_shift_round(locInt_ks * b - locInt_ks * c, locInt_frac, locDict_format)
+
+    zero = cal_shift_round(locInt_k13 * a + locInt_k13 * b + locInt_k13 * c,
+                           locInt_frac, locDict_format)
+
+    return alpha, beta, zero
+
+# =============================================================================
+# </Function: fixed-point Clarke Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: fixed-point Park Transform>
+# =============================================================================
+
+def cal_park_fixed(theta, alpha, beta, zero, locDict_format, trig=None):
+    """
+    .. _cal_park_fixed :
+
+    Fixed-point Park Transform, the integer version of gsyTransforms.cal_park.
+
+    cos and sin of theta are quantised into the Q format (so cos(0) = 1
+    saturates to the largest number, same as on the DSP), then:
+
+    .. math::
+        d = cosθ · α + sinθ · β
+
+    .. math::
+        q = cosθ · β - sinθ · α
+
+    are accumulated in int64 and shifted back with one rounding each.
+
+    Parameters
+    ----------
+    theta : array
+        1d array of the PLL angle (rad, float).
+
+    alpha, beta, zero : array
+        Integers of the Q format, e.g., from cal_clarke_fixed_.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    trig : tuple or None
+        Optional float (cos(theta), sin(theta)), e.g., from
+        gsyTransforms.cal_trig. None calculates them.
+
+    Returns
+    -------
+    d, q, zero : array
+        int64 numbers of the Q format. zero is passed through.
+    """
+
+    if trig is None:
+
+        trig = cal_trig(theta)
+
+    else:
+
+        pass
+
+    locCos = cal_quantise(trig[0], locDict_format)
+
+    locSin = cal_quantise(trig[1], locDict_format)
+
+    alpha = np.asarray(alpha, dtype=np.int64)
+
+    beta = np.asarray(beta, dtype=np.int64)
+
+    locInt_frac = locDict_format['frac']
+
+    d = cal_shift_round(locCos * alpha + locSin * beta, locInt_frac, locDict_format)
+
+    q = cal_shift_round(locCos * beta - locSin * alpha, locInt_frac, locDict_format)
+
+    return d, q, zero
+
+# =============================================================================
+# </Function: fixed-point Park Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: errors of the fixed-point transforms>
+# =============================================================================
+
+def cal_fixed_error(a, b, c, theta, locDict_format, locInt_block=1 << 20):
+    """
+    .. _cal_fixed_error :
+
+    Errors of the fixed-point Clarke and Park Transforms against the float64
+    transforms of gsyTransforms, over a whole sweep.
+
+    The float a, b, c are quantised, transformed by cal_clarke_fixed_ and
+    cal_park_fixed_, converted back and compared with cal_clarke and
+    cal_park of the unquantised a, b, c. So the errors include the
+    quantisation of the inputs, the coefficients and the trig values.
+
+    The samples are processed in blocks of locInt_block samples, so long
+    sweeps (e.g., np.memmap) do not need to fit into memory.
+
+    Parameters
+    ----------
+    a, b, c : array
+        1d float arrays of the phase values, e.g., per unit.
+
+    theta : array
+        1d float array of the PLL angle, same length as a, b, c.
+
+    locDict_format : dict
+        The Q format from make_q_format_.
+
+    locInt_block : int
+        Number of samples per block. Default is 2^20.
+
+    Returns
+    -------
+    locDict_stats : dict
+        'samples' : int, number of samples.
+        'lsb' : float, value of one LSB.
+        'alpha', 'beta', 'zero', 'd', 'q' : dict each, with
+            |  'max' : maximum absolute error
+            |  'rms' : RMS error
+            |  'mean' : mean error (bias)
+            |  'saturated' : number of outputs at the limits of the word
+
+    Examples
+    --------
+    .. code:: python
+
+        time = np.arange(10**7) / 10e3
+
+        theta = 2 * np.pi * 50 * time
+
+        a, b, c = [0.9 * np.cos(theta - k * 2 * np.pi / 3) for k in range(3)]
+
+        stats = cal_fixed_error(a, b, c, theta, make_q_format(16))
+
+        print(stats['d']['max'] / stats['lsb'])
+    """
+
+    locInt_length = len(theta)
+
+    if all( len(x) == locInt_length for x in (a, b, c) ):
+
+        pass
+
+    else:
+
+        raise ValueError('Element length mismatch.'
+                         + 'The length of a, b, c and theta must be all the same')
+
+    locList_names = ['alpha', 'beta', 'zero', 'd', 'q']
+
+    # max, sum, sum of squares, saturated
+    locSums = np.zeros((len(locList_names), 4))
+
+    locInt_block = int(max(1, locInt_block))
+
+    # for-loop start
+    for locInt_start in range(0, locInt_length, locInt_block):
+
+        locInt_stop = min(locInt_start + locInt_block, locInt_length)
+
+        locA = np.asarray(a[locInt_start:locInt_stop], dtype=float)
+
+        locB = np.asarray(b[locInt_start:locInt_stop], dtype=float)
+
+        locC = np.asarray(c[locInt_start:locInt_stop], dtype=float)
+
+        locTheta = np.asarray(theta[locInt_start:locInt_stop], dtype=float)
+
+        locTrig = cal_trig(locTheta)
+
+        # float64 reference
+        alpha, beta, zero = cal_clarke(locA, locB, locC)
+
+        d, q, zero = cal_park(locTheta, alpha, beta, zero, trig=locTrig)
+
+        locList_ref = [alpha, beta, zero, d, q]
+
+        # fixed-point
+        alpha, beta, zero = cal_clarke_fixed(cal_quantise(locA, locDict_format),
+                                             cal_quantise(locB, locDict_format),
+                                             cal_quantise(locC, locDict_format),
+                                             locDict_format)
+
+        d, q, zero = cal_park_fixed(locTheta, alpha, beta, zero, locDict_format,
+                                    trig=locTrig)
+
+        locList_fixed = [alpha, beta, zero, d, q]
+
+        for k in range(len(locList_names)):
+
+            locError = to_float(locList_fixed[k], locDict_format) - locList_ref[k]
+
+            locSums[k, 0] = max(locSums[k, 0], np.max(np.abs(locError)))
+
+            locSums[k, 1] += np.sum(locError)
+
+            locSums[k, 2] += np.dot(locError, locError)
+
+            locSums[k, 3] += np.count_nonzero((locList_fixed[k] == locDict_format['min'])
+                                              | (locList_fixed[k] == locDict_format['max']))
+    # for-loop end
+
+    locDict_stats = {'samples': locInt_length,
+                     'lsb': np.ldexp(1.0, -locDict_format['frac'])}
+
+    for k, item in enumerate(locList_names):
+
+        locDict_stats[item] = {'max': locSums[k, 0],
+                               'rms': sqrt(locSums[k, 2] / max(locInt_length, 1)),
+                               'mean': locSums[k, 1] / max(locInt_length, 1),
+                               'saturated': int(locSums[k, 3])}
+
+    return locDict_stats
+
+# =============================================================================
+# </Function: errors of the fixed-point transforms>
+# =============================================================================
@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the event index of long recordings.
+
+The outputs of the Clarke and Park Transforms of a long recording are cut
+into blocks of a fixed number of samples. The index keeps the minimum,
+maximum and mean of every output field per block, built in one streaming
+pass (build_event_index_), e.g., a one hour recording at 10 kHz has about
+9000 blocks of 4096 samples.
+
+Queries (query_event_index_) only look at the block summaries:
+    |  band : blocks with samples outside [low, high], e.g., *d* outside ±5%
+    |         of the nominal value, from the block minimum and maximum
+    |  ripple : blocks whose (max - min) / 2 is above a limit, e.g., the
+    |           ripple of *q*
+    |  time range : blocks overlapping [start, stop]
+
+The result is exact at the block level (a block is found if and only if one
+of its samples meets the band or the time range), so only the samples of
+the blocks found need to be read again, e.g., by
+gsyComtrade.get_comtrade_channels.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* build_event_index_
+* cal_block_summary_
+* index_recording_
+* load_event_index_
+* query_event_index_
+* save_event_index_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from gsyStream import open_recording, stream_recording, make_theta
+from gsyVariants import CONST_STR_VARIANT_CLARKE, CONST_STR_VARIANT_PARK, cal_variant_clarke_park
+
+# samples per block of the index
+CONST_INT_INDEX_BLOCK = 4096
+
+# output fields of index_recording
+CONST_LIST_INDEX_FIELDS = ['alpha', 'beta', 'd', 'q', 'zero']
+
+# =============================================================================
+# <Function: summary of blocks>
+# =============================================================================
+
+def cal_block_summary(locBlocks):
+    """
+    .. _cal_block_summary :
+
+    Minimum, maximum and mean of blocks. NaN samples (e.g., missing samples)
+    are left out, a block of NaN only gives NaN.
+
+    Parameters
+    ----------
+    locBlocks : array
+        (fields, blocks, samples per block).
+
+    Returns
+    -------
+    locMin, locMax, locMean : array
+        (fields, blocks).
+    """
+
+    locMin = np.fmin.reduce(locBlocks, axis=-1)
+
+    locMax = np.fmax.reduce(locBlocks, axis=-1)
+
+    locFinite = np.isfinite(locBlocks)
+
+    locCount = np.count_nonzero(locFinite, axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        locMean = np.sum(np.where(locFinite, locBlocks, 0), axis=-1) / locCount
+
+    return locMin, locMax, locMean
+
+# =============================================================================
+# </Function: summary of blocks>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: build an event index>
+# =============================================================================
+
+def build_event_index(locIter_chunks, locDbl_fs, locInt_block=CONST_INT_INDEX_BLOCK):
+    """
+    .. _build_event_index :
+
+    Build the event index of a stream in one pass. The incomplete block of a
+    chunk is carried into the next chunk, so the index does not depend on
+    the chunk size.
+
+    Parameters
+    ----------
+    locIter_chunks : iterable
+        Yields dicts of 1d arrays of the same length, one array per field,
+        e.g., {'d': d, 'q': q}. All chunks have the same fields.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locInt_block : int
+        Samples per block.
+
+    Returns
+    -------
+    locDict_index : dict
+        'fields' (list of str), 'fs', 'block', 'samples' (total number of
+        samples), and 'min', 'max', 'mean', arrays of (fields, blocks). The
+        last block may be incomplete.
+
+    Examples
+    --------
+    .. code:: python
+
+        chunks = ({'d': d, 'q': q}
+                  for time, theta, alpha, beta, d, q, zero
+                  in stream_clarke_park(stream, 10e3))
+
+        index = build_event_index(chunks, 10e3)
+    """
+
+    locInt_block = int(locInt_block)
+
+    if locInt_block <= 0:
+
+        raise ValueError('The block size must be a positive integer')
+
+    else:
+
+        pass
+
+    locList_fields = None
+
+    locCarry = None
+
+    locList_summaries = []
+
+    locInt_samples = 0
+
+    for locDict_chunk in locIter_chunks:
+
+        if locList_fields is None:
+
+            locList_fields = list(locDict_chunk.keys())
+
+            locCarry = np.zeros((len(locList_fields), 0))
+
+        else:
+
+            pass
+
+        locX = np.concatenate((locCarry,
+                               np.stack([np.asarray(locDict_chunk[x], dtype=float)
+                                         for x in locList_fields])), axis=-1)
+
+        locInt_samples += locX.shape[-1] - locCarry.shape[-1]
+
+        locInt_full = locX.shape[-1] // locInt_block
+
+        if locInt_full > 0:
+
+            locList_summaries.append(cal_block_summary(
+                locX[:, :locInt_full * locInt_block].reshape(len(locList_fields),
+                                                             locInt_full, locInt_block)))
+
+        else:
+
+            pass
+
+        locCarry = locX[:, locInt_full * locInt_block:].copy()
+
+    if locList_fields is None:
+
+        raise ValueError('The stream is empty')
+
+    else:
+
+        pass
+
+    # the incomplete last block
+    if locCarry.shape[-1] > 0:
+
+        locList_summaries.append(cal_block_summary(locCarry[:, np.newaxis, :]))
+
+    else:
+
+        pass
+
+    locDict_index = {'fields': locList_fields,
+                     'fs': float(locDbl_fs),
+                     'block': locInt_block,
+                     'samples': locInt_samples}
+
+    for k, item in enumerate(('min', 'max', 'mean')):
+
+        locDict_index[item] = np.concatenate([x[k] for x in locList_summaries]
+                                             + [np.zeros((len(locList_fields), 0))], axis=-1)
+
+    return locDict_index
+
+# =============================================================================
+# </Function: build an event index>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: index a recording>
+# =============================================================================
+
+def index_recording(locStr_path, locDbl_pll_order=1, locInt_block=CONST_INT_INDEX_BLOCK,
+                    locInt_chunk=65536, locStr_unit='V', locDbl_base_freq=50,
+                    locStr_clarke=CONST_STR_VARIANT_CLARKE, locStr_park=CONST_STR_VARIANT_PARK):
+    """
+    .. _index_recording :
+
+    Build the event index of the Clarke and Park Transform outputs
+    (CONST_LIST_INDEX_FIELDS) of a recording, see gsyStream.open_recording.
+
+    Parameters
+    ----------
+    locStr_path : str
+        Path of the .cfg or .csv file.
+
+    locDbl_pll_order : float
+        The PLL order of the Park Transform.
+
+    locInt_block : int
+        Samples per block.
+
+    locInt_chunk : int
+        Samples per chunk read from the recording.
+
+    locStr_unit : str
+        Unit of the COMTRADE channels, 'V' or 'A'.
+
+    locDbl_base_freq : float
+        The base frequency of CSV files.
+
+    locStr_clarke, locStr_park : str
+        The names of the Clarke and the Park variants, see gsyVariants.
+
+    Returns
+    -------
+    locDict_index : dict
+        The index, see build_event_index_.
+
+    Examples
+    --------
+    .. code:: python
+
+        index = index_recording('fault.cfg')
+
+        # d outside ±5% of the mean of the first block
+        nominal = index['mean'][index['fields'].index('d'), 0]
+
+        blocks, events = query_event_index(index, 'd', 0.95 * nominal, 1.05 * nominal)
+    """
+
+    locDict_source = open_recording(locStr_path, locStr_unit, locDbl_base_freq)
+
+    def gen_chunks():
+
+        locInt_start = 0
+
+        for locTime, a, b, c in stream_recording(locDict_source, locInt_chunk):
+
+            locTime, locTheta = make_theta(locInt_start, len(a), locDict_source['fs'],
+                                           locDict_source['base_freq'], locDbl_pll_order)
+
+            locInt_start += len(a)
+
+            yield dict(zip(CONST_LIST_INDEX_FIELDS,
+                           cal_variant_clarke_park(locTheta, a, b, c, locStr_clarke, locStr_park)))
+
+    return build_event_index(gen_chunks(), locDict_source['fs'], locInt_block)
+
+# =============================================================================
+# </Function: index a recording>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: query an event index>
+# =============================================================================
+
+def query_event_index(locDict_index, locStr_field, locDbl_low=None, locDbl_high=None,
+                      locDbl_ripple=None, locDbl_start=None, locDbl_stop=None):
+    """
+    .. _query_event_index :
+
+    Find the blocks of an event index which meet all the given conditions,
+    from the block summaries only.
+
+    Parameters
+    ----------
+    locDict_index : dict
+        The index from build_event_index_.
+
+    locStr_field : str
+        The field, e.g., 'd'.
+
+    locDbl_low, locDbl_high : float or None
+        Band, the blocks with any sample below locDbl_low or above
+        locDbl_high. None is no limit, both None is no band condition.
+
+    locDbl_ripple : float or None
+        The blocks whose (max - min) / 2 is above this value.
+
+    locDbl_start, locDbl_stop : float or None
+        Time range (s, from the first sample), the blocks overlapping
+        [start, stop]. None is the start or the end of the stream.
+
+    Returns
+    -------
+    locBlocks : array
+        Indices of the blocks found.
+
+    locEvents : array
+        (events, 2), the first and the stop sample of every run of
+        consecutive blocks found. Divide by 'fs' for the time.
+
+    Examples
+    --------
+    .. code:: python
+
+        # q ripple above 0.02 in the first 10 minutes
+        blocks, events = query_event_index(index, 'q', locDbl_ripple=0.02,
+                                           locDbl_stop=600)
+    """
+
+    if locStr_field not in locDict_index['fields']:
+
+        raise ValueError('Unknown field : ' + str(locStr_field))
+
+    else:
+
+        pass
+
+    locInt_field = locDict_index['fields'].index(locStr_field)
+
+    locMin = locDict_index['min'][locInt_field]
+
+    locMax = locDict_index['max'][locInt_field]
+
+    locInt_block = locDict_index['block']
+
+    locInt_samples = locDict_index['samples']
+
+    # first and stop sample of every block
+    locFirst = np.arange(len(locMin)) * locInt_block
+
+    locStop = np.minimum(locFirst + locInt_block, locInt_samples)
+
+    locMask = np.ones(len(locMin), dtype=bool)
+
+    if (locDbl_low is not None) or (locDbl_high is not None):
+
+        locBand = np.zeros(len(locMin), dtype=bool)
+
+        if locDbl_low is not None:
+
+            locBand |= locMin < locDbl_low
+
+        else:
+
+            pass
+
+        if locDbl_high is not None:
+
+            locBand |= locMax > locDbl_high
+
+        else:
+
+            pass
+
+        locMask &= locBand
+
+    else:
+
+        pass
+
+    if locDbl_ripple is not None:
+
+        locMask &= (locMax - locMin) / 2 > locDbl_ripple
+
+    else:
+
+        pass
+
+    if locDbl_start is not None:
+
+        # the last sample of the block is at or after the start
+        locMask &= (locStop - 1) / locDict_index['fs'] >= locDbl_start
+
+    else:
+
+        pass
+
+    if locDbl_stop is not None:
+
+        locMask &= locFirst / locDict_index['fs'] <= locDbl_stop
+
+    else:
+
+        pass
+
+    locBlocks = np.flatnonzero(locMask)
+
+    # runs of consecutive blocks
+    locEdges = np.diff(np.concatenate(([0], locMask.astype(np.int8), [0])))
+
+    locRun_first = np.flatnonzero(locEdges == 1)
+
+    locRun_stop = np.flatnonzero(locEdges == -1) - 1
+
+    locEvents = np.stack((locFirst[locRun_first], locStop[locRun_stop]), axis=-1).reshape(-1, 2)
+
+    return locBlocks, locEvents
+
+# =============================================================================
+# </Function: query an event index>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: save an event index>
+# =============================================================================
+
+def save_event_index(locDict_index, locStr_path):
+    """
+    .. _save_event_index :
+
+    Save an event index into a .npz file.
+
+    Parameters
+    ----------
+    locDict_index : dict
+        The index from build_event_index_.
+
+    locStr_path : str
+        Path of the .npz file.
+    """
+
+    np.savez(locStr_path,
+             fields=np.array(locDict_index['fields']),
+             fs=locDict_index['fs'],
+             block=locDict_index['block'],
+             samples=locDict_index['samples'],
+             min=locDict_index['min'],
+             max=locDict_index['max'],
+             mean=locDict_index['mean'])
+
+# =============================================================================
+# </Function: save an event index>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: load an event index>
+# =============================================================================
+
+def load_event_index(locStr_path):
+    """
+    .. _load_event_index :
+
+    Load an event index saved by save_event_index_.
+
+    Parameters
+    ----------
+    locStr_path : str
+        Path of the .npz file.
+
+    Returns
+    -------
+    locDict_index : dict
+        The index, see build_event_index_.
+    """
+
+    with np.load(locStr_path) as f:
+
+        locDict_index = {'fields': [str(x) for x in f['fields']],
+                         'fs': float(f['fs']),
+                         'block': int(f['block']),
+                         'samples': int(f['samples']),
+                         'min': f['min'],
+                         'max': f['max'],
+                         'mean': f['mean']}
+
+    return locDict_index
+
+# =============================================================================
+# </Function: load an event index>
+# =============================================================================
@@ -0,0 +1,929 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for live three-phase sources on the local machine.
+
+A live source sends frames of samples to a local address:
+    |  'udp://127.0.0.1:50000' : UDP datagrams, one frame per datagram
+    |  'unix:///tmp/gsy.sock' : Unix domain datagram socket (not on Windows)
+    |  'pipe:///tmp/gsy.fifo' : named pipe (FIFO), a stream of frames
+
+A frame is an array of float64 in the native byte order:
+    |  fs, index of the first sample, n, a[0], b[0], c[0], ..., a[n-1], b[n-1], c[n-1]
+
+The receiver thread (run_live_receiver_) writes the samples into a ring
+buffer. The ring buffer has one writer (the receiver thread) and one reader
+(the display, read_live_), the writer only advances the write count after the
+samples are written and the reader only advances the read count after the
+samples are copied, so no lock is needed. Nothing is overwritten:
+    |  'dropped' : samples which did not fit into a full ring buffer
+    |  'lost' : samples missing between frames (by the sample index), which
+    |           are filled with NaN so the PLL angle stays continuous
+    |  'bad_frames' : frames or datagrams whose header or length is broken
+    |                 (check_live_header_), which are discarded
+    |  'skipped' : samples skipped by the reader to bound the latency
+    |  'underruns' : reads with no new samples
+
+The samples read are run through the Clarke and Park Transforms of the
+named variants (gsyVariants.cal_variant_clarke_park) with a continuous PLL
+angle (gsyStream.make_theta), same as gsyReplay.
+
+run_live_simulator_ sends a scenario of gsyScenario in real time, as a stand-in
+of a test rig. Run this module as a script for the simulator, e.g.:
+
+.. code:: bash
+
+    python gsyLive.py udp://127.0.0.1:50000 --loop
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* check_live_header_
+* pack_live_frame_
+* parse_live_address_
+* read_live_
+* run_live_receiver_
+* run_live_simulator_
+* start_live_
+* stop_live_
+* write_live_ring_
+
+Function definitions
+----------------------
+
+"""
+
+import os
+import time
+import select
+import socket
+import argparse
+import threading
+
+import numpy as np
+
+from gsyDqLib import date_time_now
+from gsyReplay import CONST_LIST_REPLAY_FIELDS
+from gsyScenario import make_scenario, stream_scenario
+from gsyStream import make_theta
+from gsyVariants import (CONST_STR_VARIANT_CLARKE, CONST_STR_VARIANT_PARK,
+                         cal_variant_clarke_park, get_variant)
+
+# float64 values in the header of a frame, fs, index, n
+CONST_INT_LIVE_HEADER = 3
+
+# samples per frame of the simulator, a frame fits into one UDP datagram
+CONST_INT_LIVE_FRAME = 1024
+
+# samples of the ring buffer
+CONST_INT_LIVE_CAPACITY = 1 << 16
+
+# the most samples of a frame, a larger n in the header is broken
+CONST_INT_LIVE_MAX_SAMPLES = 1 << 16
+
+# =============================================================================
+# <Function: parse a live address>
+# =============================================================================
+
+def parse_live_address(locStr_address):
+    """
+    .. _parse_live_address :
+
+    Parse a live address, see the module description.
+
+    Parameters
+    ----------
+    locStr_address : str
+        The address, e.g., 'udp://127.0.0.1:50000'.
+
+    Returns
+    -------
+    locStr_kind : str
+        'udp', 'unix' or 'pipe'.
+
+    locTarget : tuple or str
+        (host, port) for 'udp', the path for 'unix' and 'pipe'.
+
+    Examples
+    --------
+    >>> parse_live_address('udp://127.0.0.1:50000')
+    ('udp', ('127.0.0.1', 50000))
+    """
+
+    locStr_kind, locStr_sep, locStr_target = locStr_address.strip().partition('://')
+
+    if (locStr_sep == '') or (locStr_target == ''):
+
+        raise ValueError('The live address must be udp://host:port, unix://path '
+                         + 'or pipe://path : ' + locStr_address)
+
+    else:
+
+        pass
+
+    if locStr_kind == 'udp':
+
+        locStr_host, locStr_sep, locStr_port = locStr_target.rpartition(':')
+
+        if locStr_sep == '':
+
+            raise ValueError('The UDP address needs a port : ' + locStr_address)
+
+        else:
+
+            pass
+
+        return locStr_kind, (locStr_host or '127.0.0.1', int(locStr_port))
+
+    elif locStr_kind in ('unix', 'pipe'):
+
+        return locStr_kind, locStr_target
+
+    else:
+
+        raise ValueError('Unknown live address : ' + locStr_address)
+
+# =============================================================================
+# </Function: parse a live address>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: pack a frame>
+# =============================================================================
+
+def pack_live_frame(locDbl_fs, locInt_start, a, b, c):
+    """
+    .. _pack_live_frame :
+
+    Pack samples into one frame, see the module description.
+
+    Parameters
+    ----------
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locInt_start : int
+        Index of the first sample in the stream.
+
+    a, b, c : array
+        1d arrays of the samples.
+
+    Returns
+    -------
+    bytes
+        The frame.
+    """
+
+    locInt_samples = len(a)
+
+    locFrame = np.empty(CONST_INT_LIVE_HEADER + 3 * locInt_samples)
+
+    locFrame[:CONST_INT_LIVE_HEADER] = (locDbl_fs, locInt_start, locInt_samples)
+
+    # interleaved a, b, c
+    locFrame[CONST_INT_LIVE_HEADER:].reshape(locInt_samples, 3)[:] = np.stack((a, b, c), axis=-1)
+
+    return locFrame.tobytes()
+
+# =============================================================================
+# </Function: pack a frame>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: check the header of a frame>
+# =============================================================================
+
+def check_live_header(locHeader, locDbl_fs=None):
+    """
+    .. _check_live_header :
+
+    Check the header of a frame, which comes from untrusted bytes. The header
+    is broken if any value is not finite, fs is not positive (or not the fs
+    of the source), the index is not a non-negative integer, or n is not an
+    integer from 1 to CONST_INT_LIVE_MAX_SAMPLES.
+
+    Parameters
+    ----------
+    locHeader : array
+        The CONST_INT_LIVE_HEADER float64 values, fs, index, n.
+
+    locDbl_fs : float or None
+        The fs of the source, None if no frame is received yet.
+
+    Returns
+    -------
+    int or None
+        n, the samples of the frame, or None if the header is broken.
+    """
+
+    locDbl_frame_fs, locDbl_start, locDbl_samples = locHeader
+
+    if (np.all(np.isfinite(locHeader)) and (locDbl_frame_fs > 0)
+            and ((locDbl_fs is None) or (locDbl_frame_fs == locDbl_fs))
+            and (locDbl_start == int(locDbl_start)) and (locDbl_start >= 0)
+            and (locDbl_samples == int(locDbl_samples))
+            and (1 <= locDbl_samples <= CONST_INT_LIVE_MAX_SAMPLES)):
+
+        return int(locDbl_samples)
+
+    else:
+
+        return None
+
+# =============================================================================
+# </Function: check the header of a frame>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: write a frame into the ring buffer>
+# =============================================================================
+
+def write_live_ring(locDict_live, locFrame):
+    """
+    .. _write_live_ring :
+
+    Write the samples of one frame into the ring buffer of a live source.
+    Called by the receiver thread only, see the module description.
+
+    Parameters
+    ----------
+    locDict_live : dict
+        The live source from start_live_.
+
+    locFrame : array
+        The frame as a float64 array.
+    """
+
+    if len(locFrame) < CONST_INT_LIVE_HEADER:
+
+        locInt_samples = None
+
+    else:
+
+        locInt_samples = check_live_header(locFrame[:CONST_INT_LIVE_HEADER], locDict_live['fs'])
+
+    if (locInt_samples is None) or (len(locFrame) != CONST_INT_LIVE_HEADER + 3 * locInt_samples):
+
+        # a broken frame, its samples are not known, so it is not counted as lost
+        locDict_live['bad_frames'] += 1
+
+        return None
+
+    else:
+
+        pass
+
+    locDbl_fs = locFrame[0]
+
+    locInt_start = int(locFrame[1])
+
+    if locDict_live['fs'] is None:
+
+        locDict_live['fs'] = locDbl_fs
+
+    else:
+
+        pass
+
+    locX = locFrame[CONST_INT_LIVE_HEADER:].reshape(locInt_samples, 3).T
+
+    locInt_capacity = locDict_live['capacity']
+
+    locInt_gap = 0 if locDict_live['next'] is None else locInt_start - locDict_live['next']
+
+    # missing samples are filled with NaN, a restarted sender (index back
+    # or too far ahead) starts again without filling
+    if 0 < locInt_gap <= locInt_capacity:
+
+        locDict_live['lost'] += locInt_gap
+
+        locX = np.concatenate((np.full((3, locInt_gap), np.nan), locX), axis=-1)
+
+    else:
+
+        pass
+
+    locDict_live['next'] = locInt_start + locInt_samples
+
+    locInt_write = locDict_live['write']
+
+    locInt_free = locInt_capacity - (locInt_write - locDict_live['read'])
+
+    if locX.shape[-1] > locInt_free:
+
+        locDict_live['dropped'] += locX.shape[-1] - locInt_free
+
+        locX = locX[:, :locInt_free]
+
+    else:
+
+        pass
+
+    locIndex = (locInt_write + np.arange(locX.shape[-1])) % locInt_capacity
+
+    locDict_live['ring'][:, locIndex] = locX
+
+    # published after the samples are written
+    locDict_live['write'] = locInt_write + locX.shape[-1]
+
+# =============================================================================
+# </Function: write a frame into the ring buffer>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: receiver thread of a live source>
+# =============================================================================
+
+def run_live_receiver(locDict_live):
+    """
+    .. _run_live_receiver :
+
+    Target of the receiver thread of start_live_. Receives frames until
+    stop_live_ and writes them into the ring buffer (write_live_ring_).
+
+    Exceptions are kept in locDict_live['error'] and end the source.
+
+    Parameters
+    ----------
+    locDict_live : dict
+        The live source from start_live_.
+    """
+
+    locEvent_stop = locDict_live['stop']
+
+    locInt_header = CONST_INT_LIVE_HEADER * 8
+
+    try:
+
+        if locDict_live['transport'] == 'pipe':
+
+            locInt_fd = locDict_live['handle']
+
+            locBuffer = bytearray()
+
+            # False after a broken header, until the next good frame
+            locBool_synced = True
+
+            while not locEvent_stop.is_set():
+
+                locList_ready = select.select([locInt_fd], [], [], 0.1)[0]
+
+                if len(locList_ready) == 0:
+
+                    continue
+
+                else:
+
+                    pass
+
+                locBytes = os.read(locInt_fd, 1 << 16)
+
+                if len(locBytes) == 0:
+
+                    # no writer, wait for the next one
+                    time.sleep(0.05)
+
+                    continue
+
+                else:
+
+                    pass
+
+                locBuffer += locBytes
+
+                # complete frames of the stream
+                while len(locBuffer) >= locInt_header:
+
+                    locInt_samples = check_live_header(
+                        np.frombuffer(locBuffer, count=CONST_INT_LIVE_HEADER), locDict_live['fs'])
+
+                    if locInt_samples is None:
+
+                        # a broken header, the next header is searched value
+                        # by value, one bad frame per loss of the stream
+                        if locBool_synced == True:
+
+                            locDict_live['bad_frames'] += 1
+
+                        else:
+
+                            pass
+
+                        locBool_synced = False
+
+                        del locBuffer[:8]
+
+                        continue
+
+                    else:
+
+                        pass
+
+                    locInt_size = locInt_header + 3 * 8 * locInt_samples
+
+                    if len(locBuffer) < locInt_size:
+
+                        break
+
+                    else:
+
+                        pass
+
+                    write_live_ring(locDict_live,
+                                    np.frombuffer(bytes(locBuffer[:locInt_size])))
+
+                    del locBuffer[:locInt_size]
+
+                    locBool_synced = True
+
+        else:
+
+            locSocket = locDict_live['handle']
+
+            while not locEvent_stop.is_set():
+
+                try:
+
+                    locBytes = locSocket.recv(1 << 17)
+
+                except socket.timeout:
+
+                    continue
+
+                if len(locBytes) % 8 == 0:
+
+                    write_live_ring(locDict_live, np.frombuffer(locBytes))
+
+                else:
+
+                    locDict_live['bad_frames'] += 1
+
+    except Exception as locError:
+
+        locDict_live['error'] = type(locError).__name__ + ': ' + str(locError)
+
+        locDict_live['done'] = True
+
+# =============================================================================
+# </Function: receiver thread of a live source>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: start a live source>
+# =============================================================================
+
+def start_live(locStr_address, locDbl_base_freq=50, locDbl_pll_order=1,
+               locInt_capacity=CONST_INT_LIVE_CAPACITY, locDbl_latency=0.2,
+               locDbl_scale=None, locStr_clarke=CONST_STR_VARIANT_CLARKE,
+               locStr_park=CONST_STR_VARIANT_PARK):
+    """
+    .. _start_live :
+
+    Open a live address and start its receiver thread. The socket or the
+    named pipe is opened here, so a wrong or busy address raises at once.
+
+    Parameters
+    ----------
+    locStr_address : str
+        The live address, see the module description.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locDbl_pll_order : float
+        The PLL order of the Park Transform.
+
+    locInt_capacity : int
+        Samples of the ring buffer.
+
+    locDbl_latency : float
+        The maximum latency (s). Older samples are skipped by read_live_.
+
+    locDbl_scale : float or None
+        The α, β, *d*, *q* and zero outputs are divided by this value. None
+        uses the peak of the space vector in the first read, i.e., per unit
+        values for the visualiser.
+
+    locStr_clarke, locStr_park : str
+        The names of the Clarke and the Park variants, see gsyVariants.
+
+    Returns
+    -------
+    locDict_live : dict
+        The live source, to be passed into read_live_ and stop_live_. The
+        keys of interest are 'kind' ('live'), 'transport' ('udp', 'unix' or
+        'pipe'), 'fs' (None until the first frame), 'base_freq',
+        'position' (samples read so far), 'underruns', 'dropped', 'lost',
+        'skipped', 'bad_frames', 'done' and 'error'.
+
+    Examples
+    --------
+    .. code:: python
+
+        live = start_live('udp://127.0.0.1:50000')
+
+        while True:
+
+            samples = read_live(live)
+
+            draw(samples['time'], samples['d'], samples['q'])
+    """
+
+    locStr_kind, locTarget = parse_live_address(locStr_address)
+
+    # unknown names raise before the address is opened
+    get_variant(locStr_clarke, 'clarke')
+
+    get_variant(locStr_park, 'park')
+
+    if locStr_kind == 'udp':
+
+        locHandle = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        locHandle.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+
+        locHandle.bind(locTarget)
+
+        locHandle.settimeout(0.1)
+
+    elif locStr_kind == 'unix':
+
+        if os.path.exists(locTarget):
+
+            os.remove(locTarget)
+
+        else:
+
+            pass
+
+        locHandle = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        locHandle.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+
+        locHandle.bind(locTarget)
+
+        locHandle.settimeout(0.1)
+
+    else:
+
+        if not os.path.exists(locTarget):
+
+            os.mkfifo(locTarget)
+
+        else:
+
+            pass
+
+        # non-blocking, so the receiver does not wait for a writer
+        locHandle = os.open(locTarget, os.O_RDONLY | os.O_NONBLOCK)
+
+    locInt_capacity = int(max(1, locInt_capacity))
+
+    locDict_live = {'address': locStr_address,
+                    'kind': 'live',
+                    'transport': locStr_kind,
+                    'handle': locHandle,
+                    'fs': None,
+                    'base_freq': locDbl_base_freq,
+                    'pll_order': locDbl_pll_order,
+                    'clarke': locStr_clarke,
+                    'park': locStr_park,
+                    'latency': locDbl_latency,
+                    'scale': locDbl_scale,
+                    'capacity': locInt_capacity,
+                    'ring': np.zeros((3, locInt_capacity)),
+                    'write': 0,
+                    'read': 0,
+                    'next': None,
+                    'position': 0,
+                    'underruns': 0,
+                    'dropped': 0,
+                    'lost': 0,
+                    'bad_frames': 0,
+                    'skipped': 0,
+                    'stop': threading.Event(),
+                    'done': False,
+                    'error': None}
+
+    locDict_live['thread'] = threading.Thread(target=run_live_receiver,
+                                              args=(locDict_live,), daemon=True)
+
+    locDict_live['thread'].start()
+
+    return locDict_live
+
+# =============================================================================
+# </Function: start a live source>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: read the new samples of a live source>
+# =============================================================================
+
+def read_live(locDict_live):
+    """
+    .. _read_live :
+
+    Read the new samples of a live source, and run them through the Clarke
+    and Park Transforms. Never blocks.
+
+    Parameters
+    ----------
+    locDict_live : dict
+        The live source from start_live_.
+
+    Returns
+    -------
+    locDict_samples : dict
+        Arrays of gsyReplay.CONST_LIST_REPLAY_FIELDS, the new samples (may be
+        empty). The time is relative to the first sample received.
+    """
+
+    locInt_read = locDict_live['read']
+
+    locInt_available = locDict_live['write'] - locInt_read
+
+    if (locDict_live['fs'] is None) or (locInt_available == 0):
+
+        locDict_live['underruns'] += 1
+
+        return {x: np.zeros(0) for x in CONST_LIST_REPLAY_FIELDS}
+
+    else:
+
+        pass
+
+    locDbl_fs = locDict_live['fs']
+
+    # bounded latency, the older samples are skipped
+    locInt_latency = int(max(1, locDict_live['latency'] * locDbl_fs))
+
+    if locInt_available > locInt_latency:
+
+        locInt_skip = locInt_available - locInt_latency
+
+        locDict_live['skipped'] += locInt_skip
+
+        locDict_live['position'] += locInt_skip
+
+        locInt_read += locInt_skip
+
+        locInt_available = locInt_latency
+
+    else:
+
+        pass
+
+    locIndex = (locInt_read + np.arange(locInt_available)) % locDict_live['capacity']
+
+    a, b, c = locDict_live['ring'][:, locIndex]
+
+    # released after the samples are copied
+    locDict_live['read'] = locInt_read + locInt_available
+
+    locTime, locTheta = make_theta(locDict_live['position'], locInt_available, locDbl_fs,
+                                   locDict_live['base_freq'], locDict_live['pll_order'])
+
+    locDict_live['position'] += locInt_available
+
+    alpha, beta, d, q, zero = cal_variant_clarke_park(locTheta, a, b, c,
+                                                      locDict_live['clarke'],
+                                                      locDict_live['park'])
+
+    if locDict_live['scale'] is None:
+
+        locDbl_peak = np.nanmax(np.hypot(alpha, beta), initial=0)
+
+        locDict_live['scale'] = locDbl_peak if locDbl_peak > 0 else None
+
+    else:
+
+        pass
+
+    locDbl_scale = locDict_live['scale'] or 1
+
+    locDict_samples = dict(zip(CONST_LIST_REPLAY_FIELDS,
+                               (locTime, locTheta,
+                                alpha / locDbl_scale, beta / locDbl_scale,
+                                d / locDbl_scale, q / locDbl_scale, zero / locDbl_scale)))
+
+    return locDict_samples
+
+# =============================================================================
+# </Function: read the new samples of a live source>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stop a live source>
+# =============================================================================
+
+def stop_live(locDict_live, locDbl_timeout=1):
+    """
+    .. _stop_live :
+
+    Stop the receiver thread of a live source and close its socket or named
+    pipe.
+
+    Parameters
+    ----------
+    locDict_live : dict
+        The live source from start_live_.
+
+    locDbl_timeout : float
+        Seconds to wait for the receiver thread.
+    """
+
+    locDict_live['stop'].set()
+
+    locDict_live['thread'].join(locDbl_timeout)
+
+    if locDict_live['transport'] == 'pipe':
+
+        os.close(locDict_live['handle'])
+
+    else:
+
+        locDict_live['handle'].close()
+
+    locDict_live['done'] = True
+
+# =============================================================================
+# </Function: stop a live source>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: send a scenario in real time>
+# =============================================================================
+
+def run_live_simulator(locStr_address, locDict_scenario, locDbl_speed=1,
+                       locInt_frame=CONST_INT_LIVE_FRAME, locBool_loop=False,
+                       locEvent_stop=None):
+    """
+    .. _run_live_simulator :
+
+    Send a scenario of gsyScenario to a live address in real time (or
+    locDbl_speed times faster), frame by frame, as a stand-in of a test rig.
+    Blocks until the end of the scenario, or until locEvent_stop is set.
+
+    Parameters
+    ----------
+    locStr_address : str
+        The live address, see the module description.
+
+    locDict_scenario : dict
+        The scenario from gsyScenario.make_scenario.
+
+    locDbl_speed : float
+        Sending speed, 1 is real time.
+
+    locInt_frame : int
+        Samples per frame.
+
+    locBool_loop : bool
+        True repeats the scenario, the sample index keeps counting.
+
+    locEvent_stop : threading.Event or None
+        Stops the simulator when set, e.g., from another thread.
+
+    Returns
+    -------
+    locInt_sent : int
+        Number of samples sent.
+
+    Examples
+    --------
+    .. code:: python
+
+        scenario = make_scenario([{'duration': 1},
+                                  {'duration': 0.2, 'amplitude': 0.5},
+                                  {'duration': 1}], 10e3)
+
+        run_live_simulator('udp://127.0.0.1:50000', scenario, locBool_loop=True)
+    """
+
+    locStr_kind, locTarget = parse_live_address(locStr_address)
+
+    if locStr_kind == 'udp':
+
+        locHandle = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        locSend = lambda x: locHandle.sendto(x, locTarget)
+
+    elif locStr_kind == 'unix':
+
+        locHandle = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        locSend = lambda x: locHandle.sendto(x, locTarget)
+
+    else:
+
+        # blocks until the reader opens the named pipe
+        locHandle = open(locTarget, 'wb', buffering=0)
+
+        locSend = locHandle.write
+
+    locDbl_fs = locDict_scenario['fs']
+
+    locDbl_rate = locDbl_fs * locDbl_speed
+
+    locInt_sent = 0
+
+    locDbl_clock = time.perf_counter()
+
+    try:
+
+        while True:
+
+            for locTime, a, b, c in stream_scenario(locDict_scenario, locInt_frame):
+
+                if (locEvent_stop is not None) and locEvent_stop.is_set():
+
+                    return locInt_sent
+
+                else:
+
+                    pass
+
+                # the frame is sent when its last sample is due
+                locDbl_wait = (locDbl_clock + (locInt_sent + len(a)) / locDbl_rate
+                               - time.perf_counter())
+
+                if locDbl_wait > 0:
+
+                    time.sleep(locDbl_wait)
+
+                else:
+
+                    pass
+
+                locSend(pack_live_frame(locDbl_fs, locInt_sent, a, b, c))
+
+                locInt_sent += len(a)
+
+            if locBool_loop == False:
+
+                break
+
+            else:
+
+                pass
+
+    except (BrokenPipeError, ConnectionRefusedError, FileNotFoundError):
+
+        # the receiver went away
+        print(date_time_now() + 'Live receiver not available : ' + locStr_address)
+
+    finally:
+
+        locHandle.close()
+
+    return locInt_sent
+
+# =============================================================================
+# </Function: send a scenario in real time>
+# =============================================================================
+
+
+if __name__ == '__main__':
+
+    locParser = argparse.ArgumentParser(description='Live source simulator')
+
+    locParser.add_argument('address', help='udp://host:port, unix://path or pipe://path')
+
+    locParser.add_argument('--fs', type=float, default=10e3, help='sampling frequency')
+
+    locParser.add_argument('--base-freq', type=float, default=50, help='base frequency')
+
+    locParser.add_argument('--speed', type=float, default=1, help='sending speed')
+
+    locParser.add_argument('--loop', action='store_true', help='repeat the scenario')
+
+    locArgs = locParser.parse_args()
+
+    # 1 s nominal, 0.2 s unbalanced sag with a phase jump, 1 s distorted
+    locDict_scenario = make_scenario([{'duration': 1},
+                                      {'duration': 0.2, 'amplitude': (0.5, 0.8, 0.8),
+                                       'phase_jump': -0.3},
+                                      {'duration': 1, 'harmonics': [(5, 0.05), (7, 0.03)],
+                                       'noise': 0.01}],
+                                     locArgs.fs, locArgs.base_freq)
+
+    print(date_time_now() + 'Sending to ' + locArgs.address)
+
+    locInt_sent = run_live_simulator(locArgs.address, locDict_scenario, locArgs.speed,
+                                     locBool_loop=locArgs.loop)
+
+    print(date_time_now() + 'Sent ' + str(locInt_sent) + ' samples')
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the simulation of permanent magnet synchronous machines
+(PMSM) in the *d*, *q* frame.
+
+The machine is modelled in the rotor frame, i.e., the Park Transform with the
+electrical rotor angle :math:`θ_{e}` as the PLL angle. With the amplitude
+invariant transforms:
+
+.. math::
+    L_{d} \\frac{di_{d}}{dt} = v_{d} - R_{s} i_{d} + ω_{e} L_{q} i_{q}
+
+.. math::
+    L_{q} \\frac{di_{q}}{dt} = v_{q} - R_{s} i_{q} - ω_{e} L_{d} i_{d} - ω_{e} ψ_{m}
+
+.. math::
+    T_{e} = \\frac{3}{2} p (ψ_{m} i_{q} + (L_{d} - L_{q}) i_{d} i_{q})
+
+.. math::
+    J \\frac{dω_{m}}{dt} = T_{e} - T_{L} - B ω_{m}
+
+.. math::
+    \\frac{dθ_{e}}{dt} = ω_{e} = p ω_{m}
+
+The equations are integrated by the fixed-step fourth-order Runge-Kutta
+method. Every machine parameter may be an array, so a batch of machine
+variants is simulated in one call, the loop is over the time steps only. The
+phase currents are calculated from :math:`i_{d}`, :math:`i_{q}` by the inverse
+Park and the inverse Clarke Transforms of gsyTransforms.
+
+The simulation can be continued chunk by chunk by passing the returned state
+into the next call, e.g., to stream the results into the visualiser.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_pmsm_derivative_
+* make_pmsm_params_
+* sim_pmsm_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from numpy import pi
+
+from gsyTransforms import cal_inv_park, cal_inv_clarke
+
+# =============================================================================
+# <Function: make the PMSM parameter sets>
+# =============================================================================
+
+def make_pmsm_params(locDbl_rs, locDbl_ld, locDbl_lq, locDbl_psi, locInt_pole_pairs,
+                     locDbl_j, locDbl_b=0):
+    """
+    .. _make_pmsm_params :
+
+    Make a batch of PMSM parameter sets. Scalars and arrays are broadcast to
+    one 1d array per parameter, one element per machine.
+
+    Parameters
+    ----------
+    locDbl_rs : float or array
+        Stator resistance (Ω).
+
+    locDbl_ld, locDbl_lq : float or array
+        *d* and *q* axis inductances (H).
+
+    locDbl_psi : float or array
+        Permanent magnet flux linkage (Wb), amplitude of the phase flux.
+
+    locInt_pole_pairs : int or array
+        Number of pole pairs.
+
+    locDbl_j : float or array
+        Moment of inertia (kg m²).
+
+    locDbl_b : float or array
+        Viscous friction coefficient (N m s). Default is 0.
+
+    Returns
+    -------
+    locDict_params : dict
+        'rs', 'ld', 'lq', 'psi', 'p', 'j', 'b', 1d arrays of the same length
+        (the batch size).
+
+    Examples
+    --------
+    .. code:: python
+
+        # 100 variants with different d axis inductances
+        params = make_pmsm_params(0.2, np.linspace(1e-3, 3e-3, 100), 3e-3,
+                                  0.1, 4, 1e-3)
+    """
+
+    locList_values = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float))
+                                           for x in (locDbl_rs, locDbl_ld, locDbl_lq,
+                                                     locDbl_psi, locInt_pole_pairs,
+                                                     locDbl_j, locDbl_b)])
+
+    if locList_values[0].ndim != 1:
+
+        raise ValueError('The machine parameters must be scalars or 1d arrays')
+
+    else:
+
+        pass
+
+    if (np.any(locList_values[1] <= 0) or np.any(locList_values[2] <= 0)
+        or np.any(locList_values[5] <= 0)):
+
+        raise ValueError('The inductances and the moment of inertia must be positive')
+
+    else:
+
+        pass
+
+    locDict_params = dict(zip(('rs', 'ld', 'lq', 'psi', 'p', 'j', 'b'),
+                              [x.copy() for x in locList_values]))
+
+    return locDict_params
+
+# =============================================================================
+# </Function: make the PMSM parameter sets>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: derivatives of the PMSM states>
+# =============================================================================
+
+def cal_pmsm_derivative(locX, locVd, locVq, locTl, locDict_params):
+    """
+    .. _cal_pmsm_derivative :
+
+    Derivatives of the PMSM states, see the module description.
+
+    Parameters
+    ----------
+    locX : array
+        States, (4, machines), rows are :math:`i_{d}`, :math:`i_{q}`,
+        :math:`ω_{m}` (rad/s) and :math:`θ_{e}` (rad).
+
+    locVd, locVq : array
+        *d*, *q* voltages, (machines,).
+
+    locTl : array
+        Load torque (N m), (machines,).
+
+    locDict_params : dict
+        The parameters from make_pmsm_params_.
+
+    Returns
+    -------
+    locDx : array
+        Derivatives of the states, (4, machines).
+
+    locTe : array
+        Electromagnetic torque (N m), (machines,).
+    """
+
+    i_d, i_q, locW_m, locTheta_e = locX
+
+    rs = locDict_params['rs']
+
+    ld = locDict_params['ld']
+
+    lq = locDict_params['lq']
+
+    psi = locDict_params['psi']
+
+    p = locDict_params['p']
+
+    locW_e = p * locW_m
+
+    locTe = 3/2 * p * (psi * i_q + (ld - lq) * i_d * i_q)
+
+    locDx = np.empty_like(locX)
+
+    locDx[0] = (locVd - rs * i_d + locW_e * lq * i_q) / ld
+
+    locDx[1] = (locVq - rs * i_q - locW_e * (ld * i_d + psi)) / lq
+
+    locDx[2] = (locTe - locTl - locDict_params['b'] * locW_m) / locDict_params['j']
+
+    locDx[3] = locW_e
+
+    return locDx, locTe
+
+# =============================================================================
+# </Function: derivatives of the PMSM states>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: simulate a batch of PMSMs>
+# =============================================================================
+
+def sim_pmsm(locDict_params, locDbl_dt, locInt_steps, locVd, locVq, locTl=0,
+             locState=None):
+    """
+    .. _sim_pmsm :
+
+    Simulate a batch of PMSMs by the fixed-step fourth-order Runge-Kutta
+    method.
+
+    The voltages and the load torque are held constant within every step.
+
+    Parameters
+    ----------
+    locDict_params : dict
+        The parameters from make_pmsm_params_, a batch of M machines.
+
+    locDbl_dt : float
+        Time step (s).
+
+    locInt_steps : int
+        Number of steps of this call.
+
+    locVd, locVq : float or array
+        *d*, *q* voltages (V), in the rotor frame, e.g., from a field oriented
+        controller. Scalars, (M,) arrays (constant per machine), or (M, steps)
+        / (steps,) arrays (one value per step).
+
+    locTl : float or array
+        Load torque (N m), same shapes as the voltages. Default is 0.
+
+    locState : dict or None
+        The state returned by the previous call. None starts all machines at
+        standstill with zero currents and :math:`θ_{e} = 0`.
+
+    Returns
+    -------
+    locDict_results : dict
+        Arrays of shape (M, steps), the values at the end of every step:
+            |  'time' : (steps,), time (s)
+            |  'id', 'iq' : *d*, *q* currents (A)
+            |  'speed' : mechanical speed (rad/s)
+            |  'theta' : electrical angle (rad), wrapped into [0, 2π)
+            |  'torque' : electromagnetic torque (N m)
+            |  'ia', 'ib', 'ic' : phase currents (A)
+
+    locState : dict
+        'x', the states (4, M), and 'step', the number of steps done so far.
+
+    Examples
+    --------
+    .. code:: python
+
+        params = make_pmsm_params(0.2, 2e-3, 3e-3, 0.1, 4, 1e-3)
+
+        # 0.5 s step response to 20 V on the q axis, in two chunks
+        results, state = sim_pmsm(params, 1e-5, 25000, 0, 20)
+
+        results, state = sim_pmsm(params, 1e-5, 25000, 0, 20, locState=state)
+    """
+
+    locInt_machines = len(locDict_params['rs'])
+
+    locInt_steps = int(locInt_steps)
+
+    if locState is None:
+
+        locState = {'x': np.zeros((4, locInt_machines)), 'step': 0}
+
+    else:
+
+        pass
+
+    locShape = (locInt_machines, locInt_steps)
+
+    # inputs as (machines, steps) views
+    locList_inputs = []
+
+    for item in (locVd, locVq, locTl):
+
+        item = np.asarray(item, dtype=float)
+
+        # a 1d array of the batch size is one value per machine, even if the
+        # number of steps happens to be the same
+        if (item.ndim == 1) and (len(item) == locInt_machines):
+
+            item = item[:, np.newaxis]
+
+        else:
+
+            pass
+
+        locList_inputs.append(np.broadcast_to(item, locShape))
+
+    locVd_all, locVq_all, locTl_all = locList_inputs
+
+    locX = locState['x'].copy()
+
+    locResults = np.empty((5,) + locShape)
+
+    locDbl_half = locDbl_dt / 2
+
+    # for-loop start
+    for k in range(locInt_steps):
+
+        locVd = locVd_all[:, k]
+
+        locVq = locVq_all[:, k]
+
+        locTl = locTl_all[:, k]
+
+        k1, locTe = cal_pmsm_derivative(locX, locVd, locVq, locTl, locDict_params)
+
+        k2, locTe = cal_pmsm_derivative(locX + locDbl_half * k1, locVd, locVq, locTl,
+                                        locDict_params)
+
+        k3, locTe = cal_pmsm_derivative(locX + locDbl_half * k2, locVd, locVq, locTl,
+                                        locDict_params)
+
+        k4, locTe = cal_pmsm_derivative(locX + locDbl_dt * k3, locVd, locVq, locTl,
+                                        locDict_params)
+
+        locX += locDbl_dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+        locX[3] = np.mod(locX[3], 2 * pi)
+
+        locResults[:4, :, k] = locX
+
+        # torque at the end of the step
+        locResults[4, :, k] = (3/2 * locDict_params['p']
+                               * (locDict_params['psi'] * locX[1]
+                                  + (locDict_params['ld'] - locDict_params['lq'])
+                                  * locX[0] * locX[1]))
+    # for-loop end
+
+    i_d, i_q, locW_m, locTheta_e, locTe = locResults
+
+    # phase currents by the inverse Park and the inverse Clarke Transforms
+    alpha, beta, zero = cal_inv_park(locTheta_e, i_d, i_q, np.zeros(locShape))
+
+    i_a, i_b, i_c = cal_inv_clarke(alpha, beta, zero)
+
+    locTime = (locState['step'] + 1 + np.arange(locInt_steps)) * locDbl_dt
+
+    locDict_results = {'time': locTime,
+                       'id': i_d, 'iq': i_q,
+                       'speed': locW_m, 'theta': locTheta_e,
+                       'torque': locTe,
+                       'ia': i_a, 'ib': i_b, 'ic': i_c}
+
+    locState = {'x': locX, 'step': locState['step'] + locInt_steps}
+
+    return locDict_results, locState
+
+# =============================================================================
+# </Function: simulate a batch of PMSMs>
+# =============================================================================
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the streaming power quality (PQ) metrics.
+
+The metrics follow the measurement windows of IEC 61000-4-30: the basic
+window is 10 cycles of a 50 Hz system or 12 cycles of a 60 Hz system (about
+200 ms). Every basic window gives:
+    |  harmonic levels of a, b, c, by the DFT bins of the window
+    |  THD of a, b, c
+    |  negative and zero sequence unbalance factors of the fundamental
+    |  *d*, *q* mean and ripple amplitude, (max - min) / 2 within the window
+
+The basic window values are then aggregated over longer intervals, e.g.,
+150/180 cycles (15 windows, about 3 s) and 10 minutes (3000 windows), by the
+root mean square as in IEC 61000-4-30. The *d*, *q* means are signed, they
+are aggregated by the arithmetic mean.
+
+The samples arrive chunk by chunk. The incomplete basic window is kept in a
+buffer and the incomplete aggregation intervals are kept as partial sums of
+squares, so every chunk only processes its own samples and never rescans the
+history. All metrics are vectorised over channels, the last axis of the
+inputs is the time axis.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_pq_metrics_
+* cal_rms_aggregate_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from gsyTransforms import cal_symm, cal_clarke_park
+
+# =============================================================================
+# <Function: RMS aggregation over intervals>
+# =============================================================================
+
+def cal_rms_aggregate(locDict_values, locInt_windows, locState=None, locList_mean=()):
+    """
+    .. _cal_rms_aggregate :
+
+    Root mean square aggregation of basic window values over intervals of
+    locInt_windows windows, by the sums of squares of every interval. Signed
+    values, e.g., the *d*, *q* means, are aggregated by the arithmetic mean.
+
+    Parameters
+    ----------
+    locDict_values : dict
+        Arrays of basic window values, the last axis is the window axis. All
+        arrays have the same number of windows.
+
+    locInt_windows : int
+        Number of basic windows per interval, e.g., 15 for 3 s.
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream.
+
+    locList_mean : list of str
+        The keys aggregated by the arithmetic mean instead of the RMS, e.g.,
+        ['d_mean', 'q_mean'].
+
+    Returns
+    -------
+    locDict_rms : dict
+        Same keys as locDict_values. The aggregated values of the intervals
+        completed in this call, the last axis is the interval axis (may be
+        empty).
+
+    locState : dict
+        'count', the windows in the incomplete interval, and 'sum', the
+        partial sums of squares (or of values for locList_mean), to be
+        passed into the next call.
+    """
+
+    locInt_windows = int(locInt_windows)
+
+    if locInt_windows <= 0:
+
+        raise ValueError('The number of windows per interval must be a positive integer')
+
+    else:
+
+        pass
+
+    if locState is None:
+
+        locState = {'count': 0, 'sum': {}}
+
+    else:
+
+        pass
+
+    locInt_count = locState['count']
+
+    locDict_rms = {}
+
+    locDict_sum = {}
+
+    for item, locValues in locDict_values.items():
+
+        locBool_mean = item in locList_mean
+
+        # the values of the sums, squares for the RMS
+        locTerms = locValues if locBool_mean else locValues**2
+
+        locInt_new = locValues.shape[-1]
+
+        locInt_complete = (locInt_count + locInt_new) // locInt_windows
+
+        locPartial = locState['sum'].get(item, np.zeros(locValues.shape[:-1]))
+
+        # ends of the completed intervals within this call
+        locEnds = locInt_windows * np.arange(1, locInt_complete + 1) - locInt_count
+
+        locStarts = np.concatenate(([0], locEnds[:-1])).astype(np.intp)
+
+        # every interval is summed on its own, so a NaN window only spoils
+        # its own interval, the partial sum is added to the first one only
+        if locInt_complete > 0:
+
+            locSum = np.add.reduceat(locTerms[..., :locEnds[-1]], locStarts, axis=-1)
+
+            locSum[..., 0] += locPartial
+
+            if locBool_mean == True:
+
+                locDict_rms[item] = locSum / locInt_windows
+
+            else:
+
+                locDict_rms[item] = np.sqrt(locSum / locInt_windows)
+
+            locDict_sum[item] = np.sum(locTerms[..., locEnds[-1]:], axis=-1)
+
+        else:
+
+            locDict_rms[item] = np.zeros(locValues.shape[:-1] + (0,))
+
+            locDict_sum[item] = locPartial + np.sum(locTerms, axis=-1)
+
+    locInt_total = locInt_count + (locValues.shape[-1] if len(locDict_values) > 0 else 0)
+
+    locState = {'count': locInt_total % locInt_windows, 'sum': locDict_sum}
+
+    return locDict_rms, locState
+
+# =============================================================================
+# </Function: RMS aggregation over intervals>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: streaming PQ metrics>
+# =============================================================================
+
+def cal_pq_metrics(a, b, c, theta, locDbl_fs, locDbl_base_freq=50, locInt_harmonics=40,
+                   locInt_cycles=None, locList_intervals=(15,), locState=None):
+    """
+    .. _cal_pq_metrics :
+
+    Streaming PQ metrics of a chunk of three-phase samples, see the module
+    description.
+
+    Parameters
+    ----------
+    a, b, c : array
+        Instantaneous samples. The last axis is the time axis, any leading
+        axes are independent channels.
+
+    theta : array
+        1d array of the PLL angle for the *d*, *q* ripple, e.g., from
+        gsyStream.make_theta.
+
+    locDbl_fs : float
+        Sampling frequency in Hz, an integer multiple of the base frequency.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locInt_harmonics : int
+        The highest harmonic order, default is 40. Limited by the Nyquist
+        frequency.
+
+    locInt_cycles : int or None
+        Cycles per basic window. None gives 10 for 50 Hz and 12 for 60 Hz
+        (base frequency / 5).
+
+    locList_intervals : list of int
+        Aggregation intervals in basic windows, e.g., (15, 3000) for 3 s and
+        10 minutes of a 50 Hz system. Default is (15,).
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream.
+
+    Returns
+    -------
+    locDict_windows : dict
+        Values of the basic windows completed in this call, the last axis is
+        the window axis:
+            |  'time' : end time of the windows (s)
+            |  'harmonics' : (harmonics, 3) + channels + (windows,), peak
+            |                amplitudes of the orders 1 to locInt_harmonics
+            |                of a, b, c
+            |  'thd' : (3,) + channels + (windows,)
+            |  'unbalance_neg', 'unbalance_zero' : channels + (windows,),
+            |                                      |neg| / |pos|, |zero| / |pos|
+            |  'd_mean', 'q_mean', 'd_ripple', 'q_ripple' : channels +
+            |                                               (windows,)
+
+    locList_aggregated : list of dict
+        One dict per aggregation interval, same keys as locDict_windows
+        except 'time' is the end time of the intervals, the values are RMS
+        aggregated (cal_rms_aggregate_), except 'd_mean' and 'q_mean' which
+        are the arithmetic means.
+
+    locState : dict
+        The state to be passed into the next call for the next chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        state = None
+
+        for time, a, b, c in stream_scenario(scenario, 2000):
+
+            time, theta = make_theta(...)
+
+            windows, aggregated, state = cal_pq_metrics(a, b, c, theta, 10e3,
+                                                        locState=state)
+
+            print(windows['thd'], aggregated[0]['unbalance_neg'])
+    """
+
+    locDbl_cycle = locDbl_fs / locDbl_base_freq
+
+    if abs(locDbl_cycle - round(locDbl_cycle)) > 1e-9:
+
+        raise ValueError('The sampling frequency must be an integer multiple '
+                         + 'of the base frequency')
+
+    else:
+
+        pass
+
+    if locInt_cycles is None:
+
+        locInt_cycles = max(1, int(round(locDbl_base_freq / 5)))
+
+    else:
+
+        locInt_cycles = int(locInt_cycles)
+
+    # samples per basic window
+    locInt_window = int(round(locDbl_cycle)) * locInt_cycles
+
+    # the harmonic h is on bin h * cycles, below the Nyquist bin
+    locInt_harmonics = int(min(locInt_harmonics, (locInt_window // 2 - 1) // locInt_cycles))
+
+    alpha, beta, d, q, zero = cal_clarke_park(theta, a, b, c)
+
+    # (a, b, c, d, q, channels..., samples)
+    locX = np.stack(np.broadcast_arrays(a, b, c, d, q)).astype(float)
+
+    if locState is None:
+
+        locState = {'buffer': np.zeros(locX.shape[:-1] + (0,)),
+                    'index': 0,
+                    'aggregate': [None] * len(locList_intervals)}
+
+    else:
+
+        pass
+
+    locX = np.concatenate((locState['buffer'], locX), axis=-1)
+
+    locInt_count = locX.shape[-1] // locInt_window
+
+    # (5, channels..., windows, samples per window)
+    locWindows = locX[..., :locInt_count * locInt_window].reshape(
+        locX.shape[:-1] + (locInt_count, locInt_window))
+
+    # harmonic bins of a, b, c, (harmonics, 3, channels..., windows)
+    locSpectrum = np.fft.rfft(locWindows[:3], axis=-1)
+
+    locBins = locInt_cycles * np.arange(1, locInt_harmonics + 1)
+
+    locHarmonics = np.moveaxis(locSpectrum[..., locBins], -1, 0) * (2 / locInt_window)
+
+    locMag = np.abs(locHarmonics)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        locThd = np.sqrt(np.sum(locMag[1:]**2, axis=0)) / locMag[0]
+
+        (a_pos, b_pos, c_pos,
+         a_neg, b_neg, c_neg, locZero) = cal_symm(locHarmonics[0, 0],
+                                                  locHarmonics[0, 1],
+                                                  locHarmonics[0, 2])
+
+        locUnbalance_neg = np.abs(a_neg) / np.abs(a_pos)
+
+        locUnbalance_zero = np.abs(locZero) / np.abs(a_pos)
+
+    locDQ = locWindows[3:]
+
+    locInt_ends = locState['index'] + locInt_window * np.arange(1, locInt_count + 1)
+
+    locDict_windows = {'time': locInt_ends / locDbl_fs,
+                       'harmonics': locMag,
+                       'thd': locThd,
+                       'unbalance_neg': locUnbalance_neg,
+                       'unbalance_zero': locUnbalance_zero,
+                       'd_mean': np.mean(locDQ[0], axis=-1),
+                       'q_mean': np.mean(locDQ[1], axis=-1),
+                       'd_ripple': np.ptp(locDQ[0], axis=-1) / 2,
+                       'q_ripple': np.ptp(locDQ[1], axis=-1) / 2}
+
+    # aggregation over the longer intervals
+    locList_aggregated = []
+
+    locList_aggregate_state = list(locState['aggregate'])
+
+    locDict_values = {x: y for x, y in locDict_windows.items() if x != 'time'}
+
+    for k, item in enumerate(locList_intervals):
+
+        locDict_rms, locList_aggregate_state[k] = cal_rms_aggregate(
+            locDict_values, item, locList_aggregate_state[k], ['d_mean', 'q_mean'])
+
+        # end time of the intervals completed in this call
+        locInt_done = locDict_rms['thd'].shape[-1]
+
+        locInt_first = item - (locList_aggregate_state[k]['count'] + locInt_done * item
+                               - locInt_count)
+
+        locDict_rms['time'] = locDict_windows['time'][locInt_first - 1
+                                                      + item * np.arange(locInt_done)]
+
+        locList_aggregated.append(locDict_rms)
+
+    locState = {'buffer': locX[..., locInt_count * locInt_window:].copy(),
+                'index': locState['index'] + locInt_count * locInt_window,
+                'aggregate': locList_aggregate_state}
+
+    return locDict_windows, locList_aggregated, locState
+
+# =============================================================================
+# </Function: streaming PQ metrics>
+# =============================================================================
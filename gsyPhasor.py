@@ -0,0 +1,612 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for estimating phasors from instantaneous three-phase samples.
+
+The transforms in gsyTransforms work on phasors (cal_symm) or on instantaneous
+samples (cal_clarke, cal_park). This module turns streams of instantaneous
+samples into per-sample complex phasors so that the Fortescue decomposition
+can be run over whole recordings.
+
+All functions are vectorised over channels. The last axis of an input array is
+always the time (sample) axis, any leading axes are treated as independent
+channels. Long recordings can be processed chunk by chunk by passing the
+returned state back into the next call.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_kalman_dq_
+* cal_pmu_
+* cal_sdft_phasor_
+* cal_sdft_symm_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from numpy import sin, cos, pi
+
+from gsyTransforms import cal_symm
+
+# =============================================================================
+# <Function: sliding DFT phasor estimator>
+# =============================================================================
+
+def cal_sdft_phasor(locX, locInt_window, locList_harmonics=(1,), locState=None):
+    """
+    .. _cal_sdft_phasor :
+
+    Sliding DFT (SDFT) phasor estimator.
+
+    For every sample, the DFT bins of the tracked harmonics are evaluated over
+    the last locInt_window samples. The SDFT recursion
+
+    .. code:: python
+
+        X[n] = X[n-1] + x[n] * w[n] - x[n-N] * w[n-N],  w[m] = exp(-j2πhm/N)
+
+    is evaluated as a running (cumulative) sum, i.e., O(1) per sample per
+    harmonic, without a Python-level loop over the samples. The running sum
+    is rebuilt from the last locInt_window samples at the start of every call,
+    so rounding errors do not accumulate from chunk to chunk.
+
+    The twiddles are referenced to the absolute sample index, thus a steady
+    sinusoid at exactly h times the base frequency gives a constant phasor.
+    The phasors are scaled to peak amplitude, i.e.,
+    :math:`A \\cos(h \\omega t + φ)` gives :math:`A e^{jφ}`.
+
+    Until the first locInt_window samples have been seen, the window is
+    padded with zeros (the usual SDFT start-up transient).
+
+    Parameters
+    ----------
+    locX : array
+        Instantaneous samples. The last axis is the time axis. Any leading
+        axes are independent channels.
+
+    locInt_window : int
+        The DFT window length in samples. This should be the number of samples
+        within one base period, e.g., 200 for 10 kHz sampling and 50 Hz.
+
+    locList_harmonics : list of int
+        The harmonic orders to be tracked (DFT bins of the one-cycle window).
+        Default is (1,), i.e., the fundamental only.
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream.
+
+    Returns
+    -------
+    locPhasor : array (complex)
+        Phasors of shape (len(locList_harmonics),) + locX.shape.
+
+    locState : dict
+        The state to be passed into the next call for the next chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        state = None
+
+        for chunk in chunks:
+
+            phasor, state = cal_sdft_phasor(chunk, 200, [1, 5, 7], state)
+    """
+
+    locX = np.asarray(locX, dtype=float)
+
+    locInt_window = int(locInt_window)
+
+    if locInt_window <= 0:
+
+        raise ValueError('The window length must be a positive integer')
+
+    locHarmonics = np.asarray(locList_harmonics, dtype=float).reshape(-1)
+
+    if np.any(locHarmonics != np.round(locHarmonics)):
+
+        raise ValueError('The tracked harmonic orders must be integers. '
+                         + 'Interharmonics do not fall on a bin of the one-cycle window')
+
+    locInt_samples = locX.shape[-1]
+
+    # new stream, zero padded window
+    if locState is None:
+
+        locState = {'index': 0,
+                    'tail': np.zeros(locX.shape[:-1] + (locInt_window,))}
+
+    else:
+
+        pass
+
+    if locState['tail'].shape != locX.shape[:-1] + (locInt_window,):
+
+        raise ValueError('Element shape mismatch. '
+                         + 'The channels of the chunk do not match the state')
+
+    # previous window followed by the new chunk
+    locExtended = np.concatenate((locState['tail'], locX), axis=-1)
+
+    # absolute sample index (modulo the window), the first N are the old window
+    locIndex = np.mod(locState['index'] - locInt_window
+                      + np.arange(locInt_window + locInt_samples), locInt_window)
+
+    # twiddles, (harmonics, samples)
+    locTwiddle = np.exp(-2j * pi * np.outer(locHarmonics, locIndex) / locInt_window)
+
+    # broadcast the twiddles over the channels
+    locTwiddle = locTwiddle.reshape((len(locHarmonics),)
+                                    + (1,) * (locX.ndim - 1)
+                                    + (locTwiddle.shape[-1],))
+
+    # running sum of the demodulated samples
+    locSum = np.cumsum(locExtended[np.newaxis] * locTwiddle, axis=-1)
+
+    # window sums ending at each sample of the chunk
+    locPhasor = locSum[..., locInt_window:] - locSum[..., :locInt_samples]
+
+    # peak amplitude scaling, DC is not doubled
+    locScale = np.where(locHarmonics == 0, 1, 2) / locInt_window
+
+    locPhasor *= locScale.reshape((len(locHarmonics),) + (1,) * locX.ndim)
+
+    locState = {'index': int(np.mod(locState['index'] + locInt_samples, locInt_window)),
+                'tail': locExtended[..., locInt_samples:].copy()}
+
+    return locPhasor, locState
+
+# =============================================================================
+# </Function: sliding DFT phasor estimator>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: running symmetrical components from instantaneous samples>
+# =============================================================================
+
+def cal_sdft_symm(a, b, c, locInt_window, locList_harmonics=(1,), locState=None):
+    """
+    .. _cal_sdft_symm :
+
+    Running symmetrical components (Fortescue) of three-phase instantaneous
+    samples.
+
+    The phasors of a, b, c are estimated by cal_sdft_phasor_ and then fed into
+    gsyTransforms.cal_symm.
+
+    Parameters
+    ----------
+    a, b, c : array
+        Instantaneous samples of the three phases. The last axis is the time
+        axis. Any leading axes are independent channels (e.g., feeders).
+
+    locInt_window : int
+        The DFT window length in samples (samples within one base period).
+
+    locList_harmonics : list of int
+        The harmonic orders to be tracked. Default is (1,).
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream.
+
+    Returns
+    -------
+    a_pos, b_pos, c_pos, a_neg, b_neg, c_neg, zero : array (complex)
+        Same as gsyTransforms.cal_symm. Each of shape
+        (len(locList_harmonics),) + a.shape.
+
+    locState : dict
+        The state to be passed into the next call for the next chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        (a_pos, b_pos, c_pos,
+         a_neg, b_neg, c_neg,
+         zero, state) = cal_sdft_symm(a, b, c, 200)
+
+        # negative sequence unbalance of the fundamental
+        vuf = abs(a_neg[0]) / abs(a_pos[0])
+    """
+
+    locABC = np.stack(np.broadcast_arrays(np.asarray(a, dtype=float),
+                                          np.asarray(b, dtype=float),
+                                          np.asarray(c, dtype=float)))
+
+    locPhasor, locState = cal_sdft_phasor(locABC, locInt_window,
+                                          locList_harmonics, locState)
+
+    (a_pos, b_pos, c_pos,
+     a_neg, b_neg, c_neg, zero) = cal_symm(locPhasor[:, 0],
+                                           locPhasor[:, 1],
+                                           locPhasor[:, 2])
+
+    return a_pos, b_pos, c_pos, a_neg, b_neg, c_neg, zero, locState
+
+# =============================================================================
+# </Function: running symmetrical components from instantaneous samples>
+# =============================================================================
+
+# =============================================================================
+# <Function: synchrophasor (PMU) style phasor and frequency estimation>
+# =============================================================================
+
+def cal_pmu(alpha, beta, locDbl_fs, locDbl_base_freq=50, locDbl_report_rate=50,
+            locInt_cycles=2, locState=None):
+    """
+    .. _cal_pmu :
+
+    Synchrophasor (PMU) style estimation of the positive sequence magnitude,
+    angle, frequency and ROCOF at a given reporting rate.
+
+    The Clarke components are rotated by the Park Transform with a PLL fixed
+    at the nominal base frequency, i.e., :math:`d + jq = (α + jβ)e^{-jθ}` and
+    :math:`θ = 2πf_{0}t`. A Hann windowed DFT of locInt_cycles base periods
+    is then taken at every reporting instant, which is the mean of d + jq
+    weighted by the window. The window nulls the :math:`2ω` ripple of the
+    negative sequence and the harmonics.
+
+    The frequency is derived from the unwrapped angle of the Park phasor
+    between two reports, :math:`f = f_{0} + Δφ / (2π T_{report})`, and the
+    ROCOF from the difference of two frequencies. The first frequency and
+    the first two ROCOF values of a stream are NaN.
+
+    Only the reporting instants are computed, the window slides by
+    locDbl_fs / locDbl_report_rate samples. The reports are time stamped at
+    the window centres, so the angle is not delayed by the window.
+
+    Parameters
+    ----------
+    alpha, beta : array
+        Clarke components, e.g., from gsyTransforms.cal_clarke. The last axis
+        is the time axis. Any leading axes are independent channels.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The nominal base frequency, e.g., 50 or 60 (Hz).
+
+    locDbl_report_rate : float
+        Reports per second. locDbl_fs / locDbl_report_rate is rounded to an
+        integer number of samples.
+
+    locInt_cycles : int
+        The window length in base periods. Default is 2.
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream.
+
+    Returns
+    -------
+    locTime : array
+        Time stamps of the reports (s), relative to the start of the stream.
+
+    locMag : array
+        Positive sequence magnitude (peak, amplitude invariant Clarke).
+
+    locAngle : array
+        Angle (rad) relative to the nominal rotating reference
+        :math:`cos(2πf_{0}t)`, wrapped into (-π, π].
+
+    locFreq : array
+        Frequency (Hz).
+
+    locRocof : array
+        Rate of change of frequency (Hz/s).
+
+    locState : dict
+        The state to be passed into the next call for the next chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        state = None
+
+        for a, b, c in chunks:
+
+            alpha, beta, zero = cal_clarke(a, b, c)
+
+            (time, mag, angle,
+             freq, rocof, state) = cal_pmu(alpha, beta, 10e3, 50, 50, 2, state)
+    """
+
+    alpha, beta = np.broadcast_arrays(np.asarray(alpha, dtype=float),
+                                      np.asarray(beta, dtype=float))
+
+    locInt_window = int(round(locInt_cycles * locDbl_fs / locDbl_base_freq))
+
+    locInt_step = int(round(locDbl_fs / locDbl_report_rate))
+
+    if (locInt_window <= 0) or (locInt_step <= 0):
+
+        raise ValueError('The window and the reporting interval must be at least one sample')
+
+    locDbl_report_period = locInt_step / locDbl_fs
+
+    # new stream
+    if locState is None:
+
+        locState = {'index': 0,
+                    'buffer': np.zeros(alpha.shape[:-1] + (0,), dtype=complex),
+                    'angle': np.full(alpha.shape[:-1], np.nan),
+                    'freq': np.full(alpha.shape[:-1], np.nan)}
+
+    else:
+
+        pass
+
+    locInt_samples = alpha.shape[-1]
+
+    # absolute sample index of the first new sample
+    locInt_first = locState['index'] + locState['buffer'].shape[-1]
+
+    # θ = 2πft, taken modulo one period to keep the precision on long streams
+    locTheta = 2 * pi * np.mod(locDbl_base_freq
+                               * (locInt_first + np.arange(locInt_samples)) / locDbl_fs, 1)
+
+    # Park Transform with the PLL at the nominal frequency, d + jq
+    locDQ = (alpha + 1j * beta) * np.exp(-1j * locTheta)
+
+    locBuffer = np.concatenate((locState['buffer'], locDQ), axis=-1)
+
+    # number of complete windows in the buffer
+    if locBuffer.shape[-1] >= locInt_window:
+
+        locInt_reports = (locBuffer.shape[-1] - locInt_window) // locInt_step + 1
+
+    else:
+
+        locInt_reports = 0
+
+    # Hann window, normalised to unity gain
+    locWindow = np.hanning(locInt_window + 2)[1:-1]
+
+    locWindow = locWindow / np.sum(locWindow)
+
+    if locInt_reports > 0:
+
+        locFrames = np.lib.stride_tricks.sliding_window_view(
+                locBuffer[..., :(locInt_reports - 1) * locInt_step + locInt_window],
+                locInt_window, axis=-1)[..., ::locInt_step, :]
+
+        locPhasor = locFrames @ locWindow
+
+    else:
+
+        locPhasor = np.zeros(alpha.shape[:-1] + (0,), dtype=complex)
+
+    # report time stamps at the window centres
+    locTime = ((locState['index']
+                + np.arange(locInt_reports) * locInt_step
+                + (locInt_window - 1) / 2) / locDbl_fs)
+
+    locMag = np.abs(locPhasor)
+
+    locAngle = np.angle(locPhasor)
+
+    # unwrap against the last angle of the previous chunk (NaN at the start)
+    if locInt_reports > 0:
+
+        locAngle_last = np.where(np.isnan(locState['angle']),
+                                 locAngle[..., 0], locState['angle'])
+
+    else:
+
+        locAngle_last = locState['angle']
+
+    locAngle_unwrap = np.unwrap(np.concatenate((locAngle_last[..., np.newaxis],
+                                                locAngle), axis=-1), axis=-1)
+
+    locFreq = (locDbl_base_freq
+               + np.diff(locAngle_unwrap, axis=-1) / (2 * pi * locDbl_report_period))
+
+    if locInt_reports > 0:
+
+        locFreq[..., 0] = np.where(np.isnan(locState['angle']), np.nan, locFreq[..., 0])
+
+    else:
+
+        pass
+
+    locRocof = np.diff(np.concatenate((locState['freq'][..., np.newaxis],
+                                       locFreq), axis=-1), axis=-1) / locDbl_report_period
+
+    if locInt_reports > 0:
+
+        locState = {'index': locState['index'] + locInt_reports * locInt_step,
+                    'buffer': locBuffer[..., locInt_reports * locInt_step:].copy(),
+                    'angle': locAngle[..., -1].copy(),
+                    'freq': locFreq[..., -1].copy()}
+
+    else:
+
+        locState = dict(locState, buffer=locBuffer)
+
+    return locTime, locMag, locAngle, locFreq, locRocof, locState
+
+# =============================================================================
+# </Function: synchrophasor (PMU) style phasor and frequency estimation>
+# =============================================================================
+
+# =============================================================================
+# <Function: batched Kalman filter tracking of the rotating vector>
+# =============================================================================
+
+def cal_kalman_dq(theta, alpha, beta, locList_orders=(1,), locDbl_q=1e-4,
+                  locDbl_r=1e-2, locState=None):
+    """
+    .. _cal_kalman_dq :
+
+    Linear Kalman filter tracking the *d*, *q* components of the Clarke vector
+    in one or more rotating frames at the same time.
+
+    This is an alternative to the fixed Park rotation of gsyDqLib.cal_ABDQ and
+    gsyTransforms.cal_park. The Clarke vector is modelled as a sum of rotating
+    vectors, one per frame (PLL order):
+
+    .. code:: python
+
+        α + jβ = Σ (d_k + j q_k) * exp(j * order_k * θ) + noise
+
+    The states are the *d*, *q* of all frames, modelled as random walks, so
+    each frame only picks up its own rotating component and the other frames
+    (e.g., the negative sequence or harmonics) do not leak into it as ripple.
+
+    All channels are updated together by stacked (channels, n, n) matrix
+    operations, so the cost per sample is the same few NumPy calls no matter
+    how many channels are tracked.
+
+    Parameters
+    ----------
+    theta : array
+        1d array of the base angle, :math:`θ = 2πft`, one per sample.
+
+    alpha, beta : array
+        Clarke components. The last axis is the time axis (same length as
+        theta). Any leading axes are independent channels.
+
+    locList_orders : list of float
+        The PLL orders of the tracked frames, e.g., (1, -1, -5, 7). The sign
+        gives the rotational direction, same as cal_ABDQ. Default is (1,).
+
+    locDbl_q : float or array
+        Process noise variance of the *d*, *q* states per sample. Larger values
+        track faster but filter less. May be an array with one value per
+        channel.
+
+    locDbl_r : float or array
+        Measurement noise variance of *α*, *β*. May be an array with one
+        value per channel.
+
+    locState : dict or None
+        The state returned by the previous call. None starts a new stream with
+        zero *d*, *q* and unity covariance.
+
+    Returns
+    -------
+    d, q : array
+        Tracked components of shape (len(locList_orders),) + alpha.shape.
+
+    locState : dict
+        The state (estimates and covariances) to be passed into the next call.
+
+    Examples
+    --------
+    .. code:: python
+
+        # positive and negative sequences of 300 feeders, alpha is (300, n)
+        d, q, state = cal_kalman_dq(theta, alpha, beta, (1, -1))
+
+        d_pos, q_pos = d[0], q[0]
+    """
+
+    alpha, beta = np.broadcast_arrays(np.asarray(alpha, dtype=float),
+                                      np.asarray(beta, dtype=float))
+
+    theta = np.asarray(theta, dtype=float)
+
+    if theta.shape != alpha.shape[-1:]:
+
+        raise ValueError('Element length mismatch. '
+                         + 'The length of theta, alpha and beta must be all the same')
+
+    locShape = alpha.shape[:-1]
+
+    locInt_samples = alpha.shape[-1]
+
+    locOrders = np.asarray(locList_orders, dtype=float).reshape(-1)
+
+    locInt_frames = len(locOrders)
+
+    locInt_states = 2 * locInt_frames
+
+    # channels flattened into one batch axis
+    locZ = np.stack((alpha.reshape(-1, locInt_samples),
+                     beta.reshape(-1, locInt_samples)), axis=1)
+
+    locInt_channels = locZ.shape[0]
+
+    locQ = np.broadcast_to(np.asarray(locDbl_q, dtype=float).reshape(-1),
+                           (locInt_channels,)).reshape(-1, 1, 1) * np.eye(locInt_states)
+
+    locR = np.broadcast_to(np.asarray(locDbl_r, dtype=float).reshape(-1),
+                           (locInt_channels,)).reshape(-1, 1, 1) * np.eye(2)
+
+    if locState is None:
+
+        locX = np.zeros((locInt_channels, locInt_states))
+
+        locP = np.tile(np.eye(locInt_states), (locInt_channels, 1, 1))
+
+    else:
+
+        locX = locState['x'].reshape(locInt_channels, locInt_states).copy()
+
+        locP = locState['P'].reshape(locInt_channels, locInt_states, locInt_states).copy()
+
+    # measurement matrices of all samples, (samples, 2, states), shared by the channels
+    locCos = cos(np.outer(theta, locOrders))
+
+    locSin = sin(np.outer(theta, locOrders))
+
+    locH = np.empty((locInt_samples, 2, locInt_states))
+
+    # α = d cos - q sin, β = d sin + q cos
+    locH[:, 0, 0::2] = locCos
+    locH[:, 0, 1::2] = -locSin
+    locH[:, 1, 0::2] = locSin
+    locH[:, 1, 1::2] = locCos
+
+    locEstimate = np.empty((locInt_channels, locInt_states, locInt_samples))
+
+    # for-loop start
+    for k in range(locInt_samples):
+
+        H = locH[k]
+
+        # predict, random walk
+        locP += locQ
+
+        # innovation covariance and Kalman gain, (channels, 2, 2), (channels, states, 2)
+        locPHt = locP @ H.T
+
+        locS = H @ locPHt + locR
+
+        locK = locPHt @ np.linalg.inv(locS)
+
+        # update
+        locInnovation = locZ[:, :, k] - locX @ H.T
+
+        locX += (locK @ locInnovation[:, :, np.newaxis])[:, :, 0]
+
+        locP -= locK @ (H @ locP)
+
+        locEstimate[:, :, k] = locX
+    # for-loop end
+
+    d = np.moveaxis(locEstimate[:, 0::2], 1, 0).reshape((locInt_frames,) + alpha.shape)
+
+    q = np.moveaxis(locEstimate[:, 1::2], 1, 0).reshape((locInt_frames,) + alpha.shape)
+
+    locState = {'x': locX.reshape(locShape + (locInt_states,)),
+                'P': locP.reshape(locShape + (locInt_states, locInt_states))}
+
+    return d, q, locState
+
+# =============================================================================
+# </Function: batched Kalman filter tracking of the rotating vector>
+# =============================================================================
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the instantaneous power of voltage and current pairs.
+
+The voltages and the currents are run through the fused Clarke and Park
+Transforms (gsyTransforms.cal_clarke_park) in one call and the instantaneous
+powers are calculated from the *d*, *q*, zero components.
+
+With the amplitude invariant transforms, the powers are:
+
+.. math::
+    p = \\frac{3}{2} (v_{d} i_{d} + v_{q} i_{q})
+
+.. math::
+    q = \\frac{3}{2} (v_{q} i_{d} - v_{d} i_{q})
+
+.. math::
+    p_{0} = 3 v_{0} i_{0}
+
+*p* and *q* do not depend on the PLL angle. *q* is positive when the current
+lags the voltage (inductive).
+
+All functions are vectorised over channels, e.g., all bays of a substation.
+The last axis of an input array is always the time (sample) axis.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_power_
+* stream_power_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from gsyTransforms import cal_clarke_park
+from gsyStream import make_theta
+
+# =============================================================================
+# <Function: calculate the instantaneous powers>
+# =============================================================================
+
+def cal_power(theta, va, vb, vc, ia, ib, ic):
+    """
+    .. _cal_power :
+
+    Instantaneous active, reactive and zero sequence powers of voltage and
+    current pairs.
+
+    The voltages and the currents are stacked and transformed by one call of
+    gsyTransforms.cal_clarke_park.
+
+    Parameters
+    ----------
+    theta : array
+        1d array of the PLL angle, one per sample.
+
+    va, vb, vc : array
+        Phase voltages. The last axis is the time axis, any leading axes are
+        channels.
+
+    ia, ib, ic : array
+        Phase currents, same shape as the voltages.
+
+    Returns
+    -------
+    p : array
+        Instantaneous active power.
+
+    q : array
+        Instantaneous reactive power.
+
+    p0 : array
+        Instantaneous zero sequence power.
+
+    Examples
+    --------
+    .. code:: python
+
+        p, q, p0 = cal_power(theta, va, vb, vc, ia, ib, ic)
+    """
+
+    # (voltage/current, channels..., samples)
+    a = np.stack(np.broadcast_arrays(va, ia))
+    b = np.stack(np.broadcast_arrays(vb, ib))
+    c = np.stack(np.broadcast_arrays(vc, ic))
+
+    alpha, beta, d, q, zero = cal_clarke_park(theta, a, b, c)
+
+    p = 3/2 * (d[0] * d[1] + q[0] * q[1])
+
+    q = 3/2 * (q[0] * d[1] - d[0] * q[1])
+
+    p0 = 3 * zero[0] * zero[1]
+
+    return p, q, p0
+
+# =============================================================================
+# </Function: calculate the instantaneous powers>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream chunks through the power calculation>
+# =============================================================================
+
+def stream_power(locIter_chunks, locDbl_fs, locDbl_base_freq=50, locDbl_pll_order=1):
+    """
+    .. _stream_power :
+
+    Generator, calculates the instantaneous powers chunk by chunk with a
+    continuous PLL angle (gsyStream.make_theta).
+
+    Parameters
+    ----------
+    locIter_chunks : iterable
+        Yields (va, vb, vc, ia, ib, ic) chunks, e.g., (bays, samples) each.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locDbl_pll_order : float
+        The PLL order, same as gsyDqLib.cal_ABDQ.
+
+    Yields
+    ------
+    locTime, p, q, p0 : array
+        One tuple per chunk. See cal_power_.
+
+    Examples
+    --------
+    .. code:: python
+
+        for time, p, q, p0 in stream_power(chunks, 10e3):
+
+            do_something(p, q)
+    """
+
+    locInt_start = 0
+
+    for va, vb, vc, ia, ib, ic in locIter_chunks:
+
+        locInt_samples = np.shape(va)[-1]
+
+        locTime, locTheta = make_theta(locInt_start, locInt_samples, locDbl_fs,
+                                       locDbl_base_freq, locDbl_pll_order)
+
+        p, q, p0 = cal_power(locTheta, va, vb, vc, ia, ib, ic)
+
+        locInt_start += locInt_samples
+
+        yield locTime, p, q, p0
+
+# =============================================================================
+# </Function: stream chunks through the power calculation>
+# =============================================================================
@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for zoomable plots of long signals by a min/max pyramid.
+
+The time axes of gsyDqMain (ax2 and ax3) show one base period. A long
+recording has millions of samples, far more than the pixels of an axis, so
+the samples are decimated into a pyramid of levels (build_pyramid_):
+    |  the raw samples, in memory or in a file on the disk (memory-mapped)
+    |  level 0, the minimum and maximum of every bucket of 'base' samples
+    |  level k, buckets of base * factor^k samples, from level k - 1
+
+A view of any time range (get_pyramid_view_) takes the finest level with at
+most one bucket per pixel, and draws the minimum and the maximum of every
+bucket, i.e., about two points per pixel. The peaks are never lost, unlike
+plain down-sampling. If the range has less than two samples per pixel, the
+raw samples are drawn.
+
+connect_pyramid_ refreshes the lines of an axis on every pan and zoom, and
+plot_pyramid_ makes a figure of α, β and *d*, *q* like ax2 and ax3.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* build_pyramid_
+* connect_pyramid_
+* get_pyramid_view_
+* plot_pyramid_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+# samples per bucket of level 0
+CONST_INT_PYRAMID_BASE = 16
+
+# buckets of level k - 1 per bucket of level k
+CONST_INT_PYRAMID_FACTOR = 4
+
+# colours of the fields, same as gsyDqMain
+CONST_DICT_PYRAMID_COLORS = {'alpha': 'r', 'beta': 'g',
+                             'd': (255/255, 165/255, 0/255),
+                             'q': (204/255, 51/255, 255/255),
+                             'zero': 'b'}
+
+# =============================================================================
+# <Function: build a min/max pyramid>
+# =============================================================================
+
+def build_pyramid(locIter_chunks, locDbl_fs, locInt_base=CONST_INT_PYRAMID_BASE,
+                  locInt_factor=CONST_INT_PYRAMID_FACTOR, locStr_path=None):
+    """
+    .. _build_pyramid :
+
+    Build the min/max pyramid of a stream in one pass. NaN samples are left
+    out of the minimum and maximum.
+
+    Parameters
+    ----------
+    locIter_chunks : iterable
+        Yields dicts of 1d arrays of the same length, one array per field,
+        e.g., {'d': d, 'q': q}, same as gsyIndex.build_event_index.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locInt_base : int
+        Samples per bucket of level 0.
+
+    locInt_factor : int
+        Buckets of a level per bucket of the next level, at least 2.
+
+    locStr_path : str or None
+        File for the raw samples, which are then memory-mapped instead of
+        being held in memory. The file is overwritten.
+
+    Returns
+    -------
+    locDict_pyramid : dict
+        'fields', 'fs', 'samples', 'raw' (samples, fields) array or memmap,
+        and 'levels', a list of dicts of 'bucket' (samples per bucket),
+        'min' and 'max' (fields, buckets), from the finest level.
+
+    Examples
+    --------
+    .. code:: python
+
+        chunks = ({'d': d, 'q': q}
+                  for time, theta, alpha, beta, d, q, zero
+                  in stream_clarke_park(stream, 10e3))
+
+        pyramid = build_pyramid(chunks, 10e3, locStr_path='dq.raw')
+    """
+
+    locInt_base = int(locInt_base)
+
+    locInt_factor = int(locInt_factor)
+
+    if (locInt_base <= 0) or (locInt_factor < 2):
+
+        raise ValueError('The base must be positive and the factor at least 2')
+
+    else:
+
+        pass
+
+    locList_fields = None
+
+    locCarry = None
+
+    locList_raw = []
+
+    locList_min = []
+
+    locList_max = []
+
+    locInt_samples = 0
+
+    locFile = open(locStr_path, 'wb') if locStr_path is not None else None
+
+    try:
+
+        for locDict_chunk in locIter_chunks:
+
+            if locList_fields is None:
+
+                locList_fields = list(locDict_chunk.keys())
+
+                locCarry = np.zeros((len(locList_fields), 0))
+
+            else:
+
+                pass
+
+            locChunk = np.stack([np.asarray(locDict_chunk[x], dtype=float)
+                                 for x in locList_fields])
+
+            locInt_samples += locChunk.shape[-1]
+
+            # raw samples, (samples, fields)
+            if locFile is not None:
+
+                locFile.write(np.ascontiguousarray(locChunk.T).tobytes())
+
+            else:
+
+                locList_raw.append(locChunk.T.copy())
+
+            locX = np.concatenate((locCarry, locChunk), axis=-1)
+
+            locInt_full = locX.shape[-1] // locInt_base
+
+            locBuckets = locX[:, :locInt_full * locInt_base].reshape(
+                len(locList_fields), locInt_full, locInt_base)
+
+            locList_min.append(np.fmin.reduce(locBuckets, axis=-1))
+
+            locList_max.append(np.fmax.reduce(locBuckets, axis=-1))
+
+            locCarry = locX[:, locInt_full * locInt_base:].copy()
+
+    finally:
+
+        if locFile is not None:
+
+            locFile.close()
+
+        else:
+
+            pass
+
+    if locList_fields is None:
+
+        raise ValueError('The stream is empty')
+
+    else:
+
+        pass
+
+    # the incomplete last bucket
+    if locCarry.shape[-1] > 0:
+
+        locList_min.append(np.fmin.reduce(locCarry, axis=-1)[:, np.newaxis])
+
+        locList_max.append(np.fmax.reduce(locCarry, axis=-1)[:, np.newaxis])
+
+    else:
+
+        pass
+
+    if locStr_path is not None:
+
+        locRaw = np.memmap(locStr_path, dtype=float, mode='r',
+                           shape=(locInt_samples, len(locList_fields)))
+
+    else:
+
+        locRaw = np.concatenate(locList_raw, axis=0)
+
+    locList_levels = [{'bucket': locInt_base,
+                       'min': np.concatenate(locList_min, axis=-1),
+                       'max': np.concatenate(locList_max, axis=-1)}]
+
+    # the coarser levels, down to one bucket
+    while locList_levels[-1]['min'].shape[-1] > 1:
+
+        locDict_level = locList_levels[-1]
+
+        locInt_buckets = locDict_level['min'].shape[-1]
+
+        locInt_pad = -locInt_buckets % locInt_factor
+
+        locDict_next = {'bucket': locDict_level['bucket'] * locInt_factor}
+
+        for item, locFunc in (('min', np.fmin), ('max', np.fmax)):
+
+            locValues = np.pad(locDict_level[item], ((0, 0), (0, locInt_pad)),
+                               constant_values=np.nan)
+
+            locDict_next[item] = locFunc.reduce(
+                locValues.reshape(len(locList_fields), -1, locInt_factor), axis=-1)
+
+        locList_levels.append(locDict_next)
+
+    locDict_pyramid = {'fields': locList_fields,
+                       'fs': float(locDbl_fs),
+                       'samples': locInt_samples,
+                       'raw': locRaw,
+                       'levels': locList_levels}
+
+    return locDict_pyramid
+
+# =============================================================================
+# </Function: build a min/max pyramid>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: view of a time range>
+# =============================================================================
+
+def get_pyramid_view(locDict_pyramid, locList_fields, locDbl_start, locDbl_stop,
+                     locInt_pixels):
+    """
+    .. _get_pyramid_view :
+
+    The points to draw a time range of a pyramid on an axis of
+    locInt_pixels pixels, at most about two points per pixel.
+
+    Parameters
+    ----------
+    locDict_pyramid : dict
+        The pyramid from build_pyramid_.
+
+    locList_fields : list of str
+        The fields, e.g., ['d', 'q'].
+
+    locDbl_start, locDbl_stop : float
+        The time range (s, from the first sample).
+
+    locInt_pixels : int
+        Width of the axis in pixels.
+
+    Returns
+    -------
+    locX : array
+        Time of the points (s). Every bucket gives two points at its centre,
+        the minimum and the maximum.
+
+    locDict_y : dict
+        The values of the points, one array per field.
+
+    locInt_level : int
+        The level used, -1 for the raw samples.
+
+    Examples
+    --------
+    .. code:: python
+
+        x, y, level = get_pyramid_view(pyramid, ['d', 'q'], 10, 3610, 800)
+    """
+
+    locDbl_fs = locDict_pyramid['fs']
+
+    locInt_samples = locDict_pyramid['samples']
+
+    locInt_pixels = int(max(1, locInt_pixels))
+
+    locInt_first = int(min(max(0, np.floor(locDbl_start * locDbl_fs)), locInt_samples))
+
+    locInt_stop = int(min(max(0, np.ceil(locDbl_stop * locDbl_fs) + 1), locInt_samples))
+
+    locInt_stop = max(locInt_first, locInt_stop)
+
+    locList_columns = [locDict_pyramid['fields'].index(x) for x in locList_fields]
+
+    if locInt_stop - locInt_first <= 2 * locInt_pixels:
+
+        locX = np.arange(locInt_first, locInt_stop) / locDbl_fs
+
+        locDict_y = {x: np.asarray(locDict_pyramid['raw'][locInt_first:locInt_stop, k])
+                     for x, k in zip(locList_fields, locList_columns)}
+
+        return locX, locDict_y, -1
+
+    else:
+
+        pass
+
+    # the finest level with at most one bucket per pixel
+    for locInt_level, locDict_level in enumerate(locDict_pyramid['levels']):
+
+        locInt_bucket = locDict_level['bucket']
+
+        locInt_j0 = locInt_first // locInt_bucket
+
+        locInt_j1 = -(-locInt_stop // locInt_bucket)
+
+        if locInt_j1 - locInt_j0 <= locInt_pixels:
+
+            break
+
+        else:
+
+            pass
+
+    locX = np.repeat((np.arange(locInt_j0, locInt_j1) + 0.5) * locInt_bucket / locDbl_fs, 2)
+
+    locDict_y = {}
+
+    for x, k in zip(locList_fields, locList_columns):
+
+        locY = np.empty(2 * (locInt_j1 - locInt_j0))
+
+        locY[0::2] = locDict_level['min'][k, locInt_j0:locInt_j1]
+
+        locY[1::2] = locDict_level['max'][k, locInt_j0:locInt_j1]
+
+        locDict_y[x] = locY
+
+    return locX, locDict_y, locInt_level
+
+# =============================================================================
+# </Function: view of a time range>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: refresh the lines of an axis on pan and zoom>
+# =============================================================================
+
+def connect_pyramid(locAx, locDict_lines, locDict_pyramid):
+    """
+    .. _connect_pyramid :
+
+    Draw the lines of an axis from a pyramid, and refresh them whenever the
+    x limits change, e.g., by the pan and zoom tools of matplotlib.
+
+    Parameters
+    ----------
+    locAx : matplotlib axes object
+        The axis.
+
+    locDict_lines : dict
+        matplotlib plot objects of the axis, one per field, e.g.,
+        {'d': line_d, 'q': line_q}.
+
+    locDict_pyramid : dict
+        The pyramid from build_pyramid_.
+
+    Returns
+    -------
+    locInt_cid : int
+        The callback id, for locAx.callbacks.disconnect.
+    """
+
+    locList_fields = list(locDict_lines.keys())
+
+    def refresh(locAx_changed):
+
+        locDbl_start, locDbl_stop = locAx_changed.get_xlim()
+
+        locInt_pixels = int(locAx_changed.get_window_extent().width)
+
+        locX, locDict_y, locInt_level = get_pyramid_view(locDict_pyramid, locList_fields,
+                                                         locDbl_start, locDbl_stop,
+                                                         locInt_pixels)
+
+        for item in locList_fields:
+
+            locDict_lines[item].set_data(locX, locDict_y[item])
+
+    locInt_cid = locAx.callbacks.connect('xlim_changed', refresh)
+
+    refresh(locAx)
+
+    return locInt_cid
+
+# =============================================================================
+# </Function: refresh the lines of an axis on pan and zoom>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: figure of a pyramid>
+# =============================================================================
+
+def plot_pyramid(locDict_pyramid, locStr_title=''):
+    """
+    .. _plot_pyramid :
+
+    Make a zoomable figure of a pyramid, α and β on the upper axis, *d* and
+    *q* on the lower axis (the fields found in the pyramid), like ax2 and
+    ax3 of gsyDqMain. The two axes share the time axis.
+
+    Parameters
+    ----------
+    locDict_pyramid : dict
+        The pyramid from build_pyramid_.
+
+    locStr_title : str
+        Title of the figure.
+
+    Returns
+    -------
+    locFig : matplotlib figure object
+        The figure.
+
+    Examples
+    --------
+    .. code:: python
+
+        fig = plot_pyramid(pyramid, 'fault.cfg')
+
+        fig.show()
+    """
+
+    # a new figure every time, the same recording can be explored twice
+    locFig, (locAx_ab, locAx_dq) = plt.subplots(2, 1, sharex=True, figsize=(12.8, 7.2), dpi=100)
+
+    if (len(locStr_title) > 0) and (locFig.canvas.manager is not None):
+
+        locFig.canvas.manager.set_window_title(locStr_title)
+
+    else:
+
+        pass
+
+    locFig.suptitle(locStr_title, fontsize=14, fontweight='bold')
+
+    locDbl_duration = max(locDict_pyramid['samples'] - 1, 1) / locDict_pyramid['fs']
+
+    for locAx, locList_fields in ((locAx_ab, ['alpha', 'beta']), (locAx_dq, ['d', 'q'])):
+
+        locDict_lines = {}
+
+        for item in locList_fields:
+
+            if item in locDict_pyramid['fields']:
+
+                locDict_lines[item], = locAx.plot([], [], linewidth=1,
+                                                  color=CONST_DICT_PYRAMID_COLORS[item],
+                                                  label='$\\' + item + '$' if len(item) > 1
+                                                  else '$' + item + '$')
+
+            else:
+
+                pass
+
+        locAx.axhline(y=0, color='k', lw=1)
+
+        locAx.grid(True)
+
+        if len(locDict_lines) > 0:
+
+            locAx.legend(loc='upper right')
+
+            locAx.set_xlim([0, locDbl_duration])
+
+            connect_pyramid(locAx, locDict_lines, locDict_pyramid)
+
+            # the y limits of the whole signal, from the coarsest level
+            locList_columns = [locDict_pyramid['fields'].index(x) for x in locDict_lines]
+
+            locDict_top = locDict_pyramid['levels'][-1]
+
+            locDbl_min = np.nanmin(locDict_top['min'][locList_columns])
+
+            locDbl_max = np.nanmax(locDict_top['max'][locList_columns])
+
+            locDbl_margin = 0.05 * max(locDbl_max - locDbl_min, 1e-9)
+
+            locAx.set_ylim([locDbl_min - locDbl_margin, locDbl_max + locDbl_margin])
+
+        else:
+
+            pass
+
+    locAx_dq.set_xlabel(r'Time (s)', fontweight='bold', fontsize=12)
+
+    return locFig
+
+# =============================================================================
+# </Function: figure of a pyramid>
+# =============================================================================
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the real-time replay of recordings.
+
+A recording (COMTRADE .cfg or CSV, see gsyStream.open_recording) is replayed
+at its own sampling rate, or N times faster or slower, e.g., into the
+animation of gsyDqMain.
+
+A background thread reads the recording chunk by chunk
+(gsyStream.stream_recording), runs every chunk through the Clarke and Park
+Transforms of the named variants (gsyVariants.cal_variant_clarke_park, the
+fused gsyTransforms.cal_clarke_park by default) with a continuous PLL angle
+(gsyStream.make_theta), and puts the results into a bounded read-ahead queue.
+The display pulls the samples which are due by the wall clock
+(read_replay_), so it never waits for the disk, and the memory is bounded by
+the queue, whatever the length of the recording.
+
+If the reader falls behind (an under-run), the replay clock is held back
+instead of skipping samples, and the under-runs are counted.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* read_replay_
+* run_replay_reader_
+* start_replay_
+* stop_replay_
+
+Function definitions
+----------------------
+
+"""
+
+import time
+import queue
+import threading
+
+import numpy as np
+
+from gsyStream import open_recording, stream_recording, make_theta
+from gsyVariants import (CONST_STR_VARIANT_CLARKE, CONST_STR_VARIANT_PARK,
+                         cal_variant_clarke_park, get_variant)
+
+# samples per chunk of the reader thread
+CONST_INT_REPLAY_CHUNK = 4096
+
+# chunks in the read-ahead queue
+CONST_INT_REPLAY_BUFFER = 8
+
+# fields of the replayed samples
+CONST_LIST_REPLAY_FIELDS = ['time', 'theta', 'alpha', 'beta', 'd', 'q', 'zero']
+
+# =============================================================================
+# <Function: reader thread of a replay>
+# =============================================================================
+
+def run_replay_reader(locDict_replay):
+    """
+    .. _run_replay_reader :
+
+    Target of the reader thread of start_replay_. Reads the recording chunk
+    by chunk, transforms the chunks and puts them into the read-ahead queue,
+    until the end of the recording or stop_replay_. The end is marked by
+    None in the queue.
+
+    Exceptions are kept in locDict_replay['error'] instead of being raised in
+    the thread.
+
+    Parameters
+    ----------
+    locDict_replay : dict
+        The replay from start_replay_.
+    """
+
+    locQueue = locDict_replay['queue']
+
+    locEvent_stop = locDict_replay['stop']
+
+    locInt_start = 0
+
+    try:
+
+        for locTime, a, b, c in stream_recording(locDict_replay['source'],
+                                                 locDict_replay['chunk']):
+
+            locTime, locTheta = make_theta(locInt_start, len(a), locDict_replay['fs'],
+                                           locDict_replay['base_freq'],
+                                           locDict_replay['pll_order'])
+
+            alpha, beta, d, q, zero = cal_variant_clarke_park(locTheta, a, b, c,
+                                                              locDict_replay['clarke'],
+                                                              locDict_replay['park'])
+
+            if locDict_replay['scale'] is None:
+
+                # per unit of the first chunk's peak, the scale of the visualiser
+                locDbl_peak = np.nanmax(np.hypot(alpha, beta), initial=0)
+
+                locDict_replay['scale'] = locDbl_peak if locDbl_peak > 0 else 1
+
+            else:
+
+                pass
+
+            locDbl_scale = locDict_replay['scale']
+
+            locChunk = dict(zip(CONST_LIST_REPLAY_FIELDS,
+                                (locTime, locTheta,
+                                 alpha / locDbl_scale, beta / locDbl_scale,
+                                 d / locDbl_scale, q / locDbl_scale, zero / locDbl_scale)))
+
+            # a full queue blocks the reader, which bounds the memory
+            while not locEvent_stop.is_set():
+
+                try:
+
+                    locQueue.put(locChunk, timeout=0.1)
+
+                    break
+
+                except queue.Full:
+
+                    continue
+
+            if locEvent_stop.is_set():
+
+                return None
+
+            else:
+
+                pass
+
+            locInt_start += len(a)
+
+    except Exception as locError:
+
+        locDict_replay['error'] = type(locError).__name__ + ': ' + str(locError)
+
+    while not locEvent_stop.is_set():
+
+        try:
+
+            locQueue.put(None, timeout=0.1)
+
+            break
+
+        except queue.Full:
+
+            continue
+
+# =============================================================================
+# </Function: reader thread of a replay>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: start a replay>
+# =============================================================================
+
+def start_replay(locStr_path, locDbl_speed=1, locDbl_pll_order=1,
+                 locInt_chunk=CONST_INT_REPLAY_CHUNK, locInt_buffer=CONST_INT_REPLAY_BUFFER,
+                 locStr_unit='V', locDbl_base_freq=50, locDbl_scale=None,
+                 locStr_clarke=CONST_STR_VARIANT_CLARKE, locStr_park=CONST_STR_VARIANT_PARK):
+    """
+    .. _start_replay :
+
+    Open a recording and start the reader thread of its replay.
+
+    Parameters
+    ----------
+    locStr_path : str
+        Path of the .cfg or .csv file, see gsyStream.open_recording.
+
+    locDbl_speed : float
+        Replay speed, 1 is real time, 10 is 10 times faster.
+
+    locDbl_pll_order : float
+        The PLL order of the Park Transform.
+
+    locInt_chunk : int
+        Samples per chunk of the reader thread.
+
+    locInt_buffer : int
+        Chunks in the read-ahead queue. The memory is about
+        locInt_chunk * locInt_buffer * 7 * 8 bytes.
+
+    locStr_unit : str
+        Unit of the COMTRADE channels, 'V' or 'A'.
+
+    locDbl_base_freq : float
+        The base frequency of CSV files.
+
+    locDbl_scale : float or None
+        The α, β, *d*, *q* and zero outputs are divided by this value. None
+        uses the peak of the space vector in the first chunk, i.e., per unit
+        values for the visualiser.
+
+    locStr_clarke, locStr_park : str
+        The names of the Clarke and the Park variants, see gsyVariants.
+
+    Returns
+    -------
+    locDict_replay : dict
+        The replay, to be passed into read_replay_ and stop_replay_. The keys
+        of interest are 'kind' ('replay'), 'fs', 'base_freq', 'speed', 'position' (samples
+        delivered so far), 'underruns', 'done' (True after the last sample)
+        and 'error' (None, or the exception of the reader thread).
+
+    Examples
+    --------
+    .. code:: python
+
+        replay = start_replay('fault.cfg', 2)
+
+        while not replay['done']:
+
+            samples = read_replay(replay)
+
+            draw(samples['time'], samples['d'], samples['q'])
+
+        stop_replay(replay)
+    """
+
+    if locDbl_speed <= 0:
+
+        raise ValueError('The replay speed must be positive')
+
+    else:
+
+        pass
+
+    # unknown names raise before the recording is opened
+    get_variant(locStr_clarke, 'clarke')
+
+    get_variant(locStr_park, 'park')
+
+    locDict_source = open_recording(locStr_path, locStr_unit, locDbl_base_freq)
+
+    locDict_replay = {'kind': 'replay',
+                      'source': locDict_source,
+                      'fs': locDict_source['fs'],
+                      'base_freq': locDict_source['base_freq'],
+                      'pll_order': locDbl_pll_order,
+                      'clarke': locStr_clarke,
+                      'park': locStr_park,
+                      'speed': float(locDbl_speed),
+                      'chunk': int(max(1, locInt_chunk)),
+                      'scale': locDbl_scale,
+                      'queue': queue.Queue(maxsize=int(max(1, locInt_buffer))),
+                      'stop': threading.Event(),
+                      'pending': None,
+                      'clock': None,
+                      'position': 0,
+                      'underruns': 0,
+                      'done': False,
+                      'error': None}
+
+    locDict_replay['thread'] = threading.Thread(target=run_replay_reader,
+                                                args=(locDict_replay,), daemon=True)
+
+    locDict_replay['thread'].start()
+
+    return locDict_replay
+
+# =============================================================================
+# </Function: start a replay>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: read the due samples of a replay>
+# =============================================================================
+
+def read_replay(locDict_replay, locDbl_now=None):
+    """
+    .. _read_replay :
+
+    Read the samples of a replay which are due by the wall clock. The clock
+    starts at the first call. Never blocks.
+
+    If the read-ahead queue runs dry before the due position, an under-run is
+    counted and the clock is held back to the samples delivered, so the
+    replay continues without a gap.
+
+    Parameters
+    ----------
+    locDict_replay : dict
+        The replay from start_replay_.
+
+    locDbl_now : float or None
+        The wall clock (s), None uses time.perf_counter().
+
+    Returns
+    -------
+    locDict_samples : dict
+        Arrays of CONST_LIST_REPLAY_FIELDS, the samples due since the last
+        call (may be empty).
+    """
+
+    if locDbl_now is None:
+
+        locDbl_now = time.perf_counter()
+
+    else:
+
+        pass
+
+    if locDict_replay['clock'] is None:
+
+        locDict_replay['clock'] = locDbl_now
+
+    else:
+
+        pass
+
+    locDbl_rate = locDict_replay['fs'] * locDict_replay['speed']
+
+    # samples due since the start of the clock
+    locInt_due = int((locDbl_now - locDict_replay['clock']) * locDbl_rate)
+
+    locList_chunks = []
+
+    locInt_position = locDict_replay['position']
+
+    while (locInt_position < locInt_due) and (locDict_replay['done'] == False):
+
+        if locDict_replay['pending'] is None:
+
+            try:
+
+                locChunk = locDict_replay['queue'].get_nowait()
+
+            except queue.Empty:
+
+                locDict_replay['underruns'] += 1
+
+                # hold the clock back, the missing samples are not skipped
+                locDict_replay['clock'] = locDbl_now - locInt_position / locDbl_rate
+
+                break
+
+            if locChunk is None:
+
+                locDict_replay['done'] = True
+
+                break
+
+            else:
+
+                locDict_replay['pending'] = locChunk
+
+        else:
+
+            pass
+
+        locChunk = locDict_replay['pending']
+
+        locInt_take = min(locInt_due - locInt_position, len(locChunk['time']))
+
+        locList_chunks.append({x: y[:locInt_take] for x, y in locChunk.items()})
+
+        if locInt_take < len(locChunk['time']):
+
+            locDict_replay['pending'] = {x: y[locInt_take:] for x, y in locChunk.items()}
+
+        else:
+
+            locDict_replay['pending'] = None
+
+        locInt_position += locInt_take
+
+    locDict_replay['position'] = locInt_position
+
+    locDict_samples = {x: np.concatenate([y[x] for y in locList_chunks] + [np.zeros(0)])
+                       for x in CONST_LIST_REPLAY_FIELDS}
+
+    return locDict_samples
+
+# =============================================================================
+# </Function: read the due samples of a replay>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stop a replay>
+# =============================================================================
+
+def stop_replay(locDict_replay, locDbl_timeout=1):
+    """
+    .. _stop_replay :
+
+    Stop the reader thread of a replay and release its read-ahead queue.
+
+    Parameters
+    ----------
+    locDict_replay : dict
+        The replay from start_replay_.
+
+    locDbl_timeout : float
+        Seconds to wait for the reader thread.
+    """
+
+    locDict_replay['stop'].set()
+
+    locDict_replay['thread'].join(locDbl_timeout)
+
+    # release the buffered chunks
+    while True:
+
+        try:
+
+            locDict_replay['queue'].get_nowait()
+
+        except queue.Empty:
+
+            break
+
+    locDict_replay['pending'] = None
+
+    locDict_replay['done'] = True
+
+# =============================================================================
+# </Function: stop a replay>
+# =============================================================================
@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the automatic selection of the samples per base period.
+
+The curves of gsyDqMain are straight lines between samples. Too few samples
+for the harmonic order and the curves are badly cut, e.g., the 25th harmonic
+with 150 samples. Too many and the work is wasted, e.g., the fundamental
+with 2000 samples.
+
+The geometric error is the largest distance between the straight lines and
+the true curves of α, β, *d* and *q*, in per unit of the input amplitude.
+Every curve is a sum of sines, e.g., *d* and *q* have the orders
+:math:`|h - p|` and :math:`|h + p|`. Between uniform samples :math:`φ` of
+the base period apart, a sine of amplitude *a* and order *m* is cut by at
+most :math:`a(1 - cos(mφ/2))`, so the error of uniform samples is known
+without calculating the curves (cal_sampling_error_), and the minimum
+number of samples is found directly (find_sample_count_).
+
+A non-uniform schedule (find_sample_schedule_) places the samples by the
+curvature, i.e., the density of samples follows the square root of the
+second derivative of the curves, the best for straight lines between
+samples. The schedule is passed into gsyDqLib.cal_ABDQ (locSchedule). Its
+error is measured against a fine grid (cal_geometric_error_).
+
+The Clarke components are of the three-phase inputs of gsyDqLib.cal_ABDQ.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_geometric_error_
+* cal_sample_schedule_
+* cal_sampling_error_
+* find_sample_count_
+* find_sample_schedule_
+* parse_sample_count_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from numpy import pi
+
+from gsyDqLib import cal_ABDQ, cal_DQ_frames
+
+# the default geometric error, per unit of the input amplitude
+CONST_DBL_SAMPLING_TOLERANCE = 0.01
+
+# the range of the samples per base period
+CONST_INT_SAMPLING_MIN = 16
+
+CONST_INT_SAMPLING_MAX = 20000
+
+# the samples of the fine grid of cal_geometric_error and cal_sample_schedule
+CONST_INT_SAMPLING_FINE = 8192
+
+# =============================================================================
+# <Function: geometric error of uniform samples>
+# =============================================================================
+
+def cal_sampling_error(locSamples, locDbl_harmonic_order, locList_pll_orders):
+    """
+    .. _cal_sampling_error :
+
+    The largest geometric error of α, β, *d* and *q* between uniform samples,
+    from the orders and the amplitudes of their sines.
+
+    Parameters
+    ----------
+    locSamples : int or array
+        Samples per base period, the end point included, same as
+        gsyDqLib.cal_ABDQ.
+
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders, e.g., the PLL order and the extra PLL orders of
+        gsyDqMain.
+
+    Returns
+    -------
+    locError : float or array
+        The error (per unit) of every number of samples.
+
+    Examples
+    --------
+    .. code:: python
+
+        # 0.136, badly cut
+        cal_sampling_error(150, 25, [1])
+    """
+
+    locDbl_harmonic_order = abs(locDbl_harmonic_order)
+
+    # amplitudes of α and β, same as cal_ABDQ, e.g., 1 and 1 for positive sequences
+    locDbl_alpha = 2/3 * (1 - np.cos(locDbl_harmonic_order * 2/3 * pi))
+
+    locDbl_beta = 2 * np.sqrt(3)/3 * np.sin(locDbl_harmonic_order * 2/3 * pi)
+
+    # (amplitudes, orders) of the sines of every curve
+    locList_curves = [([abs(locDbl_alpha)], [locDbl_harmonic_order]),
+                      ([abs(locDbl_beta)], [locDbl_harmonic_order])]
+
+    for item in locList_pll_orders:
+
+        locList_curves.append(([abs(locDbl_alpha + locDbl_beta) / 2,
+                                abs(locDbl_alpha - locDbl_beta) / 2],
+                               [abs(locDbl_harmonic_order - item),
+                                abs(locDbl_harmonic_order + item)]))
+
+    # the angle of the base period between samples
+    locPhi = 2 * pi / (np.maximum(np.asarray(locSamples, dtype=float), 2) - 1)
+
+    locError = np.zeros_like(locPhi)
+
+    for locList_amplitudes, locList_orders in locList_curves:
+
+        locCurve = sum(a * (1 - np.cos(np.minimum(m * locPhi / 2, pi)))
+                       for a, m in zip(locList_amplitudes, locList_orders))
+
+        locError = np.maximum(locError, locCurve)
+
+    return locError
+
+# =============================================================================
+# </Function: geometric error of uniform samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: minimum number of uniform samples>
+# =============================================================================
+
+def find_sample_count(locDbl_harmonic_order, locList_pll_orders,
+                      locDbl_tolerance=CONST_DBL_SAMPLING_TOLERANCE,
+                      locInt_min=CONST_INT_SAMPLING_MIN, locInt_max=CONST_INT_SAMPLING_MAX):
+    """
+    .. _find_sample_count :
+
+    The minimum number of uniform samples per base period whose geometric
+    error is within the tolerance, see cal_sampling_error_.
+
+    Parameters
+    ----------
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders.
+
+    locDbl_tolerance : float
+        The geometric error (per unit), e.g., 0.01 is 1% of the amplitude.
+
+    locInt_min, locInt_max : int
+        The range of the samples. locInt_max is returned if the tolerance
+        cannot be met.
+
+    Returns
+    -------
+    locInt_samples : int
+        Samples per base period, to be passed into gsyDqLib.cal_ABDQ.
+
+    Examples
+    --------
+    .. code:: python
+
+        # 556, and 24 for the fundamental
+        int_samples = find_sample_count(25, [1])
+    """
+
+    if locDbl_tolerance <= 0:
+
+        raise ValueError('The tolerance must be positive')
+
+    else:
+
+        pass
+
+    locSamples = np.arange(max(int(locInt_min), 2), max(int(locInt_max), int(locInt_min), 2) + 1)
+
+    locMeet = cal_sampling_error(locSamples, locDbl_harmonic_order,
+                                 locList_pll_orders) <= locDbl_tolerance
+
+    if np.any(locMeet):
+
+        locInt_samples = int(locSamples[np.argmax(locMeet)])
+
+    else:
+
+        locInt_samples = int(locSamples[-1])
+
+    return locInt_samples
+
+# =============================================================================
+# </Function: minimum number of uniform samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: measured geometric error>
+# =============================================================================
+
+def cal_geometric_error(locSchedule, locDbl_harmonic_order, locList_pll_orders,
+                        locInt_fine=CONST_INT_SAMPLING_FINE):
+    """
+    .. _cal_geometric_error :
+
+    The largest geometric error of α, β, *d* and *q* of any schedule of
+    samples, measured against the curves on a fine grid.
+
+    Parameters
+    ----------
+    locSchedule : array
+        The sample times as fractions of the base period, from 0 to 1,
+        increasing.
+
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders.
+
+    locInt_fine : int
+        Samples of the fine grid, at least 8 times the samples of the
+        schedule are used.
+
+    Returns
+    -------
+    locDbl_error : float
+        The error (per unit).
+    """
+
+    locSchedule = np.asarray(locSchedule, dtype=float)
+
+    locFine = np.linspace(0, 1, max(int(locInt_fine), 8 * len(locSchedule)))
+
+    locList_curves = []
+
+    for locX in (locSchedule, locFine):
+
+        (locTime, locTheta,
+         locAlpha, locBeta) = cal_ABDQ(len(locX), 1, locDbl_harmonic_order, 0,
+                                       locSchedule=locX)[:4]
+
+        locD_frames, locQ_frames = cal_DQ_frames(locTheta, locAlpha, locBeta,
+                                                 locList_pll_orders)
+
+        locList_curves.append(np.vstack((locAlpha, locBeta, locD_frames, locQ_frames)))
+
+    locSampled, locTrue = locList_curves
+
+    locDbl_error = max(np.max(np.abs(np.interp(locFine, locSchedule, x) - y))
+                       for x, y in zip(locSampled, locTrue))
+
+    return float(locDbl_error)
+
+# =============================================================================
+# </Function: measured geometric error>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: non-uniform schedule of samples>
+# =============================================================================
+
+def cal_sample_schedule(locInt_samples, locDbl_harmonic_order, locList_pll_orders,
+                        locDbl_floor=0.1, locInt_fine=CONST_INT_SAMPLING_FINE):
+    """
+    .. _cal_sample_schedule :
+
+    A schedule of samples over one base period whose density follows the
+    square root of the curvature (:math:`|y''|`) of α, β, *d* and *q*, the
+    largest of all curves. The first and the last samples are at 0 and 1.
+
+    Parameters
+    ----------
+    locInt_samples : int
+        The number of samples.
+
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders.
+
+    locDbl_floor : float
+        The lowest density as a fraction of the mean density, so straight
+        parts still get samples.
+
+    locInt_fine : int
+        Samples of the fine grid of the curvature.
+
+    Returns
+    -------
+    locSchedule : array
+        The sample times as fractions of the base period, to be passed into
+        gsyDqLib.cal_ABDQ (locSchedule).
+    """
+
+    locFine = np.linspace(0, 1, max(int(locInt_fine), 8 * int(locInt_samples)))
+
+    (locTime, locTheta,
+     locAlpha, locBeta) = cal_ABDQ(len(locFine), 1, locDbl_harmonic_order, 0,
+                                   locSchedule=locFine)[:4]
+
+    locD_frames, locQ_frames = cal_DQ_frames(locTheta, locAlpha, locBeta, locList_pll_orders)
+
+    locCurves = np.vstack((locAlpha, locBeta, locD_frames, locQ_frames))
+
+    locCurvature = np.abs(np.gradient(np.gradient(locCurves, locFine, axis=-1),
+                                      locFine, axis=-1))
+
+    locDensity = np.sqrt(np.max(locCurvature, axis=0))
+
+    locDensity = np.maximum(locDensity, locDbl_floor * np.mean(locDensity) + 1e-12)
+
+    # invert the cumulative density, equal shares of density between samples
+    locCumulative = np.concatenate(([0], np.cumsum((locDensity[1:] + locDensity[:-1]) / 2
+                                                   * np.diff(locFine))))
+
+    locSchedule = np.interp(np.linspace(0, locCumulative[-1], int(locInt_samples)),
+                            locCumulative, locFine)
+
+    return locSchedule
+
+# =============================================================================
+# </Function: non-uniform schedule of samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: minimum non-uniform schedule>
+# =============================================================================
+
+def find_sample_schedule(locDbl_harmonic_order, locList_pll_orders,
+                         locDbl_tolerance=CONST_DBL_SAMPLING_TOLERANCE,
+                         locInt_min=CONST_INT_SAMPLING_MIN, locInt_max=CONST_INT_SAMPLING_MAX):
+    """
+    .. _find_sample_schedule :
+
+    The non-uniform schedule (cal_sample_schedule_) of the fewest samples
+    whose measured geometric error (cal_geometric_error_) is within the
+    tolerance, by bisection up to the uniform count of find_sample_count_.
+    The uniform samples are returned if no schedule of fewer samples meets
+    the tolerance.
+
+    Parameters
+    ----------
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders.
+
+    locDbl_tolerance : float
+        The geometric error (per unit).
+
+    locInt_min, locInt_max : int
+        The range of the samples.
+
+    Returns
+    -------
+    locSchedule : array
+        The sample times as fractions of the base period.
+
+    Examples
+    --------
+    .. code:: python
+
+        schedule = find_sample_schedule(2.5, [1])
+
+        results = cal_ABDQ(len(schedule), 50, 2.5, 1, locSchedule=schedule)
+    """
+
+    locInt_uniform = find_sample_count(locDbl_harmonic_order, locList_pll_orders,
+                                       locDbl_tolerance, locInt_min, locInt_max)
+
+    locSchedule = np.linspace(0, 1, locInt_uniform)
+
+    locInt_low = max(int(locInt_min), 2) - 1
+
+    locInt_high = locInt_uniform
+
+    # the fewest samples meeting the tolerance are in (low, high]
+    while locInt_high - locInt_low > 1:
+
+        locInt_mid = (locInt_low + locInt_high) // 2
+
+        locCandidate = cal_sample_schedule(locInt_mid, locDbl_harmonic_order,
+                                           locList_pll_orders)
+
+        if cal_geometric_error(locCandidate, locDbl_harmonic_order,
+                               locList_pll_orders) <= locDbl_tolerance:
+
+            locInt_high = locInt_mid
+
+            locSchedule = locCandidate
+
+        else:
+
+            locInt_low = locInt_mid
+
+    return locSchedule
+
+# =============================================================================
+# </Function: minimum non-uniform schedule>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: parse the samples text box>
+# =============================================================================
+
+def parse_sample_count(locStr_samples, locDbl_harmonic_order, locList_pll_orders):
+    """
+    .. _parse_sample_count :
+
+    Parse the text of the samples text box of gsyDqMain. 'auto' takes the
+    minimum uniform samples of find_sample_count_, with the default
+    tolerance, or with the one after it, e.g., 'auto 0.002'.
+
+    Parameters
+    ----------
+    locStr_samples : str
+        The text, e.g., '200', 'auto' or 'auto 0.002'.
+
+    locDbl_harmonic_order : float
+        The order of the input harmonic.
+
+    locList_pll_orders : list of float
+        The PLL orders.
+
+    Returns
+    -------
+    locInt_samples : int
+        Samples per base period.
+    """
+
+    locList_words = locStr_samples.strip().lower().split()
+
+    if (len(locList_words) > 0) and (locList_words[0] == 'auto'):
+
+        if len(locList_words) > 2:
+
+            raise ValueError('Too many words : ' + locStr_samples)
+
+        else:
+
+            pass
+
+        locDbl_tolerance = (float(locList_words[1]) if len(locList_words) == 2
+                            else CONST_DBL_SAMPLING_TOLERANCE)
+
+        locInt_samples = find_sample_count(locDbl_harmonic_order, locList_pll_orders,
+                                           locDbl_tolerance)
+
+    else:
+
+        locInt_samples = abs(int(locStr_samples))
+
+    return locInt_samples
+
+# =============================================================================
+# </Function: parse the samples text box>
+# =============================================================================
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for synthesising three-phase disturbance scenarios.
+
+gsyDqLib.cal_ABDQ makes a steady sinusoid. A scenario is a sequence of time
+segments, every segment has its own amplitudes (sags, swells, imbalance),
+phase jump, frequency, harmonics and noise, e.g.:
+
+.. code:: python
+
+    scenario = make_scenario([{'duration': 0.2},
+                              {'duration': 0.1, 'amplitude': (0.5, 0.8, 0.8),
+                               'phase_jump': -0.3},
+                              {'duration': 0.5, 'freq': 49.5,
+                               'harmonics': [(5, 0.05), (7, 0.03)],
+                               'noise': 0.01}],
+                             locDbl_fs=10e3, locInt_seed=1)
+
+The waveforms are generated for any range of samples on request
+(gen_scenario_), vectorised per segment, so long scenarios are generated
+chunk by chunk and are never held in memory at once. The phase at the start of
+every segment is calculated in advance and the random numbers are drawn per
+fixed block of samples from a generator seeded by (seed, block), so the
+results do not depend on the chunk size and are reproducible from the seed.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* gen_random_blocks_
+* gen_scenario_
+* make_scenario_
+* stream_scenario_
+* stream_scenario_dq_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+
+from numpy import pi
+
+from gsyTransforms import cal_clarke_park
+from gsyStream import make_theta
+
+# samples per block of random numbers
+CONST_INT_NOISE_BLOCK = 4096
+
+# keys of a segment and their defaults
+CONST_DICT_SEGMENT = {'duration': None,
+                      'amplitude': 1.0,
+                      'freq': None,
+                      'phase_jump': 0.0,
+                      'harmonics': (),
+                      'noise': 0.0,
+                      'impulse_rate': 0.0,
+                      'impulse_size': 0.0}
+
+# =============================================================================
+# <Function: make a scenario>
+# =============================================================================
+
+def make_scenario(locList_segments, locDbl_fs, locDbl_base_freq=50, locInt_seed=0):
+    """
+    .. _make_scenario :
+
+    Make a scenario from a list of segments.
+
+    Every segment is a dict with the following keys, all optional except
+    'duration':
+        |  'duration' : length of the segment (s)
+        |  'amplitude' : fundamental amplitude, scalar or (a, b, c), default 1
+        |  'freq' : fundamental frequency (Hz), default the base frequency
+        |  'phase_jump' : phase step (rad) at the start of the segment, which
+        |                 stays for the following segments, default 0
+        |  'harmonics' : list of (order, magnitude) or (order, magnitude,
+        |                phase), balanced harmonics riding on the fundamental
+        |                phase, e.g., the 5th is a negative sequence
+        |  'noise' : standard deviation of the Gaussian noise, default 0
+        |  'impulse_rate' : impulses per second per phase, default 0
+        |  'impulse_size' : magnitude of the impulses (random sign), default 0
+
+    Parameters
+    ----------
+    locList_segments : list of dict
+        The segments, in time order.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locInt_seed : int
+        Seed of the random numbers.
+
+    Returns
+    -------
+    locDict_scenario : dict
+        'fs', 'base_freq', 'seed', 'samples' (total number of samples),
+        'segments' (with the defaults filled in), 'bounds' (first sample of
+        every segment, plus the total) and 'phase0' (fundamental phase at
+        the start of every segment).
+
+    Examples
+    --------
+    .. code:: python
+
+        # 2 cycles nominal, 5 cycles 60% sag, 3 cycles nominal
+        scenario = make_scenario([{'duration': 0.04},
+                                  {'duration': 0.1, 'amplitude': 0.6},
+                                  {'duration': 0.06}], 10e3)
+    """
+
+    if len(locList_segments) == 0:
+
+        raise ValueError('A scenario needs at least one segment')
+
+    else:
+
+        pass
+
+    locList_normalised = []
+
+    for item in locList_segments:
+
+        locList_unknown = [x for x in item if x not in CONST_DICT_SEGMENT]
+
+        if len(locList_unknown) > 0:
+
+            raise ValueError('Unknown segment keys : ' + ', '.join(locList_unknown))
+
+        elif item.get('duration', None) is None:
+
+            raise ValueError('Every segment needs a duration')
+
+        else:
+
+            pass
+
+        locDict_segment = dict(CONST_DICT_SEGMENT)
+
+        locDict_segment.update(item)
+
+        if locDict_segment['freq'] is None:
+
+            locDict_segment['freq'] = locDbl_base_freq
+
+        else:
+
+            pass
+
+        locDict_segment['amplitude'] = np.broadcast_to(
+            np.asarray(locDict_segment['amplitude'], dtype=float), (3,)).copy()
+
+        # (order, magnitude, phase)
+        locDict_segment['harmonics'] = [tuple(x) + (0.0,) * (3 - len(x))
+                                        for x in locDict_segment['harmonics']]
+
+        locList_normalised.append(locDict_segment)
+
+    locDurations = np.array([x['duration'] for x in locList_normalised], dtype=float)
+
+    locBounds = np.concatenate(([0], np.round(np.cumsum(locDurations) * locDbl_fs)))
+
+    locBounds = locBounds.astype(np.int64)
+
+    # fundamental phase at the start of every segment, not wrapped, so that
+    # interharmonics stay continuous
+    locPhase0 = np.zeros(len(locList_normalised))
+
+    locDbl_phase = 0.0
+
+    for k, item in enumerate(locList_normalised):
+
+        locDbl_phase += item['phase_jump']
+
+        locPhase0[k] = locDbl_phase
+
+        locDbl_phase += 2 * pi * item['freq'] * (locBounds[k + 1] - locBounds[k]) / locDbl_fs
+
+    locDict_scenario = {'fs': locDbl_fs,
+                        'base_freq': locDbl_base_freq,
+                        'seed': int(locInt_seed),
+                        'samples': int(locBounds[-1]),
+                        'segments': locList_normalised,
+                        'bounds': locBounds,
+                        'phase0': locPhase0}
+
+    return locDict_scenario
+
+# =============================================================================
+# </Function: make a scenario>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: generate the waveforms of a range of samples>
+# =============================================================================
+
+def gen_scenario(locDict_scenario, locInt_start, locInt_samples):
+    """
+    .. _gen_scenario :
+
+    Generate the three-phase waveforms of the samples locInt_start to
+    locInt_start + locInt_samples - 1 of a scenario. Phase b lags phase a by
+    :math:`2π/3`, phase c leads phase a by :math:`2π/3`.
+
+    Parameters
+    ----------
+    locDict_scenario : dict
+        The scenario from make_scenario_.
+
+    locInt_start : int
+        Index of the first sample.
+
+    locInt_samples : int
+        Number of samples, cut at the end of the scenario.
+
+    Returns
+    -------
+    locTime : array
+        Time of the samples (s).
+
+    a, b, c : array
+        The phase values.
+
+    Examples
+    --------
+    .. code:: python
+
+        time, a, b, c = gen_scenario(scenario, 0, scenario['samples'])
+    """
+
+    locDbl_fs = locDict_scenario['fs']
+
+    locBounds = locDict_scenario['bounds']
+
+    locList_segments = locDict_scenario['segments']
+
+    locInt_start = int(max(0, locInt_start))
+
+    locInt_stop = int(min(locInt_start + max(0, locInt_samples),
+                          locDict_scenario['samples']))
+
+    locInt_stop = max(locInt_stop, locInt_start)
+
+    locIndex = np.arange(locInt_start, locInt_stop)
+
+    locX = np.zeros((3, len(locIndex)))
+
+    # phase shifts of a, b, c
+    locShifts = np.array([0, -2 * pi / 3, 2 * pi / 3])[:, np.newaxis]
+
+    # deterministic part, vectorised per segment
+    for k, item in enumerate(locList_segments):
+
+        locInt_lo = max(locInt_start, locBounds[k])
+
+        locInt_hi = min(locInt_stop, locBounds[k + 1])
+
+        if locInt_lo >= locInt_hi:
+
+            continue
+
+        else:
+
+            pass
+
+        locPhase = (locDict_scenario['phase0'][k]
+                    + 2 * pi * item['freq'] * (np.arange(locInt_lo, locInt_hi)
+                                               - locBounds[k]) / locDbl_fs)
+
+        locPhase = locPhase + locShifts
+
+        locSegment = item['amplitude'][:, np.newaxis] * np.cos(locPhase)
+
+        for locDbl_order, locDbl_mag, locDbl_angle in item['harmonics']:
+
+            locSegment += locDbl_mag * np.cos(locDbl_order * locPhase + locDbl_angle)
+
+        locX[:, locInt_lo - locInt_start:locInt_hi - locInt_start] = locSegment
+
+    # random part, only if any segment has noise
+    if any((x['noise'] > 0) or (x['impulse_rate'] > 0) for x in locList_segments):
+
+        locSegment_index = np.searchsorted(locBounds, locIndex, side='right') - 1
+
+        locNoise = np.array([x['noise'] for x in locList_segments])[locSegment_index]
+
+        locProb = np.array([x['impulse_rate'] / locDbl_fs
+                            for x in locList_segments])[locSegment_index]
+
+        locSize = np.array([x['impulse_size'] for x in locList_segments])[locSegment_index]
+
+        locGauss, locUniform = gen_random_blocks(locDict_scenario['seed'],
+                                                 locInt_start, locInt_stop)
+
+        locX += locNoise * locGauss
+
+        # impulse if u < p, positive if u < p/2
+        locImpulse = np.where(locUniform < locProb / 2, 1.0, -1.0)
+
+        locX += np.where(locUniform < locProb, locImpulse * locSize, 0.0)
+
+    else:
+
+        pass
+
+    locTime = locIndex / locDbl_fs
+
+    a, b, c = locX
+
+    return locTime, a, b, c
+
+# =============================================================================
+# </Function: generate the waveforms of a range of samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: random numbers of a range of samples>
+# =============================================================================
+
+def gen_random_blocks(locInt_seed, locInt_start, locInt_stop):
+    """
+    .. _gen_random_blocks :
+
+    Standard normal and uniform random numbers, (3, samples) each, of the
+    samples locInt_start to locInt_stop - 1.
+
+    The numbers are drawn per block of CONST_INT_NOISE_BLOCK samples from a
+    generator seeded by (locInt_seed, block index), so the same sample always
+    gets the same numbers, whatever the chunks are.
+    """
+
+    locInt_block = CONST_INT_NOISE_BLOCK
+
+    locInt_first = locInt_start // locInt_block
+
+    locInt_last = max(locInt_first, (locInt_stop - 1) // locInt_block)
+
+    locList_gauss = []
+
+    locList_uniform = []
+
+    for k in range(locInt_first, locInt_last + 1):
+
+        locRng = np.random.default_rng([locInt_seed, k])
+
+        locList_gauss.append(locRng.standard_normal((3, locInt_block)))
+
+        locList_uniform.append(locRng.random((3, locInt_block)))
+
+    locInt_offset = locInt_start - locInt_first * locInt_block
+
+    locInt_length = locInt_stop - locInt_start
+
+    locGauss = np.concatenate(locList_gauss, axis=1)[:, locInt_offset:locInt_offset
+                                                      + locInt_length]
+
+    locUniform = np.concatenate(locList_uniform, axis=1)[:, locInt_offset:locInt_offset
+                                                          + locInt_length]
+
+    return locGauss, locUniform
+
+# =============================================================================
+# </Function: random numbers of a range of samples>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream a scenario chunk by chunk>
+# =============================================================================
+
+def stream_scenario(locDict_scenario, locInt_chunk=CONST_INT_NOISE_BLOCK):
+    """
+    .. _stream_scenario :
+
+    Generator, yields (time, a, b, c) of a scenario chunk by chunk, see
+    gen_scenario_.
+
+    Parameters
+    ----------
+    locDict_scenario : dict
+        The scenario from make_scenario_.
+
+    locInt_chunk : int
+        Number of samples per chunk, the last chunk may be shorter.
+    """
+
+    locInt_chunk = int(max(1, locInt_chunk))
+
+    for locInt_start in range(0, locDict_scenario['samples'], locInt_chunk):
+
+        yield gen_scenario(locDict_scenario, locInt_start, locInt_chunk)
+
+# =============================================================================
+# </Function: stream a scenario chunk by chunk>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream a scenario through the Clarke and Park Transforms>
+# =============================================================================
+
+def stream_scenario_dq(locDict_scenario, locInt_chunk=CONST_INT_NOISE_BLOCK,
+                       locDbl_pll_order=1):
+    """
+    .. _stream_scenario_dq :
+
+    Generator, yields the waveforms of a scenario and their Clarke and Park
+    Transforms chunk by chunk.
+
+    The PLL rotates at locDbl_pll_order times the base frequency of the
+    scenario (gsyStream.make_theta), so frequency excursions and phase jumps
+    show up as rotating or stepping *d*, *q*.
+
+    Parameters
+    ----------
+    locDict_scenario : dict
+        The scenario from make_scenario_.
+
+    locInt_chunk : int
+        Number of samples per chunk.
+
+    locDbl_pll_order : float
+        The PLL order, same as gsyDqLib.cal_ABDQ.
+
+    Yields
+    ------
+    locTime, a, b, c, alpha, beta, d, q, zero : array
+        One tuple per chunk.
+
+    Examples
+    --------
+    .. code:: python
+
+        for (time, a, b, c,
+             alpha, beta, d, q, zero) in stream_scenario_dq(scenario, 2000):
+
+            do_something(d, q)
+    """
+
+    locInt_start = 0
+
+    for locTime, a, b, c in stream_scenario(locDict_scenario, locInt_chunk):
+
+        locTime, locTheta = make_theta(locInt_start, len(locTime), locDict_scenario['fs'],
+                                       locDict_scenario['base_freq'], locDbl_pll_order)
+
+        alpha, beta, d, q, zero = cal_clarke_park(locTheta, a, b, c)
+
+        locInt_start += len(locTime)
+
+        yield locTime, a, b, c, alpha, beta, d, q, zero
+
+# =============================================================================
+# </Function: stream a scenario through the Clarke and Park Transforms>
+# =============================================================================
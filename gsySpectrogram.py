@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for streaming spectrograms of the Clarke and Park outputs.
+
+The animation of gsyDqMain shows one base period, which says little about
+interharmonics or transients, whose *d*, *q* spectra change with time. This
+module keeps a short-time Fourier transform (STFT) of α, β, *d*, *q* while
+the samples arrive, e.g., from a replay or a live source:
+    |  the last nfft - hop samples are kept (the overlap), so every new hop
+    |  of samples gives a new column, the past columns are never calculated
+    |  again (push_stft_)
+    |  the columns go into a ring buffer of a fixed number of columns, so the
+    |  memory is bounded however long the stream (get_stft_image_)
+    |  the window is made once and all frames have the same length, so the
+    |  FFT plan cached by NumPy is reused for every column
+
+plot_spectrogram_ makes a figure of one scrolling panel per field, and
+update_spectrogram_ refreshes it after new columns.
+
+The magnitudes are in dB of the amplitude, i.e., 0 dB is a sine of
+amplitude 1 (per unit in gsyDqMain), or a constant of 1 in the DC bin.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* get_stft_image_
+* plot_spectrogram_
+* push_stft_
+* start_stft_
+* update_spectrogram_
+
+Function definitions
+----------------------
+
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from gsyDqLib import date_time_now
+
+# fields of the spectrogram
+CONST_LIST_STFT_FIELDS = ['alpha', 'beta', 'd', 'q']
+
+# columns kept in the ring buffer, i.e., the width of the panels
+CONST_INT_STFT_COLUMNS = 256
+
+# dB of the empty columns and the bottom of the colour scale
+CONST_DBL_STFT_FLOOR = -80
+
+# =============================================================================
+# <Function: start a streaming STFT>
+# =============================================================================
+
+def start_stft(locDbl_fs, locInt_nfft, locInt_hop=None, locList_fields=CONST_LIST_STFT_FIELDS,
+               locInt_columns=CONST_INT_STFT_COLUMNS):
+    """
+    .. _start_stft :
+
+    Start a streaming STFT, to be fed by push_stft_.
+
+    Parameters
+    ----------
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locInt_nfft : int
+        Samples per frame. The frequency resolution is fs / nfft, e.g.,
+        4 base periods give a quarter of the base frequency.
+
+    locInt_hop : int or None
+        Samples between frames, i.e., the time resolution. None is a quarter
+        of locInt_nfft (75% overlap).
+
+    locList_fields : list of str
+        The fields, e.g., ['d', 'q'].
+
+    locInt_columns : int
+        Columns kept in the ring buffer.
+
+    Returns
+    -------
+    locDict_stft : dict
+        The STFT. The keys of interest are 'freqs' (Hz), 'columns_total'
+        (columns calculated so far) and 'samples' (samples pushed so far).
+
+    Examples
+    --------
+    .. code:: python
+
+        stft = start_stft(10e3, 800)
+
+        push_stft(stft, {'alpha': alpha, 'beta': beta, 'd': d, 'q': q})
+
+        image = get_stft_image(stft, 'd')
+    """
+
+    locInt_nfft = int(locInt_nfft)
+
+    locInt_hop = locInt_nfft // 4 if locInt_hop is None else int(locInt_hop)
+
+    if locInt_nfft < 2:
+
+        raise ValueError('The frame must have at least 2 samples')
+
+    else:
+
+        pass
+
+    if (locInt_hop < 1) or (locInt_hop > locInt_nfft):
+
+        raise ValueError('The hop must be from 1 to the frame length')
+
+    else:
+
+        pass
+
+    locInt_bins = locInt_nfft // 2 + 1
+
+    locWindow = np.hanning(locInt_nfft + 1)[:-1]
+
+    # amplitude of a sine, from the sum of the window
+    locGain = np.full(locInt_bins, 2 / np.sum(locWindow))
+
+    # the DC bin, and the Nyquist bin of an even frame, have no negative twin
+    locGain[0] = 1 / np.sum(locWindow)
+
+    if locInt_nfft % 2 == 0:
+
+        locGain[-1] = 1 / np.sum(locWindow)
+
+    else:
+
+        pass
+
+    locDict_stft = {'fs': float(locDbl_fs),
+                    'nfft': locInt_nfft,
+                    'hop': locInt_hop,
+                    'fields': list(locList_fields),
+                    'window': locWindow,
+                    'gain': locGain,
+                    'freqs': np.fft.rfftfreq(locInt_nfft, 1 / float(locDbl_fs)),
+                    'overlap': np.zeros((len(locList_fields), 0)),
+                    'image': np.full((len(locList_fields), locInt_bins, int(locInt_columns)),
+                                     float(CONST_DBL_STFT_FLOOR)),
+                    'columns_total': 0,
+                    'samples': 0,
+                    'start': None}
+
+    return locDict_stft
+
+# =============================================================================
+# </Function: start a streaming STFT>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: push samples into a streaming STFT>
+# =============================================================================
+
+def push_stft(locDict_stft, locDict_samples):
+    """
+    .. _push_stft :
+
+    Push new samples into a streaming STFT. The new frames are transformed in
+    one batch and written into the ring buffer. If there are more new frames
+    than columns in the ring buffer, only the last ones are calculated.
+
+    Parameters
+    ----------
+    locDict_stft : dict
+        The STFT from start_stft_.
+
+    locDict_samples : dict
+        1d arrays of the same length, one per field of the STFT. A 'time'
+        array, if any, sets the time of the first sample.
+
+    Returns
+    -------
+    locInt_new : int
+        The number of new columns.
+    """
+
+    locNew = np.stack([np.asarray(locDict_samples[x], dtype=float)
+                       for x in locDict_stft['fields']])
+
+    if locNew.shape[-1] == 0:
+
+        return 0
+
+    else:
+
+        pass
+
+    if locDict_stft['start'] is None:
+
+        locDict_stft['start'] = (float(locDict_samples['time'][0])
+                                 if 'time' in locDict_samples else 0.0)
+
+    else:
+
+        pass
+
+    locDict_stft['samples'] += locNew.shape[-1]
+
+    locX = np.concatenate((locDict_stft['overlap'], locNew), axis=-1)
+
+    locInt_nfft = locDict_stft['nfft']
+
+    locInt_hop = locDict_stft['hop']
+
+    if locX.shape[-1] >= locInt_nfft:
+
+        locInt_new = (locX.shape[-1] - locInt_nfft) // locInt_hop + 1
+
+    else:
+
+        locInt_new = 0
+
+    if locInt_new > 0:
+
+        locInt_columns = locDict_stft['image'].shape[-1]
+
+        # the frames which would be overwritten are skipped
+        locInt_skip = max(0, locInt_new - locInt_columns)
+
+        locFrames = sliding_window_view(locX, locInt_nfft, axis=-1)
+
+        locFrames = locFrames[:, locInt_skip * locInt_hop::locInt_hop][:, :locInt_new - locInt_skip]
+
+        locSpectrum = np.abs(np.fft.rfft(locFrames * locDict_stft['window'], axis=-1))
+
+        with np.errstate(divide='ignore'):
+
+            locDb = 20 * np.log10(locSpectrum * locDict_stft['gain'])
+
+        # NaN samples, e.g., lost by a live source, stay NaN
+        locDb = np.maximum(locDb, CONST_DBL_STFT_FLOOR)
+
+        locColumn = (locDict_stft['columns_total'] + locInt_skip
+                     + np.arange(locFrames.shape[1])) % locInt_columns
+
+        locDict_stft['image'][:, :, locColumn] = np.swapaxes(locDb, 1, 2)
+
+        locDict_stft['columns_total'] += locInt_new
+
+        locX = locX[:, locInt_new * locInt_hop:]
+
+    else:
+
+        pass
+
+    # at most nfft - 1 samples are left
+    locDict_stft['overlap'] = locX.copy()
+
+    return locInt_new
+
+# =============================================================================
+# </Function: push samples into a streaming STFT>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: image of a streaming STFT>
+# =============================================================================
+
+def get_stft_image(locDict_stft, locStr_field):
+    """
+    .. _get_stft_image :
+
+    The ring buffer of a field, oldest column first.
+
+    Parameters
+    ----------
+    locDict_stft : dict
+        The STFT from start_stft_.
+
+    locStr_field : str
+        The field, e.g., 'd'.
+
+    Returns
+    -------
+    locImage : array
+        (bins, columns), dB.
+
+    locList_extent : list
+        [first time, last time, first frequency, last frequency] of the
+        image, for matplotlib's imshow. The time of a column is the centre
+        of its frame.
+    """
+
+    if locStr_field not in locDict_stft['fields']:
+
+        raise ValueError('Unknown field : ' + str(locStr_field))
+
+    else:
+
+        pass
+
+    locImage = locDict_stft['image'][locDict_stft['fields'].index(locStr_field)]
+
+    locInt_columns = locImage.shape[-1]
+
+    locInt_oldest = locDict_stft['columns_total'] % locInt_columns
+
+    locImage = np.concatenate((locImage[:, locInt_oldest:], locImage[:, :locInt_oldest]), axis=-1)
+
+    locDbl_step = locDict_stft['hop'] / locDict_stft['fs']
+
+    # centre of the frame of the newest column
+    locDbl_last = ((locDict_stft['start'] or 0)
+                   + ((locDict_stft['columns_total'] - 1) * locDict_stft['hop']
+                      + locDict_stft['nfft'] / 2) / locDict_stft['fs'])
+
+    locDbl_half_bin = 0.5 * locDict_stft['fs'] / locDict_stft['nfft']
+
+    locList_extent = [locDbl_last - (locInt_columns - 0.5) * locDbl_step,
+                      locDbl_last + 0.5 * locDbl_step,
+                      -locDbl_half_bin,
+                      locDict_stft['freqs'][-1] + locDbl_half_bin]
+
+    return locImage, locList_extent
+
+# =============================================================================
+# </Function: image of a streaming STFT>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: figure of a streaming STFT>
+# =============================================================================
+
+def plot_spectrogram(locDict_stft, locStr_title='', locDbl_max_freq=None):
+    """
+    .. _plot_spectrogram :
+
+    Make a figure of a streaming STFT, one spectrogram panel per field. The
+    panels share the time axis.
+
+    Parameters
+    ----------
+    locDict_stft : dict
+        The STFT from start_stft_.
+
+    locStr_title : str
+        Title of the figure.
+
+    locDbl_max_freq : float or None
+        The top of the frequency axes (Hz), None is half the sampling
+        frequency.
+
+    Returns
+    -------
+    locFig : matplotlib figure object
+        The figure.
+
+    locDict_images : dict
+        The images of the fields, to be passed into update_spectrogram_.
+
+    Examples
+    --------
+    .. code:: python
+
+        fig, images = plot_spectrogram(stft, 'fault.cfg', 1000)
+
+        fig.show()
+
+        if push_stft(stft, samples) > 0:
+
+            update_spectrogram(stft, images)
+
+            fig.canvas.draw_idle()
+    """
+
+    locList_fields = locDict_stft['fields']
+
+    # a new figure every time, same as gsyPyramid.plot_pyramid
+    locFig, locList_axes = plt.subplots(len(locList_fields), 1, sharex=True, squeeze=False,
+                                        figsize=(12.8, 7.2), dpi=100)
+
+    if (len(locStr_title) > 0) and (locFig.canvas.manager is not None):
+
+        locFig.canvas.manager.set_window_title(locStr_title)
+
+    else:
+
+        pass
+
+    locFig.suptitle(locStr_title, fontsize=14, fontweight='bold')
+
+    locDict_images = {}
+
+    for locAx, item in zip(locList_axes[:, 0], locList_fields):
+
+        locImage, locList_extent = get_stft_image(locDict_stft, item)
+
+        locDict_images[item] = locAx.imshow(locImage, origin='lower', aspect='auto',
+                                            interpolation='nearest', extent=locList_extent,
+                                            vmin=CONST_DBL_STFT_FLOOR, vmax=0, cmap='viridis')
+
+        locAx.set_ylabel(('$\\' + item + '$' if len(item) > 1 else '$' + item + '$')
+                         + '\n(Hz)', fontweight='bold', fontsize=12)
+
+        locAx.set_ylim([0, locDict_stft['freqs'][-1] if locDbl_max_freq is None
+                        else locDbl_max_freq])
+
+    locFig.colorbar(locDict_images[locList_fields[0]], ax=locList_axes[:, 0].tolist(),
+                    label='dB')
+
+    locList_axes[-1, 0].set_xlabel(r'Time (s)', fontweight='bold', fontsize=12)
+
+    return locFig, locDict_images
+
+# =============================================================================
+# </Function: figure of a streaming STFT>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: update the figure of a streaming STFT>
+# =============================================================================
+
+def update_spectrogram(locDict_stft, locDict_images):
+    """
+    .. _update_spectrogram :
+
+    Refresh the panels of plot_spectrogram_ with the ring buffer, and scroll
+    the time axis to the newest column.
+
+    Parameters
+    ----------
+    locDict_stft : dict
+        The STFT from start_stft_.
+
+    locDict_images : dict
+        The images from plot_spectrogram_.
+
+    Returns
+    -------
+    list of matplotlib objects
+        The updated images.
+    """
+
+    for item, locObj_image in locDict_images.items():
+
+        locImage, locList_extent = get_stft_image(locDict_stft, item)
+
+        locObj_image.set_data(locImage)
+
+        locObj_image.set_extent(locList_extent)
+
+    # the panels share the time axis
+    locObj_image.axes.set_xlim(locList_extent[:2])
+
+    return list(locDict_images.values())
+
+# =============================================================================
+# </Function: update the figure of a streaming STFT>
+# =============================================================================
+
+
+if __name__ == '__main__':
+
+    print(date_time_now() + 'STFT amplitude check start')
+
+    locDbl_fs = 10e3
+
+    locTime = np.arange(20000) / locDbl_fs
+
+    # a constant of 1 reads 0 dB in the DC bin, a sine of 0.1 reads -20 dB
+    for locInt_nfft in [800, 801]:
+
+        locDict_stft = start_stft(locDbl_fs, locInt_nfft, locList_fields=['d'])
+
+        push_stft(locDict_stft, {'d': 1 + 0.1 * np.cos(2 * np.pi * 175 * locTime)})
+
+        locImage = get_stft_image(locDict_stft, 'd')[0][:, -1]
+
+        locInt_bin = int(np.argmin(np.abs(locDict_stft['freqs'] - 175)))
+
+        print('nfft {:d} : DC {:+.2f} dB, 175 Hz {:+.2f} dB'.format(locInt_nfft, locImage[0],
+                                                                  locImage[locInt_bin]))
+
+        if (abs(locImage[0]) > 0.01) or (abs(locImage[locInt_bin] + 20) > 0.01):
+
+            raise ValueError('Wrong STFT amplitude, nfft : ' + str(locInt_nfft))
+
+        else:
+
+            pass
+
+    # the Nyquist bin of an even frame, an alternating constant of 1 reads 0 dB
+    locDict_stft = start_stft(locDbl_fs, 800, locList_fields=['d'])
+
+    push_stft(locDict_stft, {'d': np.cos(np.pi * np.arange(2000))})
+
+    locDbl_nyquist = get_stft_image(locDict_stft, 'd')[0][-1, -1]
+
+    print('nfft 800 : Nyquist {:+.2f} dB'.format(locDbl_nyquist))
+
+    if abs(locDbl_nyquist) > 0.01:
+
+        raise ValueError('Wrong STFT amplitude of the Nyquist bin')
+
+    else:
+
+        pass
+
+    print(date_time_now() + 'STFT amplitude check complete')
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the streaming Clarke and Park pipeline.
+
+gsyDqLib.cal_ABDQ makes the data of one base period in one go. Recordings and
+live sources deliver three-phase samples chunk by chunk instead. This module
+keeps the PLL angle continuous from chunk to chunk and runs every chunk
+through the fused Clarke and Park Transforms (gsyTransforms.cal_clarke_park).
+
+Recordings are opened by open_recording_ (COMTRADE by gsyComtrade, or CSV
+files of time, a, b, c columns) and read chunk by chunk by stream_recording_,
+so the memory does not depend on the length of the recording.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* make_theta_
+* open_recording_
+* stream_clarke_park_
+* stream_recording_
+
+Function definitions
+----------------------
+
+"""
+
+import os
+import itertools
+
+import numpy as np
+
+from numpy import pi
+
+from gsyTransforms import cal_clarke_park
+from gsyComtrade import open_comtrade, find_comtrade_abc, stream_comtrade
+
+# =============================================================================
+# <Function: make the PLL angle of a chunk>
+# =============================================================================
+
+def make_theta(locInt_start, locInt_samples, locDbl_fs, locDbl_base_freq=50,
+               locDbl_pll_order=1, locDbl_theta0=0):
+    """
+    .. _make_theta :
+
+    Make the time and the PLL angle of the samples locInt_start to
+    locInt_start + locInt_samples - 1 of a stream.
+
+    The angle is :math:`θ = 2π · order · f · t + θ_{0}`. It is calculated
+    from the integer sample index and reduced modulo one PLL period before it
+    is multiplied by 2π, so it does not lose precision on long streams.
+
+    Parameters
+    ----------
+    locInt_start : int
+        Index of the first sample of the chunk in the stream.
+
+    locInt_samples : int
+        Number of samples of the chunk.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locDbl_pll_order : float
+        The PLL rotational direction and frequency as multiples of the base
+        frequency, same as gsyDqLib.cal_ABDQ.
+
+    locDbl_theta0 : float
+        The PLL angle at the first sample of the stream (rad).
+
+    Returns
+    -------
+    locTime : array
+        Time of the samples (s), relative to the start of the stream.
+
+    locTheta : array
+        The PLL angle (rad) of the samples.
+
+    Examples
+    --------
+    >>> make_theta(0, 4, 200, 50)
+    (array([0.   , 0.005, 0.01 , 0.015]),
+     array([0.        , 1.57079633, 3.14159265, 4.71238898]))
+    """
+
+    locIndex = locInt_start + np.arange(locInt_samples)
+
+    locTime = locIndex / locDbl_fs
+
+    # cycles of the PLL, modulo one
+    locCycles = np.mod(locDbl_pll_order * locDbl_base_freq * locIndex / locDbl_fs, 1)
+
+    locTheta = 2 * pi * locCycles + locDbl_theta0
+
+    return locTime, locTheta
+
+# =============================================================================
+# </Function: make the PLL angle of a chunk>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream chunks through the Clarke and Park Transforms>
+# =============================================================================
+
+def stream_clarke_park(locIter_chunks, locDbl_fs, locDbl_base_freq=50,
+                       locDbl_pll_order=1, locDbl_theta0=0):
+    """
+    .. _stream_clarke_park :
+
+    Generator, runs three-phase chunks through the fused Clarke and Park
+    Transforms with a continuous PLL angle.
+
+    Parameters
+    ----------
+    locIter_chunks : iterable
+        Yields (a, b, c) chunks. The last axis is the time axis, any leading
+        axes are independent channels.
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locDbl_pll_order : float
+        The PLL order, same as gsyDqLib.cal_ABDQ.
+
+    locDbl_theta0 : float
+        The PLL angle at the first sample of the stream (rad).
+
+    Yields
+    ------
+    locTime, locTheta, alpha, beta, d, q, zero : array
+        One tuple per chunk. See make_theta_ and gsyTransforms.cal_clarke_park.
+
+    Examples
+    --------
+    .. code:: python
+
+        for (time, theta,
+             alpha, beta, d, q, zero) in stream_clarke_park(chunks, 10e3):
+
+            do_something(d, q)
+    """
+
+    locInt_start = 0
+
+    for a, b, c in locIter_chunks:
+
+        locInt_samples = np.shape(a)[-1]
+
+        locTime, locTheta = make_theta(locInt_start, locInt_samples, locDbl_fs,
+                                       locDbl_base_freq, locDbl_pll_order,
+                                       locDbl_theta0)
+
+        alpha, beta, d, q, zero = cal_clarke_park(locTheta, a, b, c)
+
+        locInt_start += locInt_samples
+
+        yield locTime, locTheta, alpha, beta, d, q, zero
+
+# =============================================================================
+# </Function: stream chunks through the Clarke and Park Transforms>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: open a recording>
+# =============================================================================
+
+def open_recording(locStr_path, locStr_unit='V', locDbl_base_freq=50):
+    """
+    .. _open_recording :
+
+    Open a three-phase recording for stream_recording_. Nothing but the
+    header is read.
+
+    Two kinds of files are supported:
+        |  COMTRADE, the .cfg file (gsyComtrade.open_comtrade). The a, b, c
+        |  channels are found by gsyComtrade.find_comtrade_abc.
+        |  CSV, four columns time (s), a, b, c. A header line is skipped.
+        |  The sampling frequency comes from the first two time values.
+
+    Parameters
+    ----------
+    locStr_path : str
+        Path of the .cfg or .csv file.
+
+    locStr_unit : str
+        Unit of the COMTRADE channels, 'V' for the voltages, 'A' for the
+        currents.
+
+    locDbl_base_freq : float
+        The base frequency of CSV files. COMTRADE files use the line frequency
+        of the CFG file.
+
+    Returns
+    -------
+    locDict_source : dict
+        'path', 'kind' ('comtrade' or 'csv'), 'fs', 'base_freq', 'samples'
+        (None for CSV files, which are not counted in advance), and for
+        COMTRADE files 'record' and 'channels'.
+
+    Examples
+    --------
+    .. code:: python
+
+        source = open_recording('fault.cfg')
+
+        for time, a, b, c in stream_recording(source, 10000):
+
+            do_something(a, b, c)
+    """
+
+    locStr_ext = os.path.splitext(locStr_path)[1].lower()
+
+    if locStr_ext == '.cfg':
+
+        locDict_record = open_comtrade(locStr_path)
+
+        locDict_cfg = locDict_record['cfg']
+
+        if len(locDict_cfg['rates']) > 0:
+
+            locDbl_fs = locDict_cfg['rates'][0][0]
+
+        else:
+
+            # time stamps only, the first two give the sampling interval
+            locDbl_fs = 1e6 / ((float(locDict_record['stamp'][1]) - float(locDict_record['stamp'][0]))
+                               * locDict_cfg['time_mult'])
+
+        locDict_source = {'path': locStr_path,
+                          'kind': 'comtrade',
+                          'fs': locDbl_fs,
+                          'base_freq': locDict_cfg['line_freq'],
+                          'samples': locDict_record['samples'],
+                          'record': locDict_record,
+                          'channels': find_comtrade_abc(locDict_record, locStr_unit)}
+
+    elif locStr_ext == '.csv':
+
+        locList_rows = []
+
+        with open(locStr_path, 'r') as f:
+
+            for item in f:
+
+                try:
+
+                    locList_rows.append([float(x) for x in item.split(',')[:4]])
+
+                except ValueError:
+
+                    # header
+                    continue
+
+                if len(locList_rows) == 2:
+
+                    break
+
+                else:
+
+                    pass
+
+        if len(locList_rows) < 2:
+
+            raise ValueError('At least two samples are needed : ' + locStr_path)
+
+        else:
+
+            pass
+
+        locDict_source = {'path': locStr_path,
+                          'kind': 'csv',
+                          'fs': 1 / (locList_rows[1][0] - locList_rows[0][0]),
+                          'base_freq': locDbl_base_freq,
+                          'samples': None}
+
+    else:
+
+        raise ValueError('Unknown recording type : ' + locStr_path)
+
+    return locDict_source
+
+# =============================================================================
+# </Function: open a recording>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: stream a recording chunk by chunk>
+# =============================================================================
+
+def stream_recording(locDict_source, locInt_chunk=65536):
+    """
+    .. _stream_recording :
+
+    Generator, yields (time, a, b, c) of a recording from open_recording_
+    chunk by chunk. Only one chunk is held in memory.
+
+    Parameters
+    ----------
+    locDict_source : dict
+        The recording from open_recording_.
+
+    locInt_chunk : int
+        Number of samples per chunk, the last chunk may be shorter.
+    """
+
+    locInt_chunk = int(max(1, locInt_chunk))
+
+    if locDict_source['kind'] == 'comtrade':
+
+        for item in stream_comtrade(locDict_source['record'], locDict_source['channels'],
+                                    locInt_chunk):
+
+            yield item
+
+    else:
+
+        with open(locDict_source['path'], 'r') as f:
+
+            # numeric lines only, the header is skipped
+            locLines = (x for x in f if x.strip()[:1] in '0123456789+-.' and x.strip() != '')
+
+            while True:
+
+                locList_lines = list(itertools.islice(locLines, locInt_chunk))
+
+                if len(locList_lines) == 0:
+
+                    break
+
+                else:
+
+                    pass
+
+                locData = np.loadtxt(locList_lines, delimiter=',', usecols=(0, 1, 2, 3),
+                                     ndmin=2)
+
+                yield locData[:, 0], locData[:, 1], locData[:, 2], locData[:, 3]
+
+# =============================================================================
+# </Function: stream a recording chunk by chunk>
+# =============================================================================
@@ -8,6 +8,7 @@ Created on Thu Nov 16 09:50:56 2017
 import numpy as np
 
 from numpy import sqrt, sin, cos
+from functools import lru_cache
 
 # =============================================================================
 # <Function: calculate the symmetrical components (Fortescue)>
@@ -41,16 +42,157 @@ def cal_symm(a, b, c):
 # =============================================================================
 
 
+# =============================================================================
+# <Function: calculate the Hilbert Transform (90 degree shift) by overlap-save>
+# =============================================================================
+def cal_hilbert(x, taps=2001, block=None):
+    """
+    90 degree lagging shift of real samples, i.e., cos(ωt) becomes sin(ωt).
+
+    A Blackman windowed FIR Hilbert transformer of length "taps" (odd) is
+    applied with FFT based overlap-save blocks of length "block", so the
+    memory used does not grow with the length of x. The filter is centred,
+    thus the output is not delayed. The first and the last taps // 2 samples
+    see zero padding. The taps should span at least 10 base periods.
+
+    The last axis of x is the time axis. Leading axes are channels.
+    """
+
+    x = np.asarray(x, dtype=float)
+
+    taps = int(taps) // 2 * 2 + 1
+
+    half = taps // 2
+
+    if block is None:
+
+        block = 1 << int(np.ceil(np.log2(4 * taps)))
+
+    else:
+
+        block = int(block)
+
+    if block < taps:
+
+        raise ValueError('The block length must not be shorter than the taps')
+
+    # ideal Hilbert transformer, 2/(πn) for odd n, centred (non-causal), truncated to `taps` and Blackman windowed
+    n = np.arange(-half, half + 1)
+
+    h = np.zeros(taps)
+
+    h[n % 2 != 0] = 2 / (np.pi * n[n % 2 != 0])
+
+    h = h * np.blackman(taps)
+
+    H = np.fft.rfft(h, block)
+
+    # new samples per block
+    hop = block - taps + 1
+
+    length = x.shape[-1]
+
+    # zero padding, "half" at the front for centring, the rest to fill the last block
+    pad = np.zeros(x.shape[:-1] + (half,))
+
+    x_pad = np.concatenate((pad, x, pad), axis=-1)
+
+    y = np.empty_like(x)
+
+    for start in range(0, length, hop):
+
+        segment = x_pad[..., start:start + block]
+
+        y_block = np.fft.irfft(np.fft.rfft(segment, block) * H, block)
+
+        # discard the circularly aliased first taps - 1 samples
+        stop = min(start + hop, length)
+
+        y[..., start:stop] = y_block[..., taps - 1:taps - 1 + stop - start]
+
+    return y
+
+# =============================================================================
+# </Function: calculate the Hilbert Transform (90 degree shift) by overlap-save>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the instantaneous symmetrical components>
+# =============================================================================
+def cal_symm_inst(a, b, c, taps=2001, block=None):
+    """
+    Instantaneous symmetrical components of time domain a, b, c samples.
+
+    Same API shape as cal_symm, but on real instantaneous samples. The complex
+    rotators of cal_symm are realised in the time domain, i.e., multiplying
+    by (x + jy) becomes x * v - y * cal_hilbert(v). See cal_hilbert for
+    "taps" and "block".
+    """
+
+    abc = np.stack(np.broadcast_arrays(np.asarray(a, dtype=float),
+                                       np.asarray(b, dtype=float),
+                                       np.asarray(c, dtype=float)))
+
+    # 120 degree rotator
+    ALPHA = np.exp(1j * 2/3 * np.pi)
+
+    # rows: a_pos, b_pos, c_pos, a_neg, b_neg, c_neg, zero, same as cal_symm
+    FORTESCUE = 1/3 * np.array([[1, ALPHA, ALPHA ** 2],
+                                [ALPHA ** 2, 1, ALPHA],
+                                [ALPHA, ALPHA ** 2, 1],
+                                [1, ALPHA ** 2, ALPHA],
+                                [ALPHA, 1, ALPHA ** 2],
+                                [ALPHA ** 2, ALPHA, 1],
+                                [1, 1, 1]])
+
+    abc_quad = cal_hilbert(abc, taps, block)
+
+    out = (np.tensordot(FORTESCUE.real, abc, axes=1)
+           - np.tensordot(FORTESCUE.imag, abc_quad, axes=1))
+
+    a_pos, b_pos, c_pos, a_neg, b_neg, c_neg, zero = out
+
+    return a_pos, b_pos, c_pos, a_neg, b_neg, c_neg, zero
+
+# =============================================================================
+# </Function: calculate the instantaneous symmetrical components>
+# =============================================================================
+
+
 # =============================================================================
 # <Function: calculate the amplitude invariant Clarke Transform>
 # =============================================================================
-def cal_clarke(a, b, c):
+def cal_clarke(a, b, c, out=None):
     
-    alpha = 2/3 * ( a - 1/2 * (b + c) )
-    
-    beta = 2/3 * ( sqrt(3)/2 * (b - c) )
-    
-    zero = 2/3 * 1/2 * (a + b + c)
+    # out, optional (alpha, beta, zero) arrays to write the results into
+    if out is None:
+        
+        alpha = 2/3 * ( a - 1/2 * (b + c) )
+        
+        beta = 2/3 * ( sqrt(3)/2 * (b - c) )
+        
+        zero = 2/3 * 1/2 * (a + b + c)
+        
+    else:
+        
+        alpha, beta, zero = out
+        
+        np.add(b, c, out=zero)
+        
+        np.multiply(zero, -1/2, out=alpha)
+        
+        alpha += a
+        
+        alpha *= 2/3
+        
+        zero += a
+        
+        zero *= 2/3 * 1/2
+        
+        np.subtract(b, c, out=beta)
+        
+        beta *= 2/3 * sqrt(3)/2
     
     return alpha, beta, zero
 # =============================================================================
@@ -58,6 +200,136 @@ def cal_clarke(a, b, c):
 # =============================================================================
 
 
+# =============================================================================
+# <Function: calculate the inverse amplitude invariant Clarke Transform>
+# =============================================================================
+def cal_inv_clarke(alpha, beta, zero, out=None):
+    
+    # out, optional (a, b, c) arrays to write the results into
+    if out is None:
+        
+        a = alpha + zero
+        
+        b = -1/2 * alpha + sqrt(3)/2 * beta + zero
+        
+        c = -1/2 * alpha - sqrt(3)/2 * beta + zero
+        
+    else:
+        
+        a, b, c = out
+        
+        # a holds sqrt(3)/2 * beta until the end
+        np.multiply(beta, sqrt(3)/2, out=a)
+        
+        np.multiply(alpha, -1/2, out=b)
+        
+        b += zero
+        
+        np.subtract(b, a, out=c)
+        
+        b += a
+        
+        np.add(alpha, zero, out=a)
+    
+    return a, b, c
+# =============================================================================
+# </Function: calculate the inverse amplitude invariant Clarke Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: make the generalised n-phase Clarke Transform matrix>
+# =============================================================================
+@lru_cache(maxsize=None)
+def get_clarke_matrix(phases):
+    """
+    Amplitude invariant Clarke Transform matrix (phases x phases) of a
+    symmetrical n-phase system, phase k at 2πk/n. Cached per phase count, do
+    not modify the returned array.
+
+    Rows: alpha, beta, then x_m, y_m for m = 2 ... (n - 1) // 2 (the x-y
+    subspaces), then the alternating zero sequence (even n only), then zero.
+    For n = 3 this is cal_clarke.
+    """
+
+    phases = int(phases)
+
+    if phases < 3:
+
+        raise ValueError('The Clarke Transform needs at least 3 phases')
+
+    delta = 2 * np.pi * np.arange(phases) / phases
+
+    rows = []
+
+    # alpha, beta (m = 1) and the x-y subspaces (m >= 2)
+    for m in range(1, (phases - 1) // 2 + 1):
+
+        rows.append(2 / phases * cos(m * delta))
+
+        rows.append(2 / phases * sin(m * delta))
+
+    # alternating zero sequence, even phase count only
+    if phases % 2 == 0:
+
+        rows.append(1 / phases * (-1.0) ** np.arange(phases))
+
+    # zero sequence
+    rows.append(1 / phases * np.ones(phases))
+
+    matrix = np.array(rows)
+
+    matrix.setflags(write=False)
+
+    return matrix
+# =============================================================================
+# </Function: make the generalised n-phase Clarke Transform matrix>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the generalised n-phase Clarke Transform>
+# =============================================================================
+def cal_clarke_n(x, out=None):
+    
+    # x is (phases, samples), one matmul with the cached matrix, the rows of
+    # the result are described in get_clarke_matrix
+    x = np.asarray(x)
+    
+    matrix = get_clarke_matrix(x.shape[0])
+    
+    return np.matmul(matrix, x, out=out)
+# =============================================================================
+# </Function: calculate the generalised n-phase Clarke Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the inverse generalised n-phase Clarke Transform>
+# =============================================================================
+@lru_cache(maxsize=None)
+def get_inv_clarke_matrix(phases):
+    
+    matrix = np.linalg.inv(get_clarke_matrix(phases))
+    
+    matrix.setflags(write=False)
+    
+    return matrix
+
+
+def cal_inv_clarke_n(components, out=None):
+    
+    # components is (phases, samples), rows as described in get_clarke_matrix
+    components = np.asarray(components)
+    
+    matrix = get_inv_clarke_matrix(components.shape[0])
+    
+    return np.matmul(matrix, components, out=out)
+# =============================================================================
+# </Function: calculate the inverse generalised n-phase Clarke Transform>
+# =============================================================================
+
+
 # =============================================================================
 # <Function: calculate the symmetrical components for the amplitude invariant Clarke Transform>
 # =============================================================================
@@ -78,7 +350,7 @@ def cal_clarke_symm(a, b, c):
     # negative alpha and beta
     alpha_neg = 1/2 * ( alpha + beta * QUAD )
     
-    beta_neg = 1/2 ( -1 * alpha * QUAD + beta )
+    beta_neg = 1/2 * ( -1 * alpha * QUAD + beta )
     
     return alpha_pos, beta_pos, alpha_neg, beta_neg, zero
 # =============================================================================
@@ -86,10 +358,38 @@ def cal_clarke_symm(a, b, c):
 # =============================================================================    
 
 
+# =============================================================================
+# <Function: calculate cos and sin of the Park angle>
+# =============================================================================
+def cal_trig(theta, out=None):
+    
+    # the trig cache, cos and sin of theta are calculated once and can be
+    # passed into cal_park, cal_inv_park via "trig" for every transform using
+    # the same theta
+    if out is None:
+        
+        cos_theta = cos(theta)
+        
+        sin_theta = sin(theta)
+        
+    else:
+        
+        cos_theta, sin_theta = out
+        
+        cos(theta, out=cos_theta)
+        
+        sin(theta, out=sin_theta)
+        
+    return cos_theta, sin_theta
+# =============================================================================
+# </Function: calculate cos and sin of the Park angle>
+# =============================================================================
+
+
 # =============================================================================
 # <Function: calculate the Park Transform>
 # =============================================================================
-def cal_park(theta, alpha, beta, zero):
+def cal_park(theta, alpha, beta, zero, trig=None, out=None):
     
     # Park transform
     
@@ -110,9 +410,31 @@ def cal_park(theta, alpha, beta, zero):
         raise ValueError('Element length mismatch.'
                          + 'The length of theta, alpha, beta and zero must be all the same')    
     
-    d = cos(theta) * alpha + sin(theta) * beta
+    # trig, optional (cos(theta), sin(theta)) from cal_trig
+    if trig is None:
+        
+        trig = cal_trig(theta)
+        
+    cos_theta, sin_theta = trig
     
-    q = -sin(theta) * alpha + cos(theta) * beta
+    # out, optional (d, q) arrays to write the results into
+    if out is None:
+        
+        d = cos_theta * alpha + sin_theta * beta
+        
+        q = -sin_theta * alpha + cos_theta * beta
+        
+    else:
+        
+        d, q = out
+        
+        np.multiply(cos_theta, alpha, out=d)
+        
+        d += sin_theta * beta
+        
+        np.multiply(cos_theta, beta, out=q)
+        
+        q -= sin_theta * alpha
     
     zero = zero
     
@@ -120,6 +442,231 @@ def cal_park(theta, alpha, beta, zero):
 # =============================================================================
 # </Function: calculate the Park Transform>
 # =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the inverse Park Transform>
+# =============================================================================
+def cal_inv_park(theta, d, q, zero, trig=None, out=None):
+    
+    # inverse Park transform, same "trig" and "out" as cal_park
+    
+    if all( len(x) == len(theta) for x in (d, q, zero) ):
+        
+        pass
+    
+    else:
+        
+        raise ValueError('Element length mismatch.'
+                         + 'The length of theta, d, q and zero must be all the same')    
+    
+    if trig is None:
+        
+        trig = cal_trig(theta)
+        
+    cos_theta, sin_theta = trig
+    
+    if out is None:
+        
+        alpha = cos_theta * d - sin_theta * q
+        
+        beta = sin_theta * d + cos_theta * q
+        
+    else:
+        
+        alpha, beta = out
+        
+        np.multiply(cos_theta, d, out=alpha)
+        
+        alpha -= sin_theta * q
+        
+        np.multiply(cos_theta, q, out=beta)
+        
+        beta += sin_theta * d
+    
+    zero = zero
+    
+    return alpha, beta, zero
+# =============================================================================
+# </Function: calculate the inverse Park Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the Clarke and the Park Transforms in one go>
+# =============================================================================
+def cal_clarke_park(theta, a, b, c, trig=None, out=None):
+    
+    # fused amplitude invariant Clarke and Park transforms, abc -> αβ0 -> dq0
+    # theta is 1d (samples), a, b, c may have leading channel axes, e.g., 
+    # voltages and currents of many bays stacked together
+    
+    if all( np.shape(x)[-1] == len(theta) for x in (a, b, c) ):
+        
+        pass
+    
+    else:
+        
+        raise ValueError('Element length mismatch.'
+                         + 'The length of theta, a, b and c must be all the same')
+    
+    # trig, optional (cos(theta), sin(theta)) from cal_trig
+    if trig is None:
+        
+        trig = cal_trig(theta)
+        
+    cos_theta, sin_theta = trig
+    
+    # out, optional (alpha, beta, d, q, zero) arrays to write the results into
+    if out is None:
+        
+        shape = np.broadcast(a, b, c).shape
+        
+        out = tuple(np.empty(shape) for x in range(5))
+        
+    alpha, beta, d, q, zero = out
+    
+    cal_clarke(a, b, c, out=(alpha, beta, zero))
+    
+    # d, q written directly, same as cal_park(theta, alpha, beta, zero, trig, (d, q))
+    np.multiply(cos_theta, alpha, out=d)
+    
+    np.multiply(sin_theta, beta, out=q)
+    
+    d += q
+    
+    np.multiply(cos_theta, beta, out=q)
+    
+    q -= sin_theta * alpha
+    
+    return alpha, beta, d, q, zero
+# =============================================================================
+# </Function: calculate the Clarke and the Park Transforms in one go>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: verify the round trip abc -> dq0 -> abc>
+# =============================================================================
+def cal_roundtrip_error(a, b, c, theta, block=1 << 20):
+    """
+    Round trip a, b, c through cal_clarke, cal_park, cal_inv_park and
+    cal_inv_clarke and return the reconstruction errors.
+
+    The samples are processed in blocks of "block" samples, all the
+    intermediate results are written into the same buffers (out=) and cos,
+    sin of theta are calculated once per block (trig=). a, b, c and theta are
+    1d arrays of the same length, e.g., np.memmap of long recordings.
+
+    Returns the maximum absolute error, the RMS error and the number of
+    samples checked.
+    """
+
+    length = len(theta)
+
+    if all( len(x) == length for x in (a, b, c) ):
+
+        pass
+
+    else:
+
+        raise ValueError('Element length mismatch.'
+                         + 'The length of a, b, c and theta must be all the same')
+
+    block = int(min(block, length))
+
+    # 2 trig, 3 Clarke, 2 Park, 3 reconstructed
+    buffer = np.empty((10, block))
+
+    error_max = 0.0
+
+    error_sum_sq = 0.0
+
+    for start in range(0, length, block):
+
+        stop = min(start + block, length)
+
+        buf = buffer[:, :stop - start]
+
+        trig = cal_trig(theta[start:stop], out=(buf[0], buf[1]))
+
+        alpha, beta, zero = cal_clarke(a[start:stop], b[start:stop], c[start:stop],
+                                       out=(buf[2], buf[3], buf[4]))
+
+        d, q, zero = cal_park(theta[start:stop], alpha, beta, zero,
+                              trig=trig, out=(buf[5], buf[6]))
+
+        # alpha, beta buffers reused for the inverse Park
+        alpha, beta, zero = cal_inv_park(theta[start:stop], d, q, zero,
+                                         trig=trig, out=(buf[2], buf[3]))
+
+        a_rec, b_rec, c_rec = cal_inv_clarke(alpha, beta, zero,
+                                             out=(buf[7], buf[8], buf[9]))
+
+        for x, x_rec in ((a, a_rec), (b, b_rec), (c, c_rec)):
+
+            x_rec -= x[start:stop]
+
+            error_max = max(error_max, np.max(np.abs(x_rec)))
+
+            error_sum_sq += np.dot(x_rec, x_rec)
+
+    error_rms = sqrt(error_sum_sq / (3 * length))
+
+    return error_max, error_rms, length
+# =============================================================================
+# </Function: verify the round trip abc -> dq0 -> abc>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: calculate the Park Transform in several frames at once>
+# =============================================================================
+def cal_park_frames(theta, alpha, beta, zero, trig=None):
+    """
+    Park Transform of the same alpha, beta, zero into several frames at once.
+
+    theta is a (frames, samples) block, e.g., np.outer(pll_orders, theta).
+    alpha, beta and zero have the samples on the last axis, any leading axes
+    are channels. d and q are returned as (frames,) + alpha.shape blocks, i.e.,
+    one batched rotation per sample and frame, without a loop over the frames.
+
+    trig, optional (cos(theta), sin(theta)) of the block, same as cal_park, so
+    repeated rotations by the same angles cost only multiply-adds.
+    """
+
+    theta = np.atleast_2d(theta)
+
+    alpha, beta, zero = np.broadcast_arrays(alpha, beta, zero)
+
+    if theta.shape[-1] != alpha.shape[-1]:
+
+        raise ValueError('Element length mismatch.'
+                         + 'The length of theta, alpha, beta and zero must be all the same')
+
+    # broadcast the frames over the channels
+    locShape = (theta.shape[0],) + (1,) * (alpha.ndim - 1) + (theta.shape[-1],)
+
+    if trig is None:
+
+        theta = theta.reshape(locShape)
+
+        cos_theta = cos(theta)
+
+        sin_theta = sin(theta)
+
+    else:
+
+        cos_theta, sin_theta = (np.reshape(x, locShape) for x in trig)
+
+    d = cos_theta * alpha + sin_theta * beta
+
+    q = -sin_theta * alpha + cos_theta * beta
+
+    return d, q, zero
+# =============================================================================
+# </Function: calculate the Park Transform in several frames at once>
+# =============================================================================
     
 
 # =============================================================================
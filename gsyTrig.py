@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the selectable sin/cos providers of the Park rotation.
+
+gsyTransforms.cal_park and gsyDqLib.cal_ABDQ use the NumPy (libm) sin and cos
+by default. Embedded controllers normally use a lookup table or CORDIC
+instead. The providers in this module are vectorised over the samples and
+return (cos, sin) like gsyTransforms.cal_trig, so they can be passed into the
+transforms directly, e.g.:
+
+.. code:: python
+
+    trig = make_trig_provider('cordic', locInt_iterations=12)
+
+    d, q, zero = cal_park(theta, alpha, beta, zero, trig=trig(theta))
+
+    results = cal_ABDQ(200, 50, 1, 1, locTrig=trig)
+
+Run this module as a script for the benchmark of all providers.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* bench_trig_
+* cal_trig_cordic_
+* cal_trig_table_
+* make_trig_provider_
+* make_trig_table_
+
+Function definitions
+----------------------
+
+"""
+
+import time
+
+import numpy as np
+
+from numpy import pi
+
+from gsyDqLib import date_time_now
+from gsyTransforms import cal_trig
+
+# =============================================================================
+# <Function: make the sin table>
+# =============================================================================
+
+def make_trig_table(locInt_size=1024, locStr_interpolation='linear'):
+    """
+    .. _make_trig_table :
+
+    Make the sin table of one period for cal_trig_table_.
+
+    Parameters
+    ----------
+    locInt_size : int
+        Number of table entries per period, a multiple of 4 so that cos is
+        the same table shifted by a quarter period. Default is 1024.
+
+    locStr_interpolation : str
+        'nearest' takes the nearest entry, 'linear' interpolates linearly
+        between the two neighbouring entries.
+
+    Returns
+    -------
+    locDict_table : dict
+        'size', 'interpolation', and 'table', the sin values of
+        locInt_size + 1 equally spaced angles from 0 to 2π (the last entry
+        repeats the first one, so the interpolation does not need to wrap).
+
+    Examples
+    --------
+    .. code:: python
+
+        table = make_trig_table(256, 'linear')
+    """
+
+    locInt_size = int(locInt_size)
+
+    if (locInt_size < 4) or (locInt_size % 4 != 0):
+
+        raise ValueError('The table size must be a positive multiple of 4')
+
+    else:
+
+        pass
+
+    if locStr_interpolation not in ('nearest', 'linear'):
+
+        raise ValueError("The interpolation must be 'nearest' or 'linear'")
+
+    else:
+
+        pass
+
+    locTable = np.sin(2 * pi * np.arange(locInt_size + 1) / locInt_size)
+
+    # exact wrap-around
+    locTable[-1] = locTable[0]
+
+    locDict_table = {'size': locInt_size,
+                     'interpolation': locStr_interpolation,
+                     'table': locTable}
+
+    return locDict_table
+
+# =============================================================================
+# </Function: make the sin table>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: table-driven sin and cos>
+# =============================================================================
+
+def cal_trig_table(theta, locDict_table):
+    """
+    .. _cal_trig_table :
+
+    cos and sin of theta from the sin table of make_trig_table_.
+
+    Parameters
+    ----------
+    theta : array
+        Angles (rad), any shape.
+
+    locDict_table : dict
+        The table from make_trig_table_.
+
+    Returns
+    -------
+    cos_theta, sin_theta : array
+        Same shape as theta.
+    """
+
+    locInt_size = locDict_table['size']
+
+    locTable = locDict_table['table']
+
+    # position in the table, 0 to size
+    locPosition = np.mod(np.asarray(theta, dtype=float) * (locInt_size / (2 * pi)),
+                         locInt_size)
+
+    locInt_quarter = locInt_size // 4
+
+    if locDict_table['interpolation'] == 'nearest':
+
+        # wrapped without assignment, theta may be a scalar
+        locIndex = np.mod(np.rint(locPosition).astype(np.intp), locInt_size)
+
+        sin_theta = locTable[locIndex]
+
+        cos_theta = locTable[(locIndex + locInt_quarter) % locInt_size]
+
+    else:
+
+        locIndex = np.floor(locPosition).astype(np.intp)
+
+        # rounding of mod() may give exactly size
+        locIndex = np.minimum(locIndex, locInt_size - 1)
+
+        locFraction = locPosition - locIndex
+
+        sin_theta = locTable[locIndex]
+
+        sin_theta = sin_theta + locFraction * (locTable[locIndex + 1] - sin_theta)
+
+        locIndex = (locIndex + locInt_quarter) % locInt_size
+
+        cos_theta = locTable[locIndex]
+
+        cos_theta = cos_theta + locFraction * (locTable[locIndex + 1] - cos_theta)
+
+    return cos_theta, sin_theta
+
+# =============================================================================
+# </Function: table-driven sin and cos>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: CORDIC sin and cos>
+# =============================================================================
+
+def cal_trig_cordic(theta, locInt_iterations=16):
+    """
+    .. _cal_trig_cordic :
+
+    cos and sin of theta by the rotation mode CORDIC, vectorised over the
+    samples (the loop is over the iterations only).
+
+    The angle is first reduced into :math:`[-π/2, π/2]` (the quadrant
+    correction of the embedded code), then rotated by :math:`±atan(2^{-i})`
+    for i = 0 to locInt_iterations - 1. The result is scaled by the CORDIC
+    gain in advance. The error is about :math:`2^{-iterations}`.
+
+    Parameters
+    ----------
+    theta : array
+        Angles (rad), any shape.
+
+    locInt_iterations : int
+        Number of CORDIC iterations. Default is 16.
+
+    Returns
+    -------
+    cos_theta, sin_theta : array
+        Same shape as theta.
+    """
+
+    locInt_iterations = int(locInt_iterations)
+
+    if locInt_iterations < 1:
+
+        raise ValueError('The number of iterations must be a positive integer')
+
+    else:
+
+        pass
+
+    locShifts = np.ldexp(1.0, -np.arange(locInt_iterations))
+
+    locAngles = np.arctan(locShifts)
+
+    # CORDIC gain
+    locDbl_gain = np.prod(1 / np.sqrt(1 + locShifts**2))
+
+    # reduce into (-π, π], then into [-π/2, π/2]
+    locZ = np.asarray(theta, dtype=float)
+
+    locZ = locZ - 2 * pi * np.round(locZ / (2 * pi))
+
+    locFlip = np.abs(locZ) > pi / 2
+
+    locZ = np.where(locFlip, locZ - np.copysign(pi, locZ), locZ)
+
+    locX = np.full(locZ.shape, locDbl_gain)
+
+    locY = np.zeros(locZ.shape)
+
+    # for-loop start
+    for k in range(locInt_iterations):
+
+        locSign = np.where(locZ >= 0, 1.0, -1.0)
+
+        locX, locY = (locX - locSign * locShifts[k] * locY,
+                      locY + locSign * locShifts[k] * locX)
+
+        locZ = locZ - locSign * locAngles[k]
+    # for-loop end
+
+    # the angles reduced by π have both signs flipped
+    locX = np.where(locFlip, -locX, locX)
+
+    locY = np.where(locFlip, -locY, locY)
+
+    return locX, locY
+
+# =============================================================================
+# </Function: CORDIC sin and cos>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: make a sin/cos provider>
+# =============================================================================
+
+def make_trig_provider(locStr_mode='numpy', locInt_size=1024,
+                       locStr_interpolation='linear', locInt_iterations=16):
+    """
+    .. _make_trig_provider :
+
+    Make a sin/cos provider, a function of theta that returns
+    (cos(theta), sin(theta)).
+
+    Parameters
+    ----------
+    locStr_mode : str
+        'numpy' (gsyTransforms.cal_trig), 'table' (cal_trig_table_) or
+        'cordic' (cal_trig_cordic_).
+
+    locInt_size : int
+        Table size for the 'table' mode.
+
+    locStr_interpolation : str
+        Table interpolation for the 'table' mode, 'nearest' or 'linear'.
+
+    locInt_iterations : int
+        Number of iterations for the 'cordic' mode.
+
+    Returns
+    -------
+    locFunc_trig : function
+        The provider, locFunc_trig(theta) -> (cos_theta, sin_theta).
+
+    Examples
+    --------
+    .. code:: python
+
+        trig = make_trig_provider('table', 256, 'nearest')
+
+        cos_theta, sin_theta = trig(theta)
+    """
+
+    if locStr_mode == 'numpy':
+
+        locFunc_trig = cal_trig
+
+    elif locStr_mode == 'table':
+
+        locDict_table = make_trig_table(locInt_size, locStr_interpolation)
+
+        locFunc_trig = lambda theta: cal_trig_table(theta, locDict_table)
+
+    elif locStr_mode == 'cordic':
+
+        # checked here rather than on the first call
+        if int(locInt_iterations) < 1:
+
+            raise ValueError('The number of iterations must be a positive integer')
+
+        else:
+
+            pass
+
+        locFunc_trig = lambda theta: cal_trig_cordic(theta, locInt_iterations)
+
+    else:
+
+        raise ValueError("The mode must be 'numpy', 'table' or 'cordic'")
+
+    return locFunc_trig
+
+# =============================================================================
+# </Function: make a sin/cos provider>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: benchmark the sin/cos providers>
+# =============================================================================
+
+def bench_trig(locInt_samples=10**6, locList_providers=None, locInt_repeat=3):
+    """
+    .. _bench_trig :
+
+    Benchmark the throughput and the worst-case error of sin/cos providers
+    against the NumPy sin and cos.
+
+    Parameters
+    ----------
+    locInt_samples : int
+        Number of angles, equally spaced over several periods.
+
+    locList_providers : list or None
+        List of (name, keyword arguments of make_trig_provider_). None
+        benchmarks NumPy, tables of 256 and 4096 entries (nearest and linear)
+        and CORDIC of 8, 16 and 24 iterations.
+
+    locInt_repeat : int
+        Number of runs per provider, the fastest one is reported.
+
+    Returns
+    -------
+    locList_results : list of dict
+        'name', 'samples_per_s' and 'max_error', the worst-case absolute error
+        of cos and sin.
+
+    Examples
+    --------
+    .. code:: python
+
+        for item in bench_trig():
+
+            print(item['name'], item['samples_per_s'], item['max_error'])
+    """
+
+    if locList_providers is None:
+
+        locList_providers = [('numpy', {'locStr_mode': 'numpy'})]
+
+        for item in (256, 4096):
+
+            for interpolation in ('nearest', 'linear'):
+
+                locList_providers.append(('table ' + str(item) + ' ' + interpolation,
+                                          {'locStr_mode': 'table',
+                                           'locInt_size': item,
+                                           'locStr_interpolation': interpolation}))
+
+        for item in (8, 16, 24):
+
+            locList_providers.append(('cordic ' + str(item),
+                                      {'locStr_mode': 'cordic',
+                                       'locInt_iterations': item}))
+
+    else:
+
+        pass
+
+    theta = np.linspace(-4 * pi, 4 * pi, int(locInt_samples))
+
+    locCos_ref, locSin_ref = cal_trig(theta)
+
+    locList_results = []
+
+    for locStr_name, locDict_kwargs in locList_providers:
+
+        locFunc_trig = make_trig_provider(**locDict_kwargs)
+
+        locDbl_best = np.inf
+
+        for k in range(max(1, int(locInt_repeat))):
+
+            locDbl_start = time.perf_counter()
+
+            cos_theta, sin_theta = locFunc_trig(theta)
+
+            locDbl_best = min(locDbl_best, time.perf_counter() - locDbl_start)
+
+        locDbl_error = max(np.max(np.abs(cos_theta - locCos_ref)),
+                           np.max(np.abs(sin_theta - locSin_ref)))
+
+        locList_results.append({'name': locStr_name,
+                                'samples_per_s': len(theta) / locDbl_best,
+                                'max_error': locDbl_error})
+
+    return locList_results
+
+# =============================================================================
+# </Function: benchmark the sin/cos providers>
+# =============================================================================
+
+
+if __name__ == '__main__':
+
+    print(date_time_now() + 'sin/cos provider benchmark start')
+
+    for item in bench_trig():
+
+        print('{:<22s}{:>10.1f} M samples/s{:>14.3e} max error'.format(
+              item['name'], item['samples_per_s'] / 1e6, item['max_error']))
+
+    print(date_time_now() + 'sin/cos provider benchmark complete')
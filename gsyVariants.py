@@ -0,0 +1,637 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the registry of the variants of the Clarke and Park
+Transforms.
+
+gsyTransforms has the amplitude invariant Clarke Transform and the *d*
+aligned Park Transform. Other conventions are found in the literature and in
+controllers, e.g.:
+    |  'clarke_amplitude' : amplitude invariant Clarke, gsyTransforms.cal_clarke
+    |  'clarke_power' : power invariant Clarke, :math:`\\sqrt{2/3}` instead of
+    |                   2/3, so the power of α, β, 0 equals the power of a, b, c
+    |  'park_d' : *d* axis aligned with α at θ = 0, *q* leading *d* by 90°,
+    |             gsyTransforms.cal_park
+    |  'park_q' : *q* axis aligned with α at θ = 0, *d* lagging *q* by 90°
+    |             (the convention of Park's and Krause's papers)
+    |  'park_d_q_lagging' : *d* aligned, *q* lagging *d* by 90°
+
+Every variant is registered (register_variant_) with its vectorised kernel
+and its metadata, and the callers dispatch by name (cal_variant_,
+cal_variant_clarke_park_), e.g., gsyBatch, gsyReplay, gsyLive, gsyIndex and
+the Replay, Live and Explore buttons of gsyDqMain. The kernels of a kind have
+the same arguments and returns:
+    |  'clarke' : kernel(a, b, c) -> (alpha, beta, zero)
+    |  'park' : kernel(theta, alpha, beta, zero, trig=None) -> (d, q, zero)
+
+Variants of other modules are registered the same way, e.g., on import of
+the module. The worker processes of gsyBatch only know the variants of the
+modules they import.
+
+Run this module as a script for the benchmark of all registered kernels.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* bench_variants_
+* cal_clarke_power_
+* cal_park_d_q_lagging_
+* cal_park_q_
+* cal_variant_
+* cal_variant_clarke_park_
+* get_variant_
+* list_variants_
+* parse_variant_names_
+* register_variant_
+
+Function definitions
+----------------------
+
+"""
+
+import time
+
+import numpy as np
+
+from numpy import sqrt
+
+from gsyDqLib import date_time_now
+from gsyTransforms import cal_clarke, cal_park, cal_trig, cal_clarke_park
+
+# kinds of variants
+CONST_LIST_VARIANT_KINDS = ['clarke', 'park']
+
+# the variants of gsyTransforms.cal_clarke_park
+CONST_STR_VARIANT_CLARKE = 'clarke_amplitude'
+
+CONST_STR_VARIANT_PARK = 'park_d'
+
+# the registry, name -> dict of the kernel and the metadata
+dict_variants = {}
+
+# =============================================================================
+# <Function: register a variant>
+# =============================================================================
+
+def register_variant(locStr_name, locFunc_kernel, locStr_kind, locStr_description='',
+                     locBool_replace=False, **locDict_metadata):
+    """
+    .. _register_variant :
+
+    Register a variant of the transforms.
+
+    Parameters
+    ----------
+    locStr_name : str
+        The unique name, e.g., 'park_q'.
+
+    locFunc_kernel : function
+        The vectorised kernel, arguments and returns by the kind, see the
+        module description.
+
+    locStr_kind : str
+        'clarke' or 'park'.
+
+    locStr_description : str
+        One line description.
+
+    locBool_replace : bool
+        Replace a variant of the same name, otherwise a ValueError is raised.
+
+    **locDict_metadata
+        Other metadata, e.g., invariant='power'.
+
+    Returns
+    -------
+    locDict_variant : dict
+        'name', 'kind', 'kernel', 'description' and the other metadata.
+
+    Examples
+    --------
+    .. code:: python
+
+        register_variant('park_fixed', cal_park_fixed, 'park',
+                         'd aligned, Q15 fixed point', invariant='amplitude',
+                         aligned='d')
+
+        d, q, zero = cal_variant('park_fixed', theta, alpha, beta, zero)
+    """
+
+    if locStr_kind not in CONST_LIST_VARIANT_KINDS:
+
+        raise ValueError('Unknown kind : ' + str(locStr_kind))
+
+    else:
+
+        pass
+
+    if not callable(locFunc_kernel):
+
+        raise ValueError('The kernel must be a function')
+
+    else:
+
+        pass
+
+    if (locStr_name in dict_variants) and (locBool_replace == False):
+
+        raise ValueError('Variant already registered : ' + str(locStr_name))
+
+    else:
+
+        pass
+
+    locDict_variant = dict(locDict_metadata,
+                           name=locStr_name,
+                           kind=locStr_kind,
+                           kernel=locFunc_kernel,
+                           description=locStr_description)
+
+    dict_variants[locStr_name] = locDict_variant
+
+    return locDict_variant
+
+# =============================================================================
+# </Function: register a variant>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: get a variant>
+# =============================================================================
+
+def get_variant(locStr_name, locStr_kind=None):
+    """
+    .. _get_variant :
+
+    Get a registered variant by name.
+
+    Parameters
+    ----------
+    locStr_name : str
+        The name.
+
+    locStr_kind : str or None
+        If given, the variant must be of this kind.
+
+    Returns
+    -------
+    locDict_variant : dict
+        See register_variant_.
+    """
+
+    if locStr_name not in dict_variants:
+
+        raise ValueError('Unknown variant : ' + str(locStr_name)
+                         + ', registered : ' + ', '.join(list_variants()))
+
+    else:
+
+        pass
+
+    locDict_variant = dict_variants[locStr_name]
+
+    if (locStr_kind is not None) and (locDict_variant['kind'] != locStr_kind):
+
+        raise ValueError('Variant ' + str(locStr_name) + ' is not of the kind '
+                         + str(locStr_kind))
+
+    else:
+
+        pass
+
+    return locDict_variant
+
+# =============================================================================
+# </Function: get a variant>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: list the variants>
+# =============================================================================
+
+def list_variants(locStr_kind=None):
+    """
+    .. _list_variants :
+
+    The names of the registered variants, sorted.
+
+    Parameters
+    ----------
+    locStr_kind : str or None
+        Only the variants of this kind, None is all.
+
+    Returns
+    -------
+    list of str
+        The names.
+    """
+
+    return sorted(x for x, y in dict_variants.items()
+                  if (locStr_kind is None) or (y['kind'] == locStr_kind))
+
+# =============================================================================
+# </Function: list the variants>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: dispatch by name>
+# =============================================================================
+
+def cal_variant(locStr_name, *args, **kwargs):
+    """
+    .. _cal_variant :
+
+    Call the kernel of a registered variant.
+
+    Parameters
+    ----------
+    locStr_name : str
+        The name.
+
+    *args, **kwargs
+        The arguments of the kernel.
+
+    Returns
+    -------
+    tuple
+        The returns of the kernel.
+
+    Examples
+    --------
+    .. code:: python
+
+        alpha, beta, zero = cal_variant('clarke_power', a, b, c)
+
+        d, q, zero = cal_variant('park_q', theta, alpha, beta, zero)
+    """
+
+    return get_variant(locStr_name)['kernel'](*args, **kwargs)
+
+# =============================================================================
+# </Function: dispatch by name>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: Clarke and Park Transforms of the named variants>
+# =============================================================================
+
+def cal_variant_clarke_park(theta, a, b, c, locStr_clarke=CONST_STR_VARIANT_CLARKE,
+                            locStr_park=CONST_STR_VARIANT_PARK, trig=None):
+    """
+    .. _cal_variant_clarke_park :
+
+    The Clarke and the Park Transforms of the named variants, same returns as
+    gsyTransforms.cal_clarke_park. The defaults use the fused
+    gsyTransforms.cal_clarke_park.
+
+    Parameters
+    ----------
+    theta : array
+        1d, the Park angle.
+
+    a, b, c : array
+        The three-phase inputs, same length as theta.
+
+    locStr_clarke, locStr_park : str
+        The names of the Clarke and the Park variants.
+
+    trig : tuple or None
+        (cos(theta), sin(theta)), see gsyTransforms.cal_trig.
+
+    Returns
+    -------
+    alpha, beta, d, q, zero : array
+        The results.
+    """
+
+    locFunc_clarke = get_variant(locStr_clarke, 'clarke')['kernel']
+
+    locFunc_park = get_variant(locStr_park, 'park')['kernel']
+
+    if (locFunc_clarke is cal_clarke) and (locFunc_park is cal_park):
+
+        return cal_clarke_park(theta, a, b, c, trig)
+
+    else:
+
+        pass
+
+    alpha, beta, zero = locFunc_clarke(a, b, c)
+
+    d, q, zero = locFunc_park(theta, alpha, beta, zero, trig=trig)
+
+    return alpha, beta, d, q, zero
+
+# =============================================================================
+# </Function: Clarke and Park Transforms of the named variants>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: parse the names of the variants>
+# =============================================================================
+
+def parse_variant_names(locStr_text):
+    """
+    .. _parse_variant_names :
+
+    Parse the text of the Variants text box of gsyDqMain, the names of at
+    most one Clarke and one Park variant, delimited by commas or spaces, in
+    any order. A kind which is not named keeps its default.
+
+    Parameters
+    ----------
+    locStr_text : str
+        The text, e.g., 'clarke_power, park_q', or empty for the defaults.
+
+    Returns
+    -------
+    locStr_clarke, locStr_park : str
+        The names, to be passed into cal_variant_clarke_park_.
+
+    Examples
+    --------
+    .. code:: python
+
+        # ('clarke_amplitude', 'park_q')
+        parse_variant_names('park_q')
+    """
+
+    locDict_names = {}
+
+    for item in locStr_text.replace(',', ' ').split():
+
+        locStr_kind = get_variant(item)['kind']
+
+        if locStr_kind in locDict_names:
+
+            raise ValueError('More than one ' + locStr_kind + ' variant : '
+                             + locDict_names[locStr_kind] + ', ' + item)
+
+        else:
+
+            locDict_names[locStr_kind] = item
+
+    return (locDict_names.get('clarke', CONST_STR_VARIANT_CLARKE),
+            locDict_names.get('park', CONST_STR_VARIANT_PARK))
+
+# =============================================================================
+# </Function: parse the names of the variants>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: power invariant Clarke Transform>
+# =============================================================================
+
+def cal_clarke_power(a, b, c):
+    """
+    .. _cal_clarke_power :
+
+    The power invariant Clarke Transform, i.e., the orthonormal matrix. The
+    α, β of a balanced input are :math:`\\sqrt{3/2}` times the amplitude.
+
+    Parameters
+    ----------
+    a, b, c : array
+        The three-phase inputs.
+
+    Returns
+    -------
+    alpha, beta, zero : array
+        The results.
+    """
+
+    alpha = sqrt(2/3) * (a - 1/2 * (b + c))
+
+    beta = sqrt(2/3) * (sqrt(3)/2 * (b - c))
+
+    zero = sqrt(2/3) * sqrt(1/2) * (a + b + c)
+
+    return alpha, beta, zero
+
+# =============================================================================
+# </Function: power invariant Clarke Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: q aligned Park Transform>
+# =============================================================================
+
+def cal_park_q(theta, alpha, beta, zero, trig=None):
+    """
+    .. _cal_park_q :
+
+    The *q* aligned Park Transform, the *q* axis is on α at θ = 0 and the *d*
+    axis lags it by 90°. A positive sequence locked at θ gives *q* = the
+    amplitude and *d* = 0.
+
+    Parameters
+    ----------
+    theta, alpha, beta, zero : array
+        Same as gsyTransforms.cal_park.
+
+    trig : tuple or None
+        (cos(theta), sin(theta)), see gsyTransforms.cal_trig.
+
+    Returns
+    -------
+    d, q, zero : array
+        The results.
+    """
+
+    if trig is None:
+
+        trig = cal_trig(theta)
+
+    else:
+
+        pass
+
+    cos_theta, sin_theta = trig
+
+    d = sin_theta * alpha - cos_theta * beta
+
+    q = cos_theta * alpha + sin_theta * beta
+
+    return d, q, zero
+
+# =============================================================================
+# </Function: q aligned Park Transform>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: d aligned Park Transform, q lagging>
+# =============================================================================
+
+def cal_park_d_q_lagging(theta, alpha, beta, zero, trig=None):
+    """
+    .. _cal_park_d_q_lagging :
+
+    The *d* aligned Park Transform with the *q* axis lagging the *d* axis by
+    90°, i.e., *q* of opposite sign to gsyTransforms.cal_park.
+
+    Parameters
+    ----------
+    theta, alpha, beta, zero : array
+        Same as gsyTransforms.cal_park.
+
+    trig : tuple or None
+        (cos(theta), sin(theta)), see gsyTransforms.cal_trig.
+
+    Returns
+    -------
+    d, q, zero : array
+        The results.
+    """
+
+    if trig is None:
+
+        trig = cal_trig(theta)
+
+    else:
+
+        pass
+
+    cos_theta, sin_theta = trig
+
+    d = cos_theta * alpha + sin_theta * beta
+
+    q = sin_theta * alpha - cos_theta * beta
+
+    return d, q, zero
+
+# =============================================================================
+# </Function: d aligned Park Transform, q lagging>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: benchmark the registered kernels>
+# =============================================================================
+
+def bench_variants(locList_sizes=(10**3, 10**4, 10**5, 10**6), locList_names=None,
+                   locInt_repeat=3):
+    """
+    .. _bench_variants :
+
+    Benchmark the throughput of the registered kernels over input sizes.
+
+    Parameters
+    ----------
+    locList_sizes : list of int
+        The numbers of samples.
+
+    locList_names : list of str or None
+        The variants, None is all registered variants.
+
+    locInt_repeat : int
+        Number of runs per kernel and size, the fastest one is reported.
+
+    Returns
+    -------
+    locList_results : list of dict
+        'name', 'kind', 'samples' and 'samples_per_s'.
+
+    Examples
+    --------
+    .. code:: python
+
+        for item in bench_variants([10**5]):
+
+            print(item['name'], item['samples_per_s'])
+    """
+
+    if locList_names is None:
+
+        locList_names = list_variants()
+
+    else:
+
+        pass
+
+    locList_results = []
+
+    for locInt_samples in locList_sizes:
+
+        theta = np.linspace(0, 20 * np.pi, int(locInt_samples))
+
+        # a balanced input with some noise
+        a, b, c = (np.cos(theta - k * 2/3 * np.pi)
+                   + 0.01 * np.random.default_rng(k).standard_normal(len(theta))
+                   for k in range(3))
+
+        alpha, beta, zero = cal_clarke(a, b, c)
+
+        for locStr_name in locList_names:
+
+            locDict_variant = get_variant(locStr_name)
+
+            if locDict_variant['kind'] == 'clarke':
+
+                locTuple_args = (a, b, c)
+
+            else:
+
+                locTuple_args = (theta, alpha, beta, zero)
+
+            locDbl_best = np.inf
+
+            for k in range(max(1, int(locInt_repeat))):
+
+                locDbl_start = time.perf_counter()
+
+                locDict_variant['kernel'](*locTuple_args)
+
+                locDbl_best = min(locDbl_best, time.perf_counter() - locDbl_start)
+
+            locList_results.append({'name': locStr_name,
+                                    'kind': locDict_variant['kind'],
+                                    'samples': len(theta),
+                                    'samples_per_s': len(theta) / max(locDbl_best, 1e-9)})
+
+    return locList_results
+
+# =============================================================================
+# </Function: benchmark the registered kernels>
+# =============================================================================
+
+
+# the variants of this module
+register_variant('clarke_amplitude', cal_clarke, 'clarke',
+                 'amplitude invariant Clarke, 2/3 scaling', invariant='amplitude')
+
+register_variant('clarke_power', cal_clarke_power, 'clarke',
+                 'power invariant Clarke, sqrt(2/3) scaling', invariant='power')
+
+register_variant('park_d', cal_park, 'park',
+                 'd aligned with alpha, q leading d by 90 degrees', aligned='d', q_sign=1)
+
+register_variant('park_q', cal_park_q, 'park',
+                 'q aligned with alpha, d lagging q by 90 degrees', aligned='q', q_sign=1)
+
+register_variant('park_d_q_lagging', cal_park_d_q_lagging, 'park',
+                 'd aligned with alpha, q lagging d by 90 degrees', aligned='d', q_sign=-1)
+
+
+if __name__ == '__main__':
+
+    print(date_time_now() + 'Transform variant benchmark start')
+
+    for item in bench_variants():
+
+        print('{:<20s}{:<8s}{:>10d} samples{:>10.1f} M samples/s'.format(
+              item['name'], item['kind'], item['samples'], item['samples_per_s'] / 1e6))
+
+    print(date_time_now() + 'Transform variant benchmark complete')
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+Custom module for the numerical verification of gsyDqLib.find_sequences.
+
+find_sequences predicts the frequency of the *d*, *q* components and whether
+*d* leads or lags *q* by 90°, analytically. This module checks the
+predictions over a sweep of (harmonic order, PLL order) pairs:
+    |  the *d*, *q* components of all pairs are calculated in one go, same
+    |  transforms as gsyDqLib.cal_ABDQ (cal_dq_sweep_)
+    |  the dominant frequency and the phase of *d* to *q* are found by the
+    |  real FFT of windowed blocks of pairs (cal_dq_spectrum_)
+    |  any pair where the numerical results disagree with the prediction is
+    |  flagged (verify_sequences_)
+
+The sweep covers an integer number of base periods, so the *d*, *q*
+frequencies of harmonic and PLL orders with one decimal place fall onto FFT
+bins. All blocks have the same length, so the window is made once and the
+FFT plan cached by NumPy is reused for every block.
+
+Zero sequences (no *α*, *β*) are skipped. The prediction does not apply to
+interharmonics, they are reported but never flagged.
+
+Run this module as a script for a default sweep.
+
+Author : 高斯羽 博士 (Dr. GAO, Siyu)
+
+Version : 0.1.0
+
+Last modified : 2026-10-19
+
+List of functions
+----------------------
+
+* cal_dq_spectrum_
+* cal_dq_sweep_
+* predict_sequences_
+* verify_sequences_
+
+Function definitions
+----------------------
+
+"""
+
+import io
+import time
+import contextlib
+
+import numpy as np
+
+from numpy import pi
+
+from gsyDqLib import date_time_now, find_sequences
+from gsyTransforms import cal_park
+
+# =============================================================================
+# <Function: analytic predictions>
+# =============================================================================
+
+def predict_sequences(locDbl_base_freq, locHarmonics, locPlls):
+    """
+    .. _predict_sequences :
+
+    The predictions of gsyDqLib.find_sequences for pairs of harmonic and PLL
+    orders. The messages printed by find_sequences are suppressed.
+
+    Parameters
+    ----------
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locHarmonics, locPlls : array
+        1d arrays of the harmonic orders and the PLL orders of the pairs.
+
+    Returns
+    -------
+    locDict_pred : dict
+        1d arrays, one element per pair:
+            |  'freq' : the *d*, *q* frequency (Hz), from the Park period
+            |  'lead' : +1 if *d* leads *q*, -1 if *d* lags *q*, 0 for DC
+            |  'applicable' : False for zero sequences and interharmonics
+    """
+
+    locInt_pairs = len(locHarmonics)
+
+    locFreq = np.zeros(locInt_pairs)
+
+    locLead = np.zeros(locInt_pairs, dtype=int)
+
+    locApplicable = np.zeros(locInt_pairs, dtype=bool)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+
+        for k in range(locInt_pairs):
+
+            locDbl_remainder = np.mod(abs(locHarmonics[k]), 3)
+
+            # zero sequences exit in find_sequences, interharmonics do not apply
+            if locDbl_remainder not in (1, 2):
+
+                continue
+
+            else:
+
+                pass
+
+            (locStr_freq_harmonic,
+             locStr_freq_clarke,
+             locStr_freq_park,
+             locDbl_period_clarke,
+             locDbl_period_park) = find_sequences(locDbl_base_freq, locHarmonics[k], locPlls[k])
+
+            locApplicable[k] = True
+
+            locFreq[k] = 1 / abs(locDbl_period_park) if locDbl_period_park != 0 else 0
+
+            if 'leading' in locStr_freq_park:
+
+                locLead[k] = 1
+
+            elif 'lagging' in locStr_freq_park:
+
+                locLead[k] = -1
+
+            else:
+
+                pass
+
+    locDict_pred = {'freq': locFreq, 'lead': locLead, 'applicable': locApplicable}
+
+    return locDict_pred
+
+# =============================================================================
+# </Function: analytic predictions>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: d, q components of a sweep>
+# =============================================================================
+
+def cal_dq_sweep(locHarmonics, locPlls, locDbl_base_freq=50, locInt_samples=256,
+                 locInt_cycles=10):
+    """
+    .. _cal_dq_sweep :
+
+    The *d*, *q* components of pairs of harmonic and PLL orders, in one go.
+    The three-phase inputs, the Clarke and the Park Transforms are the same
+    as gsyDqLib.cal_ABDQ.
+
+    Parameters
+    ----------
+    locHarmonics, locPlls : array
+        1d arrays of the harmonic orders and the PLL orders of the pairs.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locInt_samples : int
+        Samples per base period.
+
+    locInt_cycles : int
+        Number of base periods, the end point is not included.
+
+    Returns
+    -------
+    locTime : array
+        (samples,), time (s).
+
+    d, q : array
+        (pairs, samples).
+    """
+
+    locInt_length = int(locInt_samples) * int(locInt_cycles)
+
+    locTime = np.arange(locInt_length) / (locInt_samples * locDbl_base_freq)
+
+    locTheta = 2 * pi * locDbl_base_freq * locTime
+
+    locH = np.abs(np.asarray(locHarmonics, dtype=float))[:, np.newaxis]
+
+    locP = np.asarray(locPlls, dtype=float)[:, np.newaxis]
+
+    locH_theta = locH * locTheta
+
+    alpha = 2/3 * (np.cos(locH_theta) - np.cos(locH_theta) * np.cos(locH * 2/3 * pi))
+
+    beta = 2 * np.sqrt(3)/3 * (np.sin(locH_theta) * np.sin(locH * 2/3 * pi))
+
+    d, q, zero = cal_park(locP * locTheta, alpha, beta, alpha)
+
+    return locTime, d, q
+
+# =============================================================================
+# </Function: d, q components of a sweep>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: dominant frequency and phase of d, q>
+# =============================================================================
+
+def cal_dq_spectrum(d, q, locDbl_fs, locWindow=None):
+    """
+    .. _cal_dq_spectrum :
+
+    The dominant frequency of *d*, *q* and the phase of *d* to *q* at that
+    frequency, by the real FFT of windowed blocks.
+
+    The dominant bin is the peak of :math:`|D|^{2} + |Q|^{2}`, refined by a
+    parabola through the logarithms of the peak and its neighbours.
+
+    Parameters
+    ----------
+    d, q : array
+        (pairs, samples).
+
+    locDbl_fs : float
+        Sampling frequency in Hz.
+
+    locWindow : array or None
+        (samples,) window, e.g., made once for many blocks. None uses the
+        Hann window.
+
+    Returns
+    -------
+    locFreq : array
+        (pairs,), the dominant frequency (Hz).
+
+    locPhase : array
+        (pairs,), the phase of *d* minus the phase of *q* (°), +90 if *d*
+        leads *q*.
+
+    locInt_bin : array
+        (pairs,), the dominant bin.
+    """
+
+    locInt_length = d.shape[-1]
+
+    if locWindow is None:
+
+        locWindow = np.hanning(locInt_length + 1)[:-1]
+
+    else:
+
+        pass
+
+    locD = np.fft.rfft(d * locWindow, axis=-1)
+
+    locQ = np.fft.rfft(q * locWindow, axis=-1)
+
+    locPower = np.abs(locD)**2 + np.abs(locQ)**2
+
+    locInt_bin = np.argmax(locPower, axis=-1)
+
+    locRows = np.arange(len(locInt_bin))
+
+    # parabolic refinement, inside the spectrum only
+    locInner = np.clip(locInt_bin, 1, locPower.shape[-1] - 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        locLeft, locMid, locRight = (np.log(locPower[locRows, locInner + k] + 1e-300)
+                                     for k in (-1, 0, 1))
+
+        locDelta = 0.5 * (locLeft - locRight) / (locLeft - 2 * locMid + locRight)
+
+    locDelta = np.where((locInt_bin == locInner) & np.isfinite(locDelta),
+                        np.clip(locDelta, -0.5, 0.5), 0)
+
+    locFreq = (locInt_bin + locDelta) * locDbl_fs / locInt_length
+
+    locPhase = np.degrees(np.angle(locD[locRows, locInt_bin]
+                                   * np.conj(locQ[locRows, locInt_bin])))
+
+    return locFreq, locPhase, locInt_bin
+
+# =============================================================================
+# </Function: dominant frequency and phase of d, q>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: verify find_sequences over a sweep>
+# =============================================================================
+
+def verify_sequences(locHarmonics, locPlls, locDbl_base_freq=50, locInt_cycles=10,
+                     locInt_samples=None, locInt_batch=1024, locDbl_tolerance=None):
+    """
+    .. _verify_sequences :
+
+    Verify the predictions of gsyDqLib.find_sequences over all pairs of the
+    given harmonic orders and PLL orders.
+
+    A pair is flagged if:
+        |  the numerical frequency differs from the predicted one by more
+        |  than locDbl_tolerance, or
+        |  the predicted frequency is not DC and *d* does not lead (lag) *q*
+        |  by 90° ± 45° as predicted
+
+    Parameters
+    ----------
+    locHarmonics, locPlls : array
+        Harmonic orders and PLL orders, all combinations are verified.
+
+    locDbl_base_freq : float
+        The base frequency of the system, e.g., 50 or 60 (Hz).
+
+    locInt_cycles : int
+        Base periods per block. The frequency resolution is
+        base frequency / cycles.
+
+    locInt_samples : int or None
+        Samples per base period. None uses a power of two of at least four
+        times the largest harmonic plus PLL order, so nothing is aliased.
+
+    locInt_batch : int
+        Pairs per block of the FFT.
+
+    locDbl_tolerance : float or None
+        Frequency tolerance (Hz). None is half the frequency resolution.
+
+    Returns
+    -------
+    locDict_results : dict
+        1d arrays, one element per pair:
+            |  'harmonic', 'pll' : the pair
+            |  'freq_pred', 'lead_pred', 'applicable' : see predict_sequences_
+            |  'freq_num', 'phase_num' : see cal_dq_spectrum_
+            |  'lead_num' : +1, -1 or 0 (DC or no clear 90°)
+            |  'mismatch' : True for the flagged pairs
+        and 'pairs_per_s', the speed of the sweep.
+
+    Examples
+    --------
+    .. code:: python
+
+        results = verify_sequences(np.arange(1, 51), np.arange(-10, 10.5, 0.5))
+
+        print(results['harmonic'][results['mismatch']],
+              results['pll'][results['mismatch']])
+    """
+
+    locDbl_clock = time.perf_counter()
+
+    # find_sequences compares the orders exactly, e.g., np.arange(1, 2, 0.1)
+    # gives 1.3000000000000003, which would be an interharmonic
+    locH, locP = np.meshgrid(np.round(np.asarray(locHarmonics, dtype=float), 6),
+                             np.round(np.asarray(locPlls, dtype=float), 6), indexing='ij')
+
+    locH = locH.ravel()
+
+    locP = locP.ravel()
+
+    if locInt_samples is None:
+
+        locDbl_max = np.max(np.abs(locH)) + np.max(np.abs(locP))
+
+        locInt_samples = int(max(64, 2**np.ceil(np.log2(4 * locDbl_max + 1))))
+
+    else:
+
+        locInt_samples = int(locInt_samples)
+
+    locDbl_fs = locInt_samples * locDbl_base_freq
+
+    locInt_length = locInt_samples * int(locInt_cycles)
+
+    if locDbl_tolerance is None:
+
+        locDbl_tolerance = 0.5 * locDbl_fs / locInt_length
+
+    else:
+
+        pass
+
+    locDict_pred = predict_sequences(locDbl_base_freq, locH, locP)
+
+    # skip the zero sequences, which have no α, β
+    locValid = np.mod(np.abs(locH), 3) != 0
+
+    locFreq_num = np.full(len(locH), np.nan)
+
+    locPhase_num = np.full(len(locH), np.nan)
+
+    locBin = np.zeros(len(locH), dtype=int)
+
+    # one window and one FFT length for all blocks
+    locWindow = np.hanning(locInt_length + 1)[:-1]
+
+    locIndex = np.flatnonzero(locValid)
+
+    for locInt_start in range(0, len(locIndex), int(locInt_batch)):
+
+        locBlock = locIndex[locInt_start:locInt_start + int(locInt_batch)]
+
+        locTime, d, q = cal_dq_sweep(locH[locBlock], locP[locBlock], locDbl_base_freq,
+                                     locInt_samples, locInt_cycles)
+
+        (locFreq_num[locBlock],
+         locPhase_num[locBlock],
+         locBin[locBlock]) = cal_dq_spectrum(d, q, locDbl_fs, locWindow)
+
+    # a clear ±90° only, 0 for DC
+    locLead_num = np.where((locBin > 0) & (np.abs(np.abs(locPhase_num) - 90) < 45),
+                           np.sign(locPhase_num), 0).astype(int)
+
+    locMismatch = locDict_pred['applicable'] & (
+        (np.abs(locFreq_num - locDict_pred['freq']) > locDbl_tolerance)
+        | ((locDict_pred['freq'] > 0) & (locLead_num != locDict_pred['lead'])))
+
+    locDict_results = {'harmonic': locH,
+                       'pll': locP,
+                       'freq_pred': locDict_pred['freq'],
+                       'lead_pred': locDict_pred['lead'],
+                       'applicable': locDict_pred['applicable'],
+                       'freq_num': locFreq_num,
+                       'phase_num': locPhase_num,
+                       'lead_num': locLead_num,
+                       'mismatch': locMismatch,
+                       'pairs_per_s': len(locH) / (time.perf_counter() - locDbl_clock)}
+
+    return locDict_results
+
+# =============================================================================
+# </Function: verify find_sequences over a sweep>
+# =============================================================================
+
+
+if __name__ == '__main__':
+
+    print(date_time_now() + 'find_sequences verification start')
+
+    locDict_results = verify_sequences(np.arange(1, 51), np.arange(-10, 10.5, 0.5))
+
+    locInt_checked = int(np.count_nonzero(locDict_results['applicable']))
+
+    print(date_time_now() + '{} pairs, {} checked, {} flagged, {:.0f} pairs/s'.format(
+          len(locDict_results['harmonic']), locInt_checked,
+          int(np.count_nonzero(locDict_results['mismatch'])),
+          locDict_results['pairs_per_s']))
+
+    for k in np.flatnonzero(locDict_results['mismatch']):
+
+        print('harmonic {:g}, PLL {:g} : predicted {:.4f} Hz ({:+d}), '
+              'numerical {:.4f} Hz ({:+d})'.format(locDict_results['harmonic'][k],
+                                                   locDict_results['pll'][k],
+                                                   locDict_results['freq_pred'][k],
+                                                   locDict_results['lead_pred'][k],
+                                                   locDict_results['freq_num'][k],
+                                                   locDict_results['lead_num'][k]))
+
+    print(date_time_now() + 'find_sequences verification complete')